@@ -0,0 +1,471 @@
+# thread-safe variant of HashTable for several dispatcher threads updating packages while UI/API threads read
+# writers lock one stripe (a group of buckets); readers take no lock and read immutable bucket snapshots
+# sources for code:  Zybooks section 6, Hash Tables (all sub-sections) at https://learn.zybooks.com/zybook/WGUC950Template2023/chapter/6/section/1
+# also Python 3.9.21 documentation for threading.Lock found at https://docs.python.org/3.9/library/threading.html
+# and the lock striping design of Java's ConcurrentHashMap described at
+# https://docs.oracle.com/javase/8/docs/api/java/util/concurrent/ConcurrentHashMap.html
+
+import threading
+import time
+from collections import Counter
+from operator import itemgetter
+
+from app_wgups.hash_table import MAX_LOAD_FACTOR, HashTable
+from app_wgups.key_hash import FIBONACCI, MASK64, key_hash, key_order
+
+LOCK_STRIPES = 16  #bucket i is guarded by lock i % LOCK_STRIPES
+_EMPTY_BUCKET = ()
+
+_KEY = itemgetter(0)
+_VALUE = itemgetter(1)
+_PAIR = itemgetter(0, 1)
+
+
+class ConcurrentHashTable:
+    def __init__(self, capacity=23, stripes=LOCK_STRIPES, track_stats=False):
+        """
+        Initializes a hash table that is safe to share between threads.
+        Buckets are immutable tuples of (key, value, hash) entries. A writer
+        builds a new tuple and stores it in the bucket slot (copy-on-write), so a
+        reader can scan whatever tuple it finds without a lock and never sees a
+        half-changed bucket. Writers lock only the stripe their bucket belongs to,
+        so threads updating different packages rarely wait for each other.
+
+        A resize takes every stripe lock, builds a complete new bucket list from the
+        old one (which is left untouched) and then swaps `table` in one assignment:
+        a reader that started on the old list keeps a consistent snapshot, and a
+        writer that waited on its stripe sees the swap and retries on the new list.
+
+        Same API as HashTable (insert, lookup, update, delete, bulk_load, clear,
+        len, in, iteration, size, longest_bucket, stats, reset_stats); it grows
+        but does not shrink. With `track_stats` lookups are counted as in
+        HashTable; the counters are updated without a lock, so under heavy
+        contention a few counts can be lost - good enough for a ratio, not for billing.
+
+        Args:
+            capacity (int, optional): The initial number of buckets. Defaults to 23.
+            stripes (int, optional): The number of locks. Defaults to LOCK_STRIPES (16).
+            track_stats (bool, optional): Count lookup hits, misses and comparisons. Defaults to False.
+        Attributes:
+            capacity (int): The number of buckets in the current table.
+            table (list): The current buckets; each is a tuple of (key, value, hash) entries.
+            track_stats (bool): Whether lookups are counted.
+            resizes (int): Resizes since the table was created or `reset_stats` was called.
+            rehash_seconds (float): Time spent building new bucket lists in those resizes.
+        Returns:
+            None
+        """
+        self.table = [_EMPTY_BUCKET] * capacity
+        self.capacity = capacity
+        self._min_capacity = capacity
+        self.track_stats = track_stats
+        self.reset_stats()
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counts = [0] * stripes  #entries added minus removed under each lock - only the sum is meaningful
+
+
+    #function to hash keys
+    def hash(self, key):
+        """
+        Computes the bucket index for a given key in the current table.
+
+        Args:
+            key (int, str or bytes): The key to be hashed.
+        Returns:
+            int: The computed index in the hash table (0 to capacity - 1).
+        """
+        return key_hash(key) % len(self.table)
+
+
+    #lock the stripe of a key's bucket in the current table
+    def _lock_bucket(self, code):
+        """
+        Acquires the stripe lock for the bucket a hash belongs to.
+        If a resize swapped the table while this thread waited, the lock is
+        released and taken again for the key's bucket in the new table.
+
+        Args:
+            code (int): The key's hash from `key_hash`.
+        Returns:
+            tuple: (table, bucket index, stripe index), with the stripe lock held.
+        """
+        locks = self._locks
+        while True:
+            table = self.table
+            index = code % len(table)
+            stripe = index % len(locks)
+            locks[stripe].acquire()
+            if self.table is table:
+                return table, index, stripe
+            locks[stripe].release()  #resized while waiting - try again on the new table
+
+
+    #position of a key in a bucket tuple
+    @staticmethod
+    def _position(bucket, key, code):
+        for i, entry in enumerate(bucket):
+            if entry[2] == code and entry[0] == key:
+                return i
+        return -1
+
+
+    #function to insert new data into hash table
+    def insert(self, key, value):
+        """
+        Inserts a new key-value pair into the hash table, or replaces the value
+        of an existing key. Only the key's stripe is locked.
+
+        Args:
+            key (int, str or bytes): The key for the data entry.
+            value (any): The value associated with the key. Can be any data type.
+        Returns:
+            None: The function modifies the hash table in place.
+        """
+        code = (key * FIBONACCI) & MASK64 if type(key) is int else key_hash(key)
+        table, index, stripe = self._lock_bucket(code)
+        try:
+            bucket = table[index]
+            i = self._position(bucket, key, code)
+            if i >= 0:
+                table[index] = bucket[:i] + ((key, value, code),) + bucket[i + 1:]
+                return
+            table[index] = bucket + ((key, value, code),)
+            self._counts[stripe] += 1
+        finally:
+            self._locks[stripe].release()
+
+        #checked without the lock: an estimate is enough to decide to grow
+        if sum(self._counts) > len(table) * MAX_LOAD_FACTOR:
+            self._resize(HashTable._next_prime(len(table) * 2), table)
+
+
+    #function to load many key-value pairs at once
+    def bulk_load(self, items, expected_size=None, unique_keys=False):
+        """
+        Inserts many key-value pairs, growing the table at most once up front.
+        `unique_keys` is accepted for compatibility with HashTable; pairs are
+        always checked for an existing key.
+
+        Args:
+            items (iterable): (key, value) pairs. Keys must be int, str or bytes.
+            expected_size (int, optional): Number of pairs to expect. Defaults to None.
+            unique_keys (bool, optional): Ignored. Defaults to False.
+        Returns:
+            int: The number of pairs read from `items`.
+        """
+        if expected_size is None:
+            if not hasattr(items, "__len__"):
+                items = list(items)
+            expected_size = len(items)
+        table = self.table
+        target = sum(self._counts) + expected_size
+        if target > len(table) * MAX_LOAD_FACTOR:
+            self._resize(HashTable._next_prime(int(target / MAX_LOAD_FACTOR) + 1), table)
+
+        count = 0
+        for key, value in items:
+            self.insert(key, value)
+            count += 1
+        return count
+
+
+    # function to look up data or retrieve from hash table via package ID key
+    def lookup(self, key):
+        """
+        Retrieves a value from the hash table without taking a lock.
+        The table reference and then the bucket tuple are each read once; both
+        are complete, immutable snapshots, so the scan cannot be disturbed by a
+        concurrent writer or resize.
+
+        Args:
+            key (int, str or bytes): The key for the data entry.
+        Returns:
+            any: The value associated with the key if found,
+            or None if the key does not exist in the hash table.
+        """
+        if self.track_stats:
+            return self._counted_lookup(key)
+        code = (key * FIBONACCI) & MASK64 if type(key) is int else key_hash(key)
+        table = self.table
+        for entry in table[code % len(table)]:
+            if entry[2] == code and entry[0] == key:
+                return entry[1]
+        return None
+
+
+    #lookup that counts its hit or miss and the entries it compared (track_stats)
+    def _counted_lookup(self, key):
+        code = (key * FIBONACCI) & MASK64 if type(key) is int else key_hash(key)
+        table = self.table
+        bucket = table[code % len(table)]
+        for i, entry in enumerate(bucket):
+            if entry[2] == code and entry[0] == key:
+                self.hits += 1
+                self.comparisons += i + 1
+                return entry[1]
+        self.misses += 1
+        self.comparisons += len(bucket)
+        return None
+
+
+    # function to update an object stored in the hash table
+    def update(self, key, new_value):
+        """
+        Updates the value associated with an existing key.
+
+        Args:
+            key (int, str or bytes): The key identifying the entry to update.
+            new_value (any): The new value to associate with the key.
+        Returns:
+            bool: True if the update was successful, False if the key was not found.
+        """
+        code = key_hash(key)
+        table, index, stripe = self._lock_bucket(code)
+        try:
+            bucket = table[index]
+            i = self._position(bucket, key, code)
+            if i < 0:
+                return False
+            table[index] = bucket[:i] + ((key, new_value, code),) + bucket[i + 1:]
+            return True
+        finally:
+            self._locks[stripe].release()
+
+
+    # function to delete from hash table - remove key/value pair
+    def delete(self, key):
+        """
+        Removes a key-value pair from the hash table.
+
+        Args:
+            key (int, str or bytes): The key of the entry to remove.
+        Returns:
+            bool: True if the key was successfully deleted, False if the key was not found.
+        """
+        code = key_hash(key)
+        table, index, stripe = self._lock_bucket(code)
+        try:
+            bucket = table[index]
+            i = self._position(bucket, key, code)
+            if i < 0:
+                return False
+            table[index] = bucket[:i] + bucket[i + 1:]
+            self._counts[stripe] -= 1
+            return True
+        finally:
+            self._locks[stripe].release()
+
+
+    #take every stripe lock, always in the same order so two resizes cannot deadlock
+    def _lock_all(self):
+        for lock in self._locks:
+            lock.acquire()
+
+
+    #release every stripe lock
+    def _unlock_all(self):
+        for lock in reversed(self._locks):
+            lock.release()
+
+
+    #function to RESIZE table - builds a new bucket list and swaps it in
+    def _resize(self, new_capacity, seen_table):
+        """
+        Rehashes every entry into a new bucket list of `new_capacity` buckets.
+        All stripe locks are held, so no writer changes a bucket meanwhile; the
+        old list is never modified, so lock-free readers still holding it see a
+        complete table. The new list is published with a single assignment.
+
+        Args:
+            new_capacity (int): The number of buckets of the new table.
+            seen_table (list): The table the caller saw; if another thread has
+                               already replaced it, nothing is done.
+        Returns:
+            None: The function modifies the hash table in place.
+        """
+        self._lock_all()
+        try:
+            if self.table is not seen_table:
+                return  #another thread resized first
+            start = time.perf_counter()
+            new_table = [[] for _ in range(new_capacity)]
+            for bucket in seen_table:
+                for entry in bucket:
+                    new_table[entry[2] % new_capacity].append(entry)  #cached hash - keys are never rehashed
+            self.table = [tuple(bucket) if bucket else _EMPTY_BUCKET for bucket in new_table]
+            self.capacity = new_capacity
+            self.resizes += 1
+            self.rehash_seconds += time.perf_counter() - start
+        finally:
+            self._unlock_all()
+
+
+    #function to empty the table and return it to its initial capacity
+    def clear(self):
+        """
+        Removes every entry and returns the table to its initial capacity.
+
+        Args:
+            None
+        Returns:
+            None: The function modifies the hash table in place.
+        """
+        self._lock_all()
+        try:
+            self.table = [_EMPTY_BUCKET] * self._min_capacity
+            self.capacity = self._min_capacity
+            self._counts = [0] * len(self._locks)
+        finally:
+            self._unlock_all()
+
+
+    #number of key-value pairs stored - exact when no write is in progress
+    @property
+    def size(self):
+        return sum(self._counts)
+
+
+    #number of key-value pairs stored - len(table)
+    def __len__(self):
+        return sum(self._counts)
+
+
+    #function to zero the lookup and resize counters
+    def reset_stats(self):
+        """
+        Zeroes the lookup counters and the resize count and time.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.hits = 0
+        self.misses = 0
+        self.comparisons = 0  #keys compared by counted lookups
+        self.resizes = 0
+        self.rehash_seconds = 0.0
+
+
+    #length of the longest chain in the current table
+    @property
+    def longest_bucket(self):
+        return max(map(len, self.table), default=0)
+
+
+    #chain length -> number of buckets with that length
+    def bucket_histogram(self):
+        """
+        Counts the buckets of each chain length in a snapshot of the current table.
+
+        Args:
+            None
+        Returns:
+            dict: Chain length -> number of buckets, in ascending length order.
+        """
+        return dict(sorted(Counter(map(len, self.table)).items()))
+
+
+    #function to report the table's shape and the counters
+    def stats(self):
+        """
+        Reports the same figures as HashTable.stats, from a snapshot of the
+        current table (no lock is taken). There is never a pending rehash: a
+        resize completes before the new table is published.
+
+        Args:
+            None
+        Returns:
+            dict: size, capacity, load_factor, bucket_histogram, longest_bucket,
+                  resizes, rehash_seconds and pending_rehash_buckets; also lookups,
+                  hits, misses and comparisons_per_lookup (None when lookups are not counted).
+        """
+        table = self.table
+        size = self.size
+        lookups = self.hits + self.misses
+        counted = self.track_stats or lookups > 0  #counters from an earlier tracked period still count
+        histogram = dict(sorted(Counter(map(len, table)).items()))
+        return {
+            "size": size,
+            "capacity": len(table),
+            "load_factor": size / len(table),
+            "bucket_histogram": histogram,
+            "longest_bucket": max(histogram),
+            "resizes": self.resizes,
+            "rehash_seconds": self.rehash_seconds,
+            "pending_rehash_buckets": 0,
+            "lookups": lookups if counted else None,
+            "hits": self.hits if counted else None,
+            "misses": self.misses if counted else None,
+            "comparisons_per_lookup": self.comparisons / lookups if lookups else None,
+        }
+
+
+    #membership test - `key in table`
+    def __contains__(self, key):
+        code = key_hash(key)
+        table = self.table
+        return any(entry[2] == code and entry[0] == key for entry in table[code % len(table)])
+
+
+    #walk every stored entry of the current table
+    def _entries(self):
+        """
+        Yields every stored (key, value, hash) entry without locking.
+        The walk is weakly consistent: it covers the table as it was when the
+        walk started, and each bucket as it is when the walk reaches it, so a
+        concurrent change may or may not be seen, but no entry is seen twice and
+        no RuntimeError is raised.
+
+        Args:
+            None
+        Returns:
+            generator: (key, value, hash) tuples.
+        """
+        for bucket in self.table:
+            yield from bucket
+
+
+    #walk every key - `for key in table`
+    def __iter__(self):
+        return map(_KEY, self._entries())
+
+
+    #walk every stored (key, value) pair
+    def items(self):
+        """
+        Yields every stored (key, value) pair (weakly consistent, see `_entries`).
+
+        Args:
+            None
+        Returns:
+            iterator: (key, value) tuples.
+        """
+        return map(_PAIR, self._entries())
+
+
+    #walk every value
+    def values(self):
+        """
+        Yields every stored value (weakly consistent, see `_entries`).
+
+        Args:
+            None
+        Returns:
+            iterator: The stored values.
+        """
+        return map(_VALUE, self._entries())
+
+
+    #walk every (key, value) pair in ascending key order
+    def ordered_items(self):
+        """
+        Yields every stored (key, value) pair in ascending key order, from a
+        snapshot taken when iteration starts.
+
+        Args:
+            None
+        Returns:
+            generator: (key, value) tuples, smallest key first.
+        """
+        yield from sorted(self.items(), key=lambda item: key_order(item[0]))
@@ -0,0 +1,393 @@
+#contraction hierarchy over a road network: offline preprocessing + fast bidirectional point-to-point queries
+#nodes are contracted one at a time (least important first); shortcut edges keep shortest paths intact,
+#so a query only ever searches "upward" from both endpoints and settles a handful of nodes
+#Sources for code: Python 3.9.21 documentation for heapq, struct and mmap found at
+#https://docs.python.org/3.9/library/heapq.html and https://docs.python.org/3.9/library/mmap.html
+
+import argparse
+import heapq
+import mmap
+import struct
+import sys
+from array import array
+
+from app_wgups.distance_matrix import AddressIndex
+from app_wgups.road_network import load_road_network
+
+MAGIC = b"WGCH"
+FORMAT_VERSION = 1
+CH_SUFFIX = ".wgch"
+
+#witness searches stop after settling this many nodes; a cut-off search only adds an extra (harmless) shortcut
+WITNESS_SETTLE_LIMIT = 64
+
+_HEADER = struct.Struct("<4sH?xIQQQ")  #magic, version, directed, pad, nodes, up edges, down edges, names bytes
+
+
+#query structure produced by build_contraction_hierarchy - same lookup interface as DistanceMatrix
+class ContractionHierarchy(AddressIndex):
+    def __init__(self, addresses, rank, up_offsets, up_targets, up_weights,
+                 down_offsets, down_targets, down_weights, directed=False):
+        """
+        Initializes a contraction hierarchy from its CSR upward graphs.
+        `up_*` holds, for every node, the edges leaving it towards higher-ranked
+        nodes (searched forward from the source). `down_*` holds the edges entering
+        it from higher-ranked nodes, reversed (searched backward from the target).
+
+        Args:
+            addresses (list of str): The address of each node, in id order.
+            rank (sequence of int): Contraction position of each node (the node order).
+            up_offsets, up_targets, up_weights: CSR arrays of the forward upward graph.
+            down_offsets, down_targets, down_weights: CSR arrays of the backward upward graph.
+            directed (bool, optional): Whether the source network was one-way. Defaults to False.
+        Returns:
+            None
+        """
+        super().__init__(addresses)
+        self.rank = rank
+        self.up_offsets = up_offsets
+        self.up_targets = up_targets
+        self.up_weights = up_weights
+        self.down_offsets = down_offsets
+        self.down_targets = down_targets
+        self.down_weights = down_weights
+        self.directed = directed
+
+
+    #node ids in contraction order, reusable to rebuild the hierarchy after weight changes
+    def order(self):
+        """
+        Returns the node ids in the order they were contracted.
+
+        Args:
+            None
+        Returns:
+            list of int: Node ids, least important first.
+        """
+        order = [0] * self.size
+        for node, position in enumerate(self.rank):
+            order[position] = node
+        return order
+
+
+    #bidirectional upward Dijkstra
+    def distance_by_id(self, from_id, to_id):
+        """
+        Answers a point-to-point shortest distance query.
+        A forward search from the source and a backward search from the target
+        both only follow edges to higher-ranked nodes; the best meeting point gives
+        the shortest distance. Each search stops once its frontier cannot improve it.
+
+        Args:
+            from_id (int): The id of the starting node.
+            to_id (int): The id of the destination node.
+        Returns:
+            float or None: The distance in miles, or None if the destination is unreachable.
+        """
+        if from_id == to_id:
+            return 0.0
+
+        best = float("inf")
+        forward = {from_id: 0.0}
+        backward = {to_id: 0.0}
+        forward_heap = [(0.0, from_id)]
+        backward_heap = [(0.0, to_id)]
+        searches = ((forward_heap, forward, backward, self.up_offsets, self.up_targets, self.up_weights),
+                    (backward_heap, backward, forward, self.down_offsets, self.down_targets, self.down_weights))
+
+        while (forward_heap and forward_heap[0][0] < best) or (backward_heap and backward_heap[0][0] < best):
+            for heap, settled, other, offsets, targets, weights in searches:
+                if not heap or heap[0][0] >= best:
+                    continue
+                distance, node = heapq.heappop(heap)
+                if distance > settled[node]:
+                    continue  #stale heap entry
+                if node in other:
+                    best = min(best, distance + other[node])
+                for edge in range(offsets[node], offsets[node + 1]):
+                    target = targets[edge]
+                    candidate = distance + weights[edge]
+                    if candidate < settled.get(target, float("inf")):
+                        settled[target] = candidate
+                        heapq.heappush(heap, (candidate, target))
+
+        return None if best == float("inf") else best
+
+
+    #shortest distance between two addresses (same signature as DistanceMatrix.get_distance)
+    def get_distance(self, from_address, to_address):
+        """
+        Retrieves the shortest road distance between two addresses.
+
+        Args:
+            from_address (int or str): The starting address id or address.
+            to_address (int or str): The destination address id or address.
+        Returns:
+            float or None: The distance in miles, or None if either address is unknown
+                           or unreachable.
+        """
+        from_id = self.location_id(from_address)
+        to_id = self.location_id(to_address)
+        if from_id is None or to_id is None:
+            return None
+        return self.distance_by_id(from_id, to_id)
+
+
+    #serialize the hierarchy so workers can load it without preprocessing
+    def save(self, path):
+        """
+        Writes the hierarchy to a binary file (header, address names, then CSR arrays,
+        each section aligned to 8 bytes, little-endian).
+
+        Args:
+            path (str): The output file path.
+        Returns:
+            None
+        """
+        names = "\n".join(self.addresses).encode("utf-8")
+        with open(path, "wb") as out_file:
+            out_file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, self.directed, self.size,
+                                        len(self.up_targets), len(self.down_targets), len(names)))
+            out_file.write(names)
+            for typecode, values in self._sections():
+                out_file.write(b"\0" * (-out_file.tell() % 8))
+                data = array(typecode, values)
+                if sys.byteorder == "big":  #file data is always little-endian
+                    data.byteswap()
+                out_file.write(data.tobytes())
+
+
+    def _sections(self):
+        return (("i", self.rank),
+                ("q", self.up_offsets), ("i", self.up_targets), ("d", self.up_weights),
+                ("q", self.down_offsets), ("i", self.down_targets), ("d", self.down_weights))
+
+
+#load a saved hierarchy; the CSR arrays are memory-mapped, not copied
+def load_contraction_hierarchy(path):
+    """
+    Loads a contraction hierarchy saved with `ContractionHierarchy.save`.
+
+    Args:
+        path (str): The file path of the saved hierarchy.
+    Returns:
+        ContractionHierarchy: The hierarchy, with its arrays served from the mapped file.
+    Raises:
+        ValueError: If the file is not a saved hierarchy or has an unsupported version.
+    """
+    with open(path, "rb") as ch_file:
+        mapped = mmap.mmap(ch_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, directed, size, up_edges, down_edges, names_length = _HEADER.unpack_from(mapped, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a saved contraction hierarchy.")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"{path} has format version {version}; expected {FORMAT_VERSION}.")
+
+    offset = _HEADER.size
+    names = mapped[offset:offset + names_length].decode("utf-8")
+    addresses = names.split("\n") if size else []
+    offset += names_length
+
+    sections = []
+    for typecode, count in (("i", size), ("q", size + 1), ("i", up_edges), ("d", up_edges),
+                            ("q", size + 1), ("i", down_edges), ("d", down_edges)):
+        offset += -offset % 8
+        end = offset + count * struct.calcsize(typecode)
+        values = memoryview(mapped)[offset:end].cast(typecode)
+        if sys.byteorder == "big":
+            values = array(typecode, values)
+            values.byteswap()
+        sections.append(values)
+        offset = end
+
+    return ContractionHierarchy(addresses, *sections, directed=directed)
+
+
+#local Dijkstra used to decide whether a shortcut is needed
+def _witness_distances(out_edges, source, skipped, limit):
+    """
+    Runs a bounded Dijkstra from `source` that never passes through `skipped`.
+
+    Args:
+        out_edges (list of dict): Current outgoing edges of every node.
+        source (int): The search start node.
+        skipped (int): The node being contracted.
+        limit (float): Stop once the frontier is farther than this.
+    Returns:
+        dict: Settled node -> distance (cut off after WITNESS_SETTLE_LIMIT nodes).
+    """
+    distances = {source: 0.0}
+    heap = [(0.0, source)]
+    settled = 0
+    while heap and settled < WITNESS_SETTLE_LIMIT:
+        distance, node = heapq.heappop(heap)
+        if distance > distances[node]:
+            continue
+        if distance > limit:
+            break
+        settled += 1
+        for target, weight in out_edges[node].items():
+            if target == skipped:
+                continue
+            candidate = distance + weight
+            if candidate < distances.get(target, float("inf")):
+                distances[target] = candidate
+                heapq.heappush(heap, (candidate, target))
+    return distances
+
+
+#shortcuts required to contract one node
+def _shortcuts(out_edges, in_edges, node):
+    """
+    Lists the shortcut edges needed to remove `node` without breaking shortest paths.
+
+    Args:
+        out_edges (list of dict): Current outgoing edges of every node.
+        in_edges (list of dict): Current incoming edges of every node.
+        node (int): The node to contract.
+    Returns:
+        list of tuple: (from node, to node, length) for every required shortcut.
+    """
+    shortcuts = []
+    outgoing = out_edges[node]
+    if not outgoing:
+        return shortcuts
+    max_out = max(outgoing.values())
+
+    for source, in_weight in in_edges[node].items():
+        witness = _witness_distances(out_edges, source, node, in_weight + max_out)
+        for target, out_weight in outgoing.items():
+            if target == source:
+                continue
+            via = in_weight + out_weight
+            if witness.get(target, float("inf")) > via:
+                shortcuts.append((source, target, via))
+    return shortcuts
+
+
+#offline preprocessing: contract every node and collect the upward graphs
+def build_contraction_hierarchy(network, order=None):
+    """
+    Builds a contraction hierarchy from a RoadNetwork.
+
+    Nodes are contracted by lazily updated priority (edge difference plus the
+    number of already-contracted neighbours). When `order` is given - e.g. the
+    `order()` of a previous hierarchy after road lengths changed - the priority
+    computation is skipped and nodes are simply re-contracted in that order,
+    which is much cheaper than a fresh build.
+
+    Args:
+        network (RoadNetwork): The road network to preprocess.
+        order (list of int, optional): A node contraction order to reuse.
+    Returns:
+        ContractionHierarchy: The preprocessed hierarchy.
+    """
+    size = network.size
+    out_edges = [dict() for _ in range(size)]
+    in_edges = [dict() for _ in range(size)]
+    for source in range(size):
+        for edge in range(network.offsets[source], network.offsets[source + 1]):
+            target, weight = network.targets[edge], network.weights[edge]
+            if target != source and weight < out_edges[source].get(target, float("inf")):
+                out_edges[source][target] = weight
+                in_edges[target][source] = weight
+
+    contracted_neighbors = [0] * size
+
+    def priority(node):
+        removed = len(out_edges[node]) + len(in_edges[node])
+        return len(_shortcuts(out_edges, in_edges, node)) - removed + contracted_neighbors[node]
+
+    if order is None:
+        queue = [(priority(node), node) for node in range(size)]
+        heapq.heapify(queue)
+    else:
+        queue = None
+        pending = list(reversed(order))
+
+    rank = array("i", [0]) * size
+    up_edges = [None] * size
+    down_edges = [None] * size
+
+    for position in range(size):
+        if queue is None:
+            node = pending.pop()
+        else:
+            #lazy update: re-check the top node's priority before contracting it
+            while True:
+                _, node = heapq.heappop(queue)
+                current = priority(node)
+                if not queue or current <= queue[0][0]:
+                    break
+                heapq.heappush(queue, (current, node))
+
+        rank[node] = position
+        up_edges[node] = list(out_edges[node].items())
+        down_edges[node] = list(in_edges[node].items())
+
+        for source, target, length in _shortcuts(out_edges, in_edges, node):
+            if length < out_edges[source].get(target, float("inf")):
+                out_edges[source][target] = length
+                in_edges[target][source] = length
+
+        for source in in_edges[node]:
+            del out_edges[source][node]
+            contracted_neighbors[source] += 1
+        for target in out_edges[node]:
+            del in_edges[target][node]
+            contracted_neighbors[target] += 1
+        out_edges[node] = {}
+        in_edges[node] = {}
+
+    up_offsets, up_targets, up_weights = _to_csr(up_edges)
+    down_offsets, down_targets, down_weights = _to_csr(down_edges)
+    return ContractionHierarchy(network.addresses, rank, up_offsets, up_targets, up_weights,
+                                down_offsets, down_targets, down_weights, network.directed)
+
+
+#pack per-node edge lists into CSR arrays
+def _to_csr(edge_lists):
+    """
+    Converts per-node (target, weight) lists into CSR arrays.
+
+    Args:
+        edge_lists (list of list): Edge list of every node.
+    Returns:
+        tuple: (offsets, targets, weights) arrays.
+    """
+    offsets = array("q", [0])
+    targets = array("i")
+    weights = array("d")
+    for edges in edge_lists:
+        for target, weight in edges:
+            targets.append(target)
+            weights.append(weight)
+        offsets.append(len(targets))
+    return offsets, targets, weights
+
+
+#command line entry point: python -m app_wgups.contraction edges.csv [out.wgch]
+def main(argv=None):
+    """
+    Preprocesses a road-network edge list into a saved contraction hierarchy.
+
+    Args:
+        argv (list of str, optional): Command line arguments. Defaults to sys.argv.
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Build a contraction hierarchy from a road-network edge list.")
+    parser.add_argument("edge_list_path", help="edge-list CSV (from,to,distance)")
+    parser.add_argument("out_path", nargs="?", help=f"output file (default: edge list path with {CH_SUFFIX})")
+    parser.add_argument("--directed", action="store_true", help="treat each edge as a one-way road")
+    args = parser.parse_args(argv)
+
+    out_path = args.out_path or args.edge_list_path.rsplit(".", 1)[0] + CH_SUFFIX
+    hierarchy = build_contraction_hierarchy(load_road_network(args.edge_list_path, args.directed))
+    hierarchy.save(out_path)
+    print(f"Contracted {hierarchy.size} nodes ({len(hierarchy.up_targets)} upward edges) into {out_path}")
+
+
+if __name__ == "__main__":
+    main()
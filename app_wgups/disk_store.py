@@ -0,0 +1,723 @@
+#disk-backed package store with the HashTable API: an append-only record log plus a checkpointed, memory-mapped index
+#a restart maps the last checkpoint's index and replays only the log records written after it
+#Sources for code: Python 3.9.21 documentation for mmap, struct, zlib.crc32, os.fsync/os.replace and pickle found at
+#https://docs.python.org/3.9/library/mmap.html, https://docs.python.org/3.9/library/struct.html,
+#https://docs.python.org/3.9/library/zlib.html, https://docs.python.org/3.9/library/os.html
+#and https://docs.python.org/3.9/library/pickle.html
+#
+#File layout (all integers little-endian):
+#   packages.log  header  MAGIC_LOG, format version, generation
+#                 records crc32, value length, op, key type, key length, key bytes, value bytes (pickle);
+#                         the crc covers everything after itself, so a torn write at the tail is detected
+#   packages.idx  header  MAGIC_INDEX, format version, generation, capacity, live count, filled slots,
+#                         log offset covered by this checkpoint
+#                 slots   capacity (key hash, record offset) pairs with linear probing;
+#                         offset 0 marks an empty slot and 1 a deleted one
+
+import logging
+import mmap
+import os
+import pickle
+import struct
+import zlib
+
+from app_wgups.key_hash import key_hash, key_order
+
+LOG_NAME = "packages.log"
+INDEX_NAME = "packages.idx"
+MAGIC_LOG = b"WGPL"
+MAGIC_INDEX = b"WGPI"
+FORMAT_VERSION = 1
+SYNC_EVERY = 1000  #records per fsync - a crash loses at most this many writes
+CHECKPOINT_EVERY = 100_000  #records between index checkpoints - bounds the replay on open
+MAX_INDEX_LOAD = 0.75
+
+_LOG_HEADER = struct.Struct("<4sHxxQ")  #magic, version, pad, generation
+_CRC = struct.Struct("<I")
+_RECORD = struct.Struct("<IBBH")  #value length, op, key type, key length (follows the crc)
+_RECORD_SIZE = _CRC.size + _RECORD.size
+_INDEX_HEADER = struct.Struct("<4sHxxQQQQQ")  #magic, version, pad, generation, capacity, count, filled, log offset
+_INT64 = struct.Struct("<q")
+
+_PUT = 1
+_DELETE = 2
+_INT_KEY, _STR_KEY, _BYTES_KEY, _BIG_INT_KEY = range(4)
+_EMPTY = 0  #slot offsets 0 and 1 can never be records: the log header comes first
+_DELETED = 1
+
+
+#key -> (key type, bytes) for the record
+def _encode_key(key):
+    if isinstance(key, int):
+        if -(1 << 63) <= key < (1 << 63):
+            return _INT_KEY, _INT64.pack(key)
+        return _BIG_INT_KEY, str(key).encode("ascii")
+    if isinstance(key, str):
+        return _STR_KEY, key.encode("utf-8")
+    if isinstance(key, bytes):
+        return _BYTES_KEY, key
+    raise TypeError(f"Hash table keys must be int, str or bytes, not {type(key).__name__}.")
+
+
+#(key type, bytes) from a record -> key
+def _decode_key(kind, raw):
+    if kind == _INT_KEY:
+        return _INT64.unpack(raw)[0]
+    if kind == _STR_KEY:
+        return raw.decode("utf-8")
+    if kind == _BIG_INT_KEY:
+        return int(raw)
+    return bytes(raw)
+
+
+#make a rename or new file in a directory durable (no-op where directories cannot be opened)
+def _fsync_directory(directory):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class DiskHashTable:
+    def __init__(self, directory, sync_every=SYNC_EVERY, checkpoint_every=CHECKPOINT_EVERY):
+        """
+        Opens (or creates) a disk-backed hash table in `directory`.
+        Every insert, update and delete is appended to a record log; nothing in
+        the log is ever rewritten (until `compact`). Lookups go through an index
+        of (key hash, record offset) slots that is written out at checkpoints and
+        memory-mapped when the table is opened, plus an in-memory overlay of the
+        keys changed since the last checkpoint. Opening therefore costs one mmap
+        and a replay of at most `checkpoint_every` records, however many packages
+        the store holds.
+
+        The log is fsynced once every `sync_every` records (and by `sync`,
+        `checkpoint` and `close`), so a crash loses at most the last unsynced
+        batch. A record torn by a crash fails its crc32 and is cut off on the next
+        open. Values are stored by value (pickled): change a package and call
+        `update` to persist it. The files are trusted data - pickle must never
+        load files from an untrusted source. Not safe for concurrent writers.
+
+        Args:
+            directory (str): Folder holding packages.log and packages.idx; created if missing.
+            sync_every (int, optional): Records per fsync. Defaults to SYNC_EVERY (1000).
+            checkpoint_every (int, optional): Records between automatic checkpoints.
+                                              Defaults to CHECKPOINT_EVERY (100,000).
+        Attributes:
+            size (int): The number of key-value pairs stored.
+            capacity (int): Slots in the checkpointed index (0 before the first checkpoint).
+            generation (int): Log generation; bumped by `clear` and `compact`.
+        Returns:
+            None
+        Raises:
+            ValueError: If an existing log or index file is not in this format.
+        """
+        self.directory = directory
+        self.sync_every = sync_every
+        self.checkpoint_every = checkpoint_every
+        self._log_path = os.path.join(directory, LOG_NAME)
+        self._index_path = os.path.join(directory, INDEX_NAME)
+        os.makedirs(directory, exist_ok=True)
+        self._log = None
+        self._open()
+
+
+    #open the log, map the last checkpoint and replay the records written after it
+    def _open(self):
+        if not os.path.exists(self._log_path):
+            self._write_log_header(self._log_path, 1)
+            _fsync_directory(self.directory)
+
+        self._log = open(self._log_path, "r+b", buffering=0)  #unbuffered: every record is readable with pread at once
+        magic, version, self.generation = _LOG_HEADER.unpack(self._log.read(_LOG_HEADER.size).ljust(_LOG_HEADER.size, b"\0"))
+        if magic != MAGIC_LOG or version != FORMAT_VERSION:
+            self._log.close()
+            raise ValueError(f"{self._log_path} is not a version {FORMAT_VERSION} package log.")
+        self._end = os.fstat(self._log.fileno()).st_size
+
+        self._recent = {}  #key -> record offset, or None if deleted, for changes since the checkpoint
+        self._unsynced = 0
+        covered = self._map_index()
+        self._since_checkpoint = self._replay(covered)
+        self._log.seek(self._end)
+
+
+    #write a fresh log header
+    @staticmethod
+    def _write_log_header(path, generation):
+        with open(path, "wb") as log_file:
+            log_file.write(_LOG_HEADER.pack(MAGIC_LOG, FORMAT_VERSION, generation))
+            log_file.flush()
+            os.fsync(log_file.fileno())
+
+
+    #map the checkpointed index; returns the log offset it covers
+    def _map_index(self):
+        """
+        Memory-maps the index file written by the last checkpoint.
+        An index from another log generation (or one claiming more log than
+        exists) is ignored, and the whole log is replayed instead.
+
+        Args:
+            None
+        Returns:
+            int: The log offset from which records must be replayed.
+        Raises:
+            ValueError: If the index file is not in this format.
+        """
+        self._index = None
+        self._slots = None
+        self.capacity = 0
+        self.size = 0
+        self._filled = 0
+        if not os.path.exists(self._index_path):
+            return _LOG_HEADER.size
+
+        with open(self._index_path, "rb") as index_file:
+            mapped = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, generation, capacity, count, filled, covered = _INDEX_HEADER.unpack_from(mapped)
+        if magic != MAGIC_INDEX or version != FORMAT_VERSION:
+            mapped.close()
+            raise ValueError(f"{self._index_path} is not a version {FORMAT_VERSION} package index.")
+        if generation != self.generation or covered > self._end:
+            mapped.close()
+            logging.warning(f"{self._index_path} does not match {self._log_path}; replaying the whole log")
+            return _LOG_HEADER.size
+
+        self._index = mapped
+        self._slots = memoryview(mapped)[_INDEX_HEADER.size:].cast("Q")
+        self.capacity = capacity
+        self.size = count
+        self._filled = filled
+        return covered
+
+
+    #release the mapped index
+    def _unmap_index(self):
+        if self._slots is not None:
+            self._slots.release()
+            self._index.close()
+        self._index = None
+        self._slots = None
+
+
+    #apply the log records after the checkpoint, cutting off a torn tail
+    def _replay(self, offset):
+        """
+        Re-applies every complete record from `offset` to the end of the log.
+        The first record that is cut short or fails its crc32 marks the point a
+        crash interrupted; the log is truncated there.
+
+        Args:
+            offset (int): Log offset covered by the mapped checkpoint.
+        Returns:
+            int: The number of records replayed.
+        """
+        replayed = 0
+        self._log.seek(offset)
+        while offset < self._end:
+            header = self._log.read(_RECORD_SIZE)
+            if len(header) == _RECORD_SIZE:
+                crc, = _CRC.unpack_from(header)
+                value_length, op, kind, key_length = _RECORD.unpack_from(header, _CRC.size)
+                body = self._log.read(key_length + value_length)
+                if len(body) == key_length + value_length and zlib.crc32(body, zlib.crc32(header[_CRC.size:])) == crc:
+                    key = _decode_key(kind, body[:key_length])
+                    self._note(key, offset if op == _PUT else None, self._locate(key) is not None)
+                    offset += _RECORD_SIZE + key_length + value_length
+                    replayed += 1
+                    continue
+
+            logging.warning(f"{self._log_path}: discarding {self._end - offset} bytes of an incomplete record at {offset}")
+            self._log.truncate(offset)
+            os.fsync(self._log.fileno())
+            self._end = offset
+        return replayed
+
+
+    #record offset of a key's live value, or None
+    def _locate(self, key, code=None):
+        if key in self._recent:
+            return self._recent[key]
+        slot = self._find_slot(key, key_hash(key) if code is None else code)
+        return None if slot < 0 else self._slots[2 * slot + 1]
+
+
+    #probe the mapped index for a key
+    def _find_slot(self, key, code, slots=None, capacity=None):
+        """
+        Follows the linear probe sequence of a key hash through an index slot array.
+        A slot with the same hash is confirmed by reading the key from its record.
+
+        Args:
+            key (int, str or bytes): The key to find.
+            code (int): The key's hash from `key_hash`.
+            slots (memoryview, optional): Slot array to search. Defaults to the mapped index.
+            capacity (int, optional): Slots in `slots`. Defaults to the mapped index's capacity.
+        Returns:
+            int: The slot index holding the key, or -1 if it is not in the index.
+        """
+        if slots is None:
+            slots, capacity = self._slots, self.capacity
+        if not capacity:
+            return -1
+        mask = capacity - 1
+        slot = code >> (64 - (capacity.bit_length() - 1))
+        while True:
+            offset = slots[2 * slot + 1]
+            if offset == _EMPTY:
+                return -1
+            if offset != _DELETED and slots[2 * slot] == code and self._read_key(offset) == key:
+                return slot
+            slot = (slot + 1) & mask
+
+
+    #read the key stored in a record
+    def _read_key(self, offset):
+        header = os.pread(self._log.fileno(), _RECORD_SIZE, offset)
+        _, _, kind, key_length = _RECORD.unpack_from(header, _CRC.size)
+        return _decode_key(kind, os.pread(self._log.fileno(), key_length, offset + _RECORD_SIZE))
+
+
+    #read the key and pickled value stored in a record
+    def _read_record(self, offset):
+        header = os.pread(self._log.fileno(), _RECORD_SIZE, offset)
+        value_length, _, kind, key_length = _RECORD.unpack_from(header, _CRC.size)
+        body = os.pread(self._log.fileno(), key_length + value_length, offset + _RECORD_SIZE)
+        return _decode_key(kind, body[:key_length]), body[key_length:]
+
+
+    #track a change in the overlay and the live count
+    def _note(self, key, offset, existed):
+        self._recent[key] = offset
+        if offset is None:
+            if existed:
+                self.size -= 1
+        elif not existed:
+            self.size += 1
+
+
+    #encode one record
+    @staticmethod
+    def _pack_record(op, key, value):
+        kind, raw = _encode_key(key)
+        if len(raw) > 0xFFFF:
+            raise ValueError("Hash table keys are limited to 65535 bytes.")
+        body = _RECORD.pack(len(value), op, kind, len(raw))
+        return _CRC.pack(zlib.crc32(raw + value, zlib.crc32(body))) + body + raw + value
+
+
+    #append records to the log, syncing once per batch
+    def _append(self, records, count):
+        offset = self._end
+        self._log.write(records)
+        self._end += len(records)
+        self._unsynced += count
+        if self._unsynced >= self.sync_every:
+            self.sync()
+        return offset
+
+
+    #after each write: checkpoint once enough records have accumulated
+    def _wrote(self, count=1):
+        self._since_checkpoint += count
+        if self._since_checkpoint >= self.checkpoint_every:
+            self.checkpoint()
+
+
+    #function to insert new data into hash table
+    def insert(self, key, value):
+        """
+        Inserts a new key-value pair, or replaces the value of an existing key,
+        by appending one record to the log.
+
+        Args:
+            key (int, str or bytes): The key for the data entry.
+            value (any): The value to store; it must be picklable.
+        Returns:
+            None
+        """
+        code = key_hash(key)
+        existed = self._locate(key, code) is not None
+        record = self._pack_record(_PUT, key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        self._note(key, self._append(record, 1), existed)
+        self._wrote()
+
+
+    #function to load many key-value pairs at once
+    def bulk_load(self, items, expected_size=None, unique_keys=False):
+        """
+        Appends many key-value pairs in large writes, then checkpoints once.
+        With `unique_keys` the caller guarantees the keys are new and distinct, so
+        no existing record is looked up. `expected_size` is accepted for
+        compatibility with HashTable; the index is sized at the checkpoint.
+
+        Args:
+            items (iterable): (key, value) pairs.
+            expected_size (int, optional): Ignored. Defaults to None.
+            unique_keys (bool, optional): Keys are distinct and not yet stored. Defaults to False.
+        Returns:
+            int: The number of pairs read from `items`.
+        """
+        batch, keys, count = [], [], 0
+        batch_bytes = 0
+        for key, value in items:
+            record = self._pack_record(_PUT, key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+            batch.append(record)
+            keys.append(key)
+            batch_bytes += len(record)
+            count += 1
+            if batch_bytes >= 1 << 20:  #write about 1 MB at a time
+                self._flush_batch(batch, keys, unique_keys)
+                batch, keys, batch_bytes = [], [], 0
+        self._flush_batch(batch, keys, unique_keys)
+        self._since_checkpoint += count
+        self.checkpoint()
+        return count
+
+
+    #write one bulk_load batch and note its keys
+    def _flush_batch(self, batch, keys, unique_keys):
+        if not batch:
+            return
+        offset = self._append(b"".join(batch), len(batch))
+        for key, record in zip(keys, batch):
+            self._note(key, offset, False if unique_keys else self._locate(key) is not None)
+            offset += len(record)
+
+
+    # function to look up data or retrieve from hash table via package ID key
+    def lookup(self, key):
+        """
+        Retrieves a value by key: the overlay of recent changes first, then the
+        mapped index, then one read of the record from the log.
+
+        Args:
+            key (int, str or bytes): The key for the data entry.
+        Returns:
+            any: A fresh copy of the stored value, or None if the key does not exist.
+        """
+        offset = self._locate(key)
+        if offset is None:
+            return None
+        return pickle.loads(self._read_record(offset)[1])
+
+
+    # function to update an object stored in the hash table
+    def update(self, key, new_value):
+        """
+        Replaces the value of an existing key.
+
+        Args:
+            key (int, str or bytes): The key identifying the entry to update.
+            new_value (any): The new value; it must be picklable.
+        Returns:
+            bool: True if the update was successful, False if the key was not found.
+        """
+        code = key_hash(key)
+        if self._locate(key, code) is None:
+            return False
+        record = self._pack_record(_PUT, key, pickle.dumps(new_value, pickle.HIGHEST_PROTOCOL))
+        self._note(key, self._append(record, 1), True)
+        self._wrote()
+        return True
+
+
+    # function to delete from hash table - append a delete record
+    def delete(self, key):
+        """
+        Removes a key-value pair by appending a delete record.
+
+        Args:
+            key (int, str or bytes): The key of the entry to remove.
+        Returns:
+            bool: True if the key was successfully deleted, False if the key was not found.
+        """
+        if self._locate(key) is None:
+            return False
+        self._note(key, None, True)
+        self._append(self._pack_record(_DELETE, key, b""), 1)
+        self._wrote()
+        return True
+
+
+    #force the log to disk
+    def sync(self):
+        """
+        Flushes every appended record to stable storage with fsync.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self._unsynced:
+            os.fsync(self._log.fileno())
+            self._unsynced = 0
+
+
+    #write the index for the current state and map it
+    def checkpoint(self):
+        """
+        Writes a new index covering the whole log and maps it in place of the old one.
+        The log is synced first, the index is written to a temporary file, synced
+        and renamed over the old index, so a crash at any point leaves a valid
+        checkpoint. The old slots are copied as-is and only the keys changed since
+        the last checkpoint are applied; once deleted and live slots would pass
+        MAX_INDEX_LOAD the index is rebuilt at twice the live count instead.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.sync()
+        if not self._recent and self._index is not None:
+            return
+
+        filled = self._filled + len(self._recent)
+        if self.capacity and filled <= self.capacity * MAX_INDEX_LOAD:
+            data = bytearray(self._index)  #copy the current slots, then apply the overlay
+            capacity = self.capacity
+            rebuilt = False
+            filled = self._filled
+        else:  #rebuild without deleted slots; the size may come out the same as before
+            capacity = 1 << max(6, (2 * self.size).bit_length())
+            data = bytearray(_INDEX_HEADER.size + 16 * capacity)
+            rebuilt = True
+            filled = 0
+        slots = memoryview(data)[_INDEX_HEADER.size:].cast("Q")
+        mask = capacity - 1
+        shift = 64 - (capacity.bit_length() - 1)
+
+        try:
+            if rebuilt and self._slots is not None:  #carry over the old slots of keys not changed since
+                old = self._slots
+                recent_codes = {key_hash(key) for key in self._recent}
+                for old_slot in range(self.capacity):
+                    offset = old[2 * old_slot + 1]
+                    if offset > _DELETED:
+                        code = old[2 * old_slot]
+                        if code in recent_codes and self._read_key(offset) in self._recent:
+                            continue  #re-added below if it is still live
+                        slot = code >> shift
+                        while slots[2 * slot + 1] != _EMPTY:
+                            slot = (slot + 1) & mask
+                        slots[2 * slot], slots[2 * slot + 1] = code, offset
+                        filled += 1
+
+            for key, offset in self._recent.items():
+                code = key_hash(key)
+                slot = self._find_slot(key, code, slots, capacity)
+                if slot >= 0:
+                    slots[2 * slot + 1] = _DELETED if offset is None else offset
+                elif offset is not None:
+                    slot = code >> shift
+                    while slots[2 * slot + 1] > _DELETED:
+                        slot = (slot + 1) & mask
+                    if slots[2 * slot + 1] == _EMPTY:
+                        filled += 1
+                    slots[2 * slot], slots[2 * slot + 1] = code, offset
+        finally:
+            slots.release()
+
+        _INDEX_HEADER.pack_into(data, 0, MAGIC_INDEX, FORMAT_VERSION, self.generation,
+                                capacity, self.size, filled, self._end)
+        self._write_index(data)
+        self._recent.clear()
+        self._since_checkpoint = 0
+
+
+    #atomically replace the index file and map the new one
+    def _write_index(self, data):
+        temporary_path = self._index_path + ".tmp"
+        with open(temporary_path, "wb") as index_file:
+            index_file.write(data)
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        self._unmap_index()
+        os.replace(temporary_path, self._index_path)
+        _fsync_directory(self.directory)
+        self._map_index()
+
+
+    #rewrite the log with only the live records
+    def compact(self):
+        """
+        Rewrites the log keeping only the current record of every live key, and
+        checkpoints an index for it. The new log gets the next generation, so if a
+        crash lands between the two renames the old index is recognised as stale
+        and the new log is replayed in full.
+
+        Args:
+            None
+        Returns:
+            int: Bytes reclaimed from the log.
+        """
+        self.sync()
+        old_size = self._end
+        generation = self.generation + 1
+        temporary_path = self._log_path + ".tmp"
+        self._write_log_header(temporary_path, generation)
+        with open(temporary_path, "ab") as new_log:
+            for offset in self._live_offsets():
+                header = os.pread(self._log.fileno(), _RECORD_SIZE, offset)
+                value_length, _, _, key_length = _RECORD.unpack_from(header, _CRC.size)
+                new_log.write(header + os.pread(self._log.fileno(), key_length + value_length, offset + _RECORD_SIZE))
+            new_log.flush()
+            os.fsync(new_log.fileno())
+
+        self._unmap_index()
+        self._log.close()
+        os.replace(temporary_path, self._log_path)
+        _fsync_directory(self.directory)
+        if os.path.exists(self._index_path):
+            os.remove(self._index_path)
+        self._open()  #replays the compacted log once
+        self.checkpoint()
+        return old_size - self._end
+
+
+    #record offset of every live key: mapped index slots not overridden, then the overlay
+    def _live_offsets(self):
+        for slot in range(self.capacity):
+            offset = self._slots[2 * slot + 1]
+            if offset > _DELETED and (not self._recent or self._read_key(offset) not in self._recent):
+                yield offset
+        for offset in self._recent.values():
+            if offset is not None:
+                yield offset
+
+
+    #function to empty the store
+    def clear(self):
+        """
+        Removes every entry: the log is started over under the next generation and
+        the index is removed.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        generation = self.generation + 1
+        self._unmap_index()
+        self._log.close()
+        if os.path.exists(self._index_path):
+            os.remove(self._index_path)
+        self._write_log_header(self._log_path, generation)
+        _fsync_directory(self.directory)
+        self._open()
+
+
+    #sync, checkpoint and close the files
+    def close(self):
+        """
+        Syncs the log, checkpoints so the next open replays nothing, and closes the files.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self._log is None:
+            return
+        if self._since_checkpoint or self._recent:
+            self.checkpoint()
+        self.sync()
+        self._unmap_index()
+        self._log.close()
+        self._log = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    #number of key-value pairs stored - len(table)
+    def __len__(self):
+        return self.size
+
+
+    #membership test - `key in table`
+    def __contains__(self, key):
+        return self._locate(key) is not None
+
+
+    #walk every stored (key, pickled value) pair
+    def _records(self):
+        """
+        Yields (key, pickled value) for every live key, index slots first.
+        Writing to the store while iterating raises RuntimeError once a checkpoint
+        replaces the mapped index.
+
+        Args:
+            None
+        Returns:
+            generator: (key, bytes) pairs.
+        Raises:
+            RuntimeError: If the store is checkpointed during iteration.
+        """
+        index, recent = self._index, self._recent
+        for slot in range(self.capacity):
+            if self._index is not index:
+                raise RuntimeError("DiskHashTable checkpointed during iteration")
+            offset = self._slots[2 * slot + 1]
+            if offset > _DELETED:
+                key, value = self._read_record(offset)
+                if key not in recent:
+                    yield key, value
+        for key, offset in list(recent.items()):
+            if offset is not None:
+                yield self._read_record(offset)
+
+
+    #walk every key - `for key in table`
+    def __iter__(self):
+        return (key for key, _ in self._records())
+
+
+    #walk every stored (key, value) pair
+    def items(self):
+        """
+        Yields every stored (key, value) pair; values are fresh copies.
+
+        Args:
+            None
+        Returns:
+            generator: (key, value) tuples.
+        """
+        return ((key, pickle.loads(value)) for key, value in self._records())
+
+
+    #walk every value
+    def values(self):
+        """
+        Yields every stored value; values are fresh copies.
+
+        Args:
+            None
+        Returns:
+            generator: The stored values.
+        """
+        return (pickle.loads(value) for _, value in self._records())
+
+
+    #walk every (key, value) pair in ascending key order
+    def ordered_items(self):
+        """
+        Yields every stored (key, value) pair in ascending key order.
+
+        Args:
+            None
+        Returns:
+            generator: (key, value) tuples, smallest key first.
+        """
+        for key, value in sorted(self._records(), key=lambda record: key_order(record[0])):
+            yield key, pickle.loads(value)
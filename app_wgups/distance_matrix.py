@@ -1,72 +1,619 @@
-#nested dictionary structure to hold WGU Distances data from provided.csv
+#indexed distance matrix to hold WGU Distances data from provided.csv
 #Sources for code: Python 3.9.21 documentation found at https://docs.python.org/3.9/index.html
 #and W3Schools for data types found at https://www.w3schools.com/python/python_tuples.asp
 
 import csv
-from typing import Dict, List, Tuple
+import re
+from array import array
+from typing import Dict, List, Optional, Union
+
+from app_wgups.neighbors import DEFAULT_NEIGHBORS, NeighborLists
+
+#spelling variants folded together by canonicalize_address (directionals and street suffixes)
+ADDRESS_ABBREVIATIONS = {
+    "north": "n", "south": "s", "east": "e", "west": "w",
+    "northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw",
+    "street": "st", "avenue": "ave", "av": "ave", "boulevard": "blvd", "road": "rd",
+    "drive": "dr", "lane": "ln", "court": "ct", "place": "pl", "parkway": "pkwy",
+    "highway": "hwy", "circle": "cir", "terrace": "ter", "station": "sta",
+    "suite": "ste", "apartment": "apt",
+}
+
+_ADDRESS_PUNCTUATION = re.compile(r"[.,]")
+
+
+#normalize an address so different spellings of the same place compare equal
+def canonicalize_address(address: str) -> str:
+    """
+    Reduces an address to a canonical form for matching.
+    Whitespace is trimmed and collapsed, case is folded, periods and commas are
+    dropped, and directionals / street suffixes are abbreviated, so that e.g.
+    "5383 South 900 East #104" and "5383 S 900 East #104" produce the same key.
+
+    Args:
+        address (str): The address as written in the package or matrix data.
+    Returns:
+        str: The canonical form of the address.
+    """
+    tokens = _ADDRESS_PUNCTUATION.sub("", address).lower().split()
+    return " ".join(ADDRESS_ABBREVIATIONS.get(token, token) for token in tokens)
+
+
+#position of cell (i, j) in a packed lower triangle - symmetry handled by the index math
+def packed_index(i: int, j: int) -> int:
+    """
+    Computes the offset of matrix cell (i, j) in packed lower-triangle storage.
+    Row i of the lower triangle holds cells (i, 0) .. (i, i), so it starts at
+    offset i * (i + 1) / 2. Cells above the diagonal are mirrored by swapping
+    the indices, since the distance from A → B is the same as B → A.
+
+    Args:
+        i (int): The row (from) address id.
+        j (int): The column (to) address id.
+    Returns:
+        int: The offset of the cell in the packed array.
+    """
+    if i < j:
+        i, j = j, i
+    return i * (i + 1) // 2 + j
+
+
+#number of doubles needed to store a symmetric matrix of n addresses
+def packed_size(n: int) -> int:
+    """
+    Returns the length of the packed lower triangle for an n x n symmetric matrix.
+
+    Args:
+        n (int): The number of addresses.
+    Returns:
+        int: n * (n + 1) / 2, the number of stored cells including the diagonal.
+    """
+    return n * (n + 1) // 2
+
+
+#address -> dense integer id index shared by every distance backend
+class AddressIndex:
+    def __init__(self, addresses: List[str], aliases: Optional[Dict[str, int]] = None):
+        """
+        Initializes the address index of a distance backend.
+        Each address is assigned the id of its position in `addresses`, and a
+        canonicalization index is built once so that any spelling of a known
+        address resolves to its id without string matching on the hot path.
+
+        Args:
+            addresses (list of str): The addresses, in id order.
+            aliases (dict, optional): Extra address spellings mapped to an existing id
+                                      (e.g. header labels that differ from row labels).
+        Attributes:
+            addresses (list): Address for each id.
+            size (int): The number of addresses.
+            address_ids (dict): Maps every known address spelling to its id.
+            canonical_ids (dict): Maps the canonical form of every known spelling to its id.
+        Returns:
+            None
+        """
+        self.addresses = list(addresses)
+        self.size = len(self.addresses)
+        self.address_ids = {address: i for i, address in enumerate(self.addresses)}
+        if aliases:
+            self.address_ids.update(aliases)
+
+        #canonicalization index, built once so lookups never fall back to string matching
+        self.canonical_ids = {}
+        for address, address_id in self.address_ids.items():
+            self.canonical_ids.setdefault(canonicalize_address(address), address_id)
+
+
+    #extra spellings registered for existing ids (e.g. column headers that differ from row labels)
+    def aliases(self) -> Dict[str, int]:
+        """
+        Returns the address spellings that are not the primary address of their id.
+
+        Args:
+            None
+        Returns:
+            dict: Maps each alias spelling to its address id.
+        """
+        return {address: address_id for address, address_id in self.address_ids.items()
+                if self.addresses[address_id] != address}
+
+
+    #translate an address string into its integer id
+    def address_id(self, address: str) -> Optional[int]:
+        """
+        Returns the integer id assigned to an address.
+
+        Args:
+            address (str): The address to look up.
+        Returns:
+            int or None: The id of the address, or None if it is not in the index.
+        """
+        return self.address_ids.get(address)
+
+
+    #resolve any spelling of an address to its id: exact match first, then canonical form
+    def resolve(self, address: str) -> Optional[int]:
+        """
+        Resolves an address, as written anywhere in the input data, to its id.
+        An exact spelling is tried first; otherwise the canonical form of the
+        address (see `canonicalize_address`) is looked up.
+
+        Args:
+            address (str): The address to resolve.
+        Returns:
+            int or None: The id of the address, or None if no spelling matches.
+        """
+        address_id = self.address_ids.get(address)
+        if address_id is None:
+            address_id = self.canonical_ids.get(canonicalize_address(address))
+        return address_id
+
+
+    #add one spelling of an address to the exact and canonical indexes
+    def _register(self, address: str, address_id: int) -> None:
+        self.address_ids[address] = address_id
+        self.canonical_ids.setdefault(canonicalize_address(address), address_id)
+
+
+    #drop every spelling that points at an address id
+    def _unregister(self, address_id: int) -> None:
+        for index in (self.address_ids, self.canonical_ids):
+            for spelling in [spelling for spelling, spelling_id in index.items() if spelling_id == address_id]:
+                del index[spelling]
+
+
+    #accept either an address id (routing fast path) or an address string
+    def location_id(self, location: Union[int, str]) -> Optional[int]:
+        """
+        Returns the id for a location given as an address id or an address string.
+
+        Args:
+            location (int or str): An address id, or an address to resolve.
+        Returns:
+            int or None: The address id, or None if the address is unknown.
+        """
+        return location if type(location) is int else self.resolve(location)
+
+
+    def __contains__(self, address):
+        return self.resolve(address) is not None
+
+
+    def __len__(self):
+        return self.size
+
+
+#index-based distance matrix: every address gets a dense integer id at load time
+class DistanceMatrix(AddressIndex):
+    def __init__(self, addresses: List[str], distances, aliases: Optional[Dict[str, int]] = None):
+        """
+        Initializes a distance matrix indexed by dense integer address ids.
+        Each address is assigned the id of its position in `addresses`. The matrix
+        is symmetric, so only the lower triangle is stored, packed into one flat
+        array of n(n+1)/2 doubles; a lookup is two dict hits (address -> id)
+        followed by a single array index.
+
+        Args:
+            addresses (list of str): The addresses of the matrix, in row/column order.
+            distances (sequence of float): Packed lower-triangle distances, see `packed_index`.
+                                           NaN marks a missing distance.
+            aliases (dict, optional): Extra address spellings mapped to an existing id
+                                      (e.g. header labels that differ from row labels).
+        Attributes:
+            distances (array): Packed lower-triangle array of distances in miles.
+            version (int): Incremented by every in-place change (see `update_distance`).
+            removed_ids (set): Ids of addresses removed with `remove_address`.
+            estimator (DistanceEstimator or None): Optional source of estimated distances for
+                                                   pairs the matrix cannot answer (see
+                                                   `app_wgups.spatial_index`). Defaults to None.
+            (see AddressIndex for the address attributes)
+        Returns:
+            None
+        """
+        super().__init__(addresses, aliases)
+        self.distances = distances
+
+        self._neighbor_lists = {}  #k -> NeighborLists, built on first use
+        self._travel_seconds = {}  #speed (mph) -> packed travel-time array, built on first use
+
+        #in-place changes (road closures, new addresses) bump the version and notify subscribers
+        self.version = 0
+        self.removed_ids = set()
+        self._subscribers = []
+
+        self.estimator = None  #coordinate-based estimates for unknown addresses / missing cells, off by default
+
+
+    #O(1) distance lookup by address ids
+    def distance_by_id(self, from_id: int, to_id: int) -> Optional[float]:
+        """
+        Retrieves the distance between two address ids with a single array index.
+
+        Args:
+            from_id (int): The id of the starting address.
+            to_id (int): The id of the destination address.
+        Returns:
+            float or None: The distance in miles, or None if the cell is empty.
+        """
+        if from_id < to_id:
+            from_id, to_id = to_id, from_id
+        distance = self.distances[from_id * (from_id + 1) // 2 + to_id]
+        return None if distance != distance else distance  #NaN marks a missing cell
+
+
+    #O(1) distance lookup by address ids or address strings
+    def get_distance(self, from_address: Union[int, str], to_address: Union[int, str]) -> Optional[float]:
+        """
+        Retrieves the distance between two addresses.
+        Each side may be given as an address id (the fast path used by routing,
+        see `Package.location`) or as an address string, which is resolved first.
+        When an `estimator` is set, a pair the matrix cannot answer gets an
+        estimated distance instead of None.
+
+        Args:
+            from_address (int or str): The starting address id or address.
+            to_address (int or str): The destination address id or address.
+        Returns:
+            float or None: The distance in miles, or None if either address is unknown
+                           (and no estimate is available).
+        """
+        from_id = self.location_id(from_address)
+        to_id = self.location_id(to_address)
+        distance = None if from_id is None or to_id is None else self.distance_by_id(from_id, to_id)
+        if distance is None and self.estimator is not None:
+            return self.estimator.estimate(from_address, to_address)
+        return distance
+
+
+    #integer travel-time matrix for one speed profile, parallel to the packed distances
+    def travel_seconds(self, speed: float) -> array:
+        """
+        Returns the travel time in whole seconds for every cell, at a constant speed.
+        The array has the same packed lower-triangle layout as `distances` (see
+        `packed_index`) and is cached per speed, so simulations can add integers
+        instead of building a timedelta for every leg. Missing distances are -1.
+
+        Args:
+            speed (float): The travel speed in miles per hour.
+        Returns:
+            array: Packed travel times in seconds, rounded to the nearest second.
+        """
+        seconds = self._travel_seconds.get(speed)
+        if seconds is None:
+            seconds_per_mile = 3600.0 / speed
+            seconds = array("l", [-1 if distance != distance else round(distance * seconds_per_mile)
+                                  for distance in self.distances])
+            self._travel_seconds[speed] = seconds
+        return seconds
+
+
+    #O(1) travel-time lookup by address ids or address strings
+    def get_travel_seconds(self, from_address: Union[int, str], to_address: Union[int, str], speed: float) -> Optional[int]:
+        """
+        Retrieves the travel time between two addresses at a constant speed.
+
+        Args:
+            from_address (int or str): The starting address id or address.
+            to_address (int or str): The destination address id or address.
+            speed (float): The travel speed in miles per hour.
+        Returns:
+            int or None: The travel time in seconds, or None if either address is unknown.
+        """
+        from_id = self.location_id(from_address)
+        to_id = self.location_id(to_address)
+        if from_id is None or to_id is None:
+            return None
+        seconds = self.travel_seconds(speed)[packed_index(from_id, to_id)]
+        return None if seconds < 0 else seconds
+
+
+    #total driving time of a route given as a sequence of address ids
+    def route_travel_seconds(self, stop_ids: List[int], speed: float) -> Optional[int]:
+        """
+        Adds up the travel time of a route with integer arithmetic only.
+
+        Args:
+            stop_ids (list of int): The address ids visited, in order.
+            speed (float): The travel speed in miles per hour.
+        Returns:
+            int or None: The total travel time in seconds, or None if any leg is missing.
+        """
+        seconds = self.travel_seconds(speed)
+        total = 0
+        for from_id, to_id in zip(stop_ids, stop_ids[1:]):
+            leg = seconds[packed_index(from_id, to_id)]
+            if leg < 0:
+                return None
+            total += leg
+        return total
+
+
+    #register a callback for in-place changes
+    def subscribe(self, callback) -> None:
+        """
+        Registers a callback that is notified after every in-place change.
+        The callback is called as callback(matrix, event, address_ids), where event
+        is "add", "update" or "remove" and address_ids lists the ids whose distances
+        changed, so caches can invalidate only the affected entries.
+
+        Args:
+            callback (callable): The function to notify.
+        Returns:
+            None
+        """
+        self._subscribers.append(callback)
+
+
+    def unsubscribe(self, callback) -> None:
+        """
+        Removes a callback registered with `subscribe`.
+
+        Args:
+            callback (callable): The function to stop notifying.
+        Returns:
+            None
+        """
+        self._subscribers.remove(callback)
+
+
+    #resolve a location for an in-place change; ids that are out of range or removed count as unknown
+    def _live_id(self, location: Union[int, str]) -> Optional[int]:
+        address_id = self.location_id(location)
+        if address_id is None or not 0 <= address_id < self.size or address_id in self.removed_ids:
+            return None
+        return address_id
+
+
+    #add a new address in place: the packed triangle grows by exactly one row
+    def add_address(self, address: str, distances_to: Dict[Union[int, str], float]) -> int:
+        """
+        Adds an address to the matrix without reloading it.
+        Because the storage is a packed lower triangle, the new address's row is
+        simply appended to the end of the array.
+
+        Args:
+            address (str): The new address.
+            distances_to (dict): Distance in miles from the new address to existing
+                                 addresses (given as ids or address strings). Pairs that
+                                 are left out are stored as missing.
+        Returns:
+            int: The id assigned to the new address.
+        Raises:
+            ValueError: If the address already exists or a destination is unknown.
+        """
+        if self.resolve(address) is not None:
+            raise ValueError(f"Address {address!r} is already in the distance matrix.")
+        self._ensure_writable()
+
+        new_id = self.size
+        row = array("d", [float("nan")]) * (new_id + 1)
+        row[new_id] = 0.0
+        for location, distance in distances_to.items():
+            to_id = self._live_id(location)
+            if to_id is None:
+                raise ValueError(f"Unknown address {location!r} in distances for {address!r}.")
+            row[to_id] = float(distance)
+
+        start = len(self.distances)
+        self.distances.extend(row)
+        self.addresses.append(address)
+        self.size += 1
+        self._register(address, new_id)
+
+        self._changed("add", [new_id], range(start, start + new_id + 1))
+        return new_id
+
+
+    #change one distance in place (e.g. a road closure or detour)
+    def update_distance(self, from_address: Union[int, str], to_address: Union[int, str], distance: Optional[float]) -> None:
+        """
+        Updates the distance between two addresses in place.
+
+        Args:
+            from_address (int or str): One address id or address.
+            to_address (int or str): The other address id or address.
+            distance (float or None): The new distance in miles, or None to mark it missing.
+        Returns:
+            None
+        Raises:
+            ValueError: If either address is unknown or has been removed.
+        """
+        from_id = self._live_id(from_address)
+        to_id = self._live_id(to_address)
+        if from_id is None or to_id is None:
+            raise ValueError(f"Unknown address in update: {from_address!r} → {to_address!r}.")
+        self._ensure_writable()
+
+        index = packed_index(from_id, to_id)
+        self.distances[index] = float("nan") if distance is None else float(distance)
+        self._changed("update", [from_id, to_id], [index])
+
+
+    #take an address out of service; ids stay stable so other caches remain valid
+    def remove_address(self, address: Union[int, str]) -> int:
+        """
+        Removes an address from the matrix in place.
+        Ids are never reused or renumbered: the address's distances are marked
+        missing and its spellings stop resolving, so every other id stays valid.
+
+        Args:
+            address (int or str): The address id or address to remove.
+        Returns:
+            int: The id of the removed address.
+        Raises:
+            ValueError: If the address is unknown or already removed.
+        """
+        address_id = self._live_id(address)
+        if address_id is None:
+            raise ValueError(f"Unknown address {address!r}.")
+        self._ensure_writable()
+
+        cells = [packed_index(address_id, other_id) for other_id in range(self.size)]
+        for index in cells:
+            self.distances[index] = float("nan")
+        self._unregister(address_id)
+        self.removed_ids.add(address_id)
+
+        self._changed("remove", [address_id], cells)
+        return address_id
+
+
+    #memory-mapped matrices are read-only - copy into a private array before the first change
+    def _ensure_writable(self) -> None:
+        if not isinstance(self.distances, array) or self.distances.typecode != "d":
+            self.distances = array("d", self.distances)
+
+
+    #refresh derived caches for the changed cells, then notify subscribers
+    def _changed(self, event: str, address_ids: List[int], cells) -> None:
+        self.version += 1
+
+        for speed, seconds in self._travel_seconds.items():
+            if len(seconds) < len(self.distances):
+                seconds.extend(array("l", [-1]) * (len(self.distances) - len(seconds)))
+            seconds_per_mile = 3600.0 / speed
+            for index in cells:
+                distance = self.distances[index]
+                seconds[index] = -1 if distance != distance else round(distance * seconds_per_mile)
+
+        for callback in list(self._subscribers):
+            callback(self, event, address_ids)
+
+
+    #precomputed k-nearest candidate lists, built once per k and reused by every route
+    def neighbor_lists(self, k: int = DEFAULT_NEIGHBORS) -> NeighborLists:
+        """
+        Returns the k-nearest-neighbour candidate lists for this matrix.
+
+        Args:
+            k (int, optional): Candidates kept per address. Defaults to 16.
+        Returns:
+            NeighborLists: The candidate lists, built on the first call for each k.
+        """
+        lists = self._neighbor_lists.get(k)
+        if lists is None:
+            lists = self._neighbor_lists[k] = NeighborLists(self, k)
+            self.subscribe(lists.on_matrix_change)  #keep the lists current when distances change
+        return lists
+
 
 # load data from provided Distance Matrix .csv file (stored in data folder)
-def load_distance_data(csv_path: str) -> Dict[str, List[Tuple[str, float]]]:
+def load_distance_data(csv_path: str, backend: str = "matrix", workers: Optional[int] = None):
     """
-    Loads a distance matrix from a CSV file and returns it as a nested dictionary.
+    Loads a distance matrix from a CSV file and returns it as a DistanceMatrix.
     The function reads a CSV file where the first row contains address headers,
-    and subsequent rows contain distances between locations. It returns an adjacency
-    matrix, where each key is a "from_address" and its value is a list of tuples
-    containing ("to_address", distance).
+    and subsequent rows contain distances between locations. Each row label is
+    assigned a dense integer id (its row position); the matching column header is
+    registered as an alias for the same id.
+
+    Rows are streamed straight into packed lower-triangle storage. Cells on or
+    below the diagonal are authoritative; a cell above the diagonal is only used
+    when its mirrored lower cell is empty, so half-filled (triangular) CSVs load
+    as full matrices.
+
+    A path ending in ".wgdm" is treated as a compiled binary matrix (see
+    `app_wgups.distance_binary`) and is memory-mapped instead of parsed.
+
+    With backend="road" the file is instead read as a road-network edge list
+    (see `app_wgups.road_network`), for areas too large for a full matrix, and
+    with backend="ch" it is a contraction hierarchy preprocessed from such an
+    edge list (see `app_wgups.contraction`). Every backend answers `get_distance`
+    the same way, so routing code can use any of them.
+
+    Passing workers > 1 parses a large CSV matrix in parallel worker processes
+    (see `app_wgups.parallel_loader`); the result is identical to the serial load.
+
+    Blank cells are left empty; an unparsable cell raises a ValueError naming its
+    line, row and column. For a full data-quality report (missing pairs, symmetry,
+    diagonal, triangle inequality) see `app_wgups.matrix_validation`.
 
     Args:
-        csv_path (str): The file path to the CSV containing the distance matrix.
+        csv_path (str): The file path to the CSV (or compiled .wgdm) distance matrix,
+                        the edge-list CSV when backend="road", or the .wgch file when backend="ch".
+        backend (str, optional): "matrix" (default), "road" or "ch".
+        workers (int, optional): Worker processes for parsing a CSV matrix. Defaults to None (serial).
     Returns:
-        Adjacency Matrix - Dict[str, List[Tuple[str, float]]]:
-        A dictionary where keys are addresses and values are lists of (destination_address, distance) tuples.
+        DistanceMatrix, RoadNetwork or ContractionHierarchy: The loaded distances, indexed by address id.
     Raises:
         FileNotFoundError: If the CSV file does not exist.
-        ValueError: If there are invalid or missing distance values in the CSV.
+        ValueError: If there are invalid distance values in the CSV, or the backend is unknown.
     """
-    
-    #return nested dictionary structure with distance matrix as nested dict
-    adjacency_matrix = { }   #top-level dict - initialize
+    if backend == "road":
+        from app_wgups.road_network import load_road_network  #imported here to avoid a circular import
+        return load_road_network(csv_path)
+    if backend == "ch":
+        from app_wgups.contraction import load_contraction_hierarchy  #imported here to avoid a circular import
+        return load_contraction_hierarchy(csv_path)
+    if backend != "matrix":
+        raise ValueError(f"Unknown distance backend {backend!r}; use 'matrix', 'road' or 'ch'.")
+
+    if csv_path.endswith(".wgdm"):
+        from app_wgups.distance_binary import load_distance_binary  #imported here to avoid a circular import
+        return load_distance_binary(csv_path)
+    if workers and workers > 1:
+        from app_wgups.parallel_loader import load_distance_data_parallel  #imported here to avoid a circular import
+        return load_distance_data_parallel(csv_path, workers)
+
+    row_addresses = []
 
     with open(csv_path, mode="r") as csvfile:
         reader = csv.reader(csvfile)
 
         raw_headers = next(reader)[1: ]  #first row contains address headers, skip cell A1, skip empty columns
-        addresses = list(filter(None, [header.strip() for header in raw_headers]))
+        headers = list(filter(None, [header.strip() for header in raw_headers]))
+        size = len(headers)
+        distances = array("d", [float("nan")]) * packed_size(size)
 
         for row in reader:
             if not row or len(row) < 2:   #handle broken data
                 continue
+            if len(row_addresses) == size:  #more rows than headers - ignore the extras
+                break
 
-            from_address = row[0].strip()  #first column contains from_address headers
+            i = len(row_addresses)
+            row_addresses.append(row[0].strip())  #first column contains from_address headers
 
-            distances = []  #initialize interior dict of str address, float distance pairs
+            for j, value in enumerate(row[1:size+1]):
+                if not value.strip():
+                    continue
+                index = packed_index(i, j)
+                if j <= i or distances[index] != distances[index]:  #upper cell only fills an empty slot
+                    try:
+                        distances[index] = float(value)
+                    except ValueError:
+                        raise ValueError(f"{csv_path}:{reader.line_num}: invalid distance {value!r} "
+                                         f"from {row_addresses[i]} to {headers[j]}") from None
 
-            for i, value in enumerate(row[1:len(addresses)+1]):  #iterate & fill dict from .csv
-                if value.strip():
-                    to_address = addresses[i]
-                distances.append( (to_address, float(value)) )
+    #fewer rows than headers: the first k rows of a packed triangle are its first k(k+1)/2 cells
+    del distances[packed_size(len(row_addresses)):]
 
-            adjacency_matrix[from_address] = distances
+    #column headers may be spelled differently from their row labels - register them as aliases
+    aliases = {header: i for i, header in enumerate(headers[:len(row_addresses)]) if header != row_addresses[i]}
 
-        return adjacency_matrix
+    return DistanceMatrix(row_addresses, distances, aliases)
 
 #Fretrieve distance between any two addresses
 def get_distance(distances, from_address, to_address):
     """
     Retrieves the distance between two addresses from a pre-loaded distance matrix.
-    This function first attempts to find the direct distance from `from_address`
-    to `to_address`. If no direct match is found, it checks the `to_address` entry,
-    leveraging data symmetry (i.e., distance from A → B is the same as B → A).
+    A DistanceMatrix or RoadNetwork answers directly from its own index. For the legacy
+    nested dictionary format, this function first attempts to find the direct distance
+    from `from_address` to `to_address`. If no direct match is found, it checks the
+    `to_address` entry, leveraging data symmetry (i.e., distance from A → B is the same as B → A).
 
     Args:
-        distances (dict): A nested dictionary structure where each key is a `from_address`,
-                          and its value is a list of tuples containing `(to_address, distance)`.
+        distances (DistanceMatrix, RoadNetwork or dict): A distance backend with its own
+                          `get_distance` method, or a nested dictionary where each key
+                          is a `from_address` and its value is a list of tuples
+                          containing `(to_address, distance)`.
         from_address (str): The starting address.
         to_address (str): The destination address.
     Returns:
         float or None: The distance in miles if a match is found; otherwise, returns None.
     """
-    
+    if not isinstance(distances, dict):
+        return distances.get_distance(from_address, to_address)
+
    # Direct lookup
     if from_address in distances:
         for address, distance in distances[from_address]:
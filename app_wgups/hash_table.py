@@ -1,45 +1,123 @@
 # implement hash table to hold Package objects
 # handles collisions using chaining
+# keys may be integer package ids or string/bytes tracking numbers (see app_wgups/key_hash.py)
 # sources for code:  Zybooks section 6, Hash Tables (all sub-sections) at https://learn.zybooks.com/zybook/WGUC950Template2023/chapter/6/section/1
 # also W3Schools - Python - DSA Hash Tables found at https://www.w3schools.com/dsa/dsa_theory_hashtables.php
+# and Python 3.9.21 documentation for iterator types, operator.itemgetter, collections.Counter and time.perf_counter found at
+# https://docs.python.org/3.9/library/stdtypes.html#iterator-types, https://docs.python.org/3.9/library/operator.html,
+# https://docs.python.org/3.9/library/collections.html and https://docs.python.org/3.9/library/time.html
+
+import time
+from collections import Counter
+from operator import itemgetter
+
+from app_wgups.key_hash import FIBONACCI, MASK64, key_hash, key_order
+
+MAX_LOAD_FACTOR = 1.0   #grow once entries outnumber buckets
+MIN_LOAD_FACTOR = 0.25  #shrink once fewer than one bucket in four is used
+REHASH_STEP = 4  #old buckets migrated per operation in incremental mode
+_EMPTY_BUCKET = ()  #shared placeholder - a bucket list is only allocated on its first insert
+
+#deterministic Miller-Rabin bases: correct for every n below 3.3 * 10^24
+_PRIME_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+#entries are (key, value, hash) tuples; the hash is cached so resizing never rehashes a key
+_KEY = itemgetter(0)
+_VALUE = itemgetter(1)
+_PAIR = itemgetter(0, 1)
+
 
 class HashTable:
-    def __init__(self, capacity=23):
+    def __init__(self, capacity=23, incremental=False, track_stats=False):
         """
         Initializes a hash table with a specified capacity.
         This constructor sets up the hash table with an initial number of buckets,
         initializes size tracking, and prepares for handling collisions using chaining.
+        The table grows (to the next prime above twice its capacity) when the load
+        factor passes MAX_LOAD_FACTOR and shrinks when it drops below MIN_LOAD_FACTOR,
+        never below the initial capacity.
+
+        In incremental mode a resize does not rehash everything at once: the old
+        buckets are kept and REHASH_STEP of them are migrated on every operation,
+        so no single insert pays for the whole rehash.
+
+        Resizes and the time spent rehashing are always counted. With `track_stats`
+        every lookup also counts a hit or miss and the entries it compared, a few
+        integer additions per lookup (and a single attribute test when off). See `stats`.
 
         Args:
             capacity (int, optional): The initial number of buckets in the hash table.
                                       Defaults to 23 (a prime number to reduce collisions).
+            incremental (bool, optional): Spread rehashing across operations. Defaults to False.
+            track_stats (bool, optional): Count lookup hits, misses and comparisons. Defaults to False.
         Attributes:
             capacity (int): The number of buckets in the hash table.
             size (int): The current number of key-value pairs stored in the table.
-            table (list): A list of empty lists, where each sublist represents a bucket.
-            longest_bucket (int): Tracks the maximum bucket size for auto-resizing logic.
+            table (list): A list of buckets; each bucket is a list of (key, value, hash) tuples,
+                          or an empty tuple until its first insert.
+            longest_bucket (int): The longest chain currently stored (computed on read, O(capacity)).
+            incremental (bool): Whether resizes migrate buckets gradually.
+            track_stats (bool): Whether lookups are counted.
+            resizes (int): Resizes since the table was created or `reset_stats` was called.
+            rehash_seconds (float): Time spent moving entries during those resizes.
         Returns:
             None
         """
         self.capacity = capacity
         self.size = 0  #track objects in table
-        self.table = [ []for _ in range(capacity) ]  #make the buckets
-        self.longest_bucket = 0  # Tracks the max length of any bucket for auto-resizing
+        self.table = [_EMPTY_BUCKET] * capacity  #make the buckets (allocated lazily)
+        self.incremental = incremental
+        self._min_capacity = capacity
+        self.track_stats = track_stats
+        self.reset_stats()
+
+        #incremental rehash state: buckets of the previous table not yet migrated into `table`
+        self._old_table = None
+        self._old_capacity = 0
+        self._migrated = 0  #old buckets [0, _migrated) are already empty
 
 
     #function to hash keys
     def hash(self, key):
         """
-        Computes the hash value for a given key.
-        This function applies the modulo operation to determine the appropriate
-        index in the hash table's bucket list.
+        Computes the bucket index for a given key.
+        The key's deterministic 64-bit hash (see `key_hash`) is reduced modulo the
+        prime capacity, so integer package ids and string tracking numbers are
+        spread over the buckets alike.
 
         Args:
-            key (int): The key to be hashed. It must be an integer.
+            key (int, str or bytes): The key to be hashed.
         Returns:
             int: The computed index in the hash table (0 to capacity - 1).
         """
-        return key % self.capacity
+        return key_hash(key) % self.capacity
+
+
+    #find the bucket holding a key - the current table first, then a not-yet-migrated old bucket
+    def _find(self, key, code):
+        """
+        Locates a key in the table (and, mid-rehash, in the old table).
+        Cached hashes are compared first, so a chain of string keys is scanned
+        without comparing the strings themselves.
+
+        Args:
+            key (int, str or bytes): The key to find.
+            code (int): The key's hash from `key_hash`.
+        Returns:
+            tuple: (bucket, position) of the entry, or (None, -1) if the key is not stored.
+        """
+        bucket = self.table[code % self.capacity]
+        for i, entry in enumerate(bucket):
+            if entry[2] == code and entry[0] == key:
+                return bucket, i
+
+        if self._old_table is not None:
+            bucket = self._old_table[code % self._old_capacity]
+            for i, entry in enumerate(bucket):
+                if entry[2] == code and entry[0] == key:
+                    return bucket, i
+
+        return None, -1
 
 
     #function to insert new data into hash table
@@ -47,33 +125,90 @@ class HashTable:
         """
         Inserts a new key-value pair into the hash table.
         If the key already exists, its value is updated.
-        If a bucket exceeds a length of 3 (due to collisions), the hash table resizes automatically.
+        If the load factor passes MAX_LOAD_FACTOR, the hash table resizes automatically.
 
         Args:
-            key (int): The key for the data entry. Must be an integer.
+            key (int, str or bytes): The key for the data entry, e.g. a package id or tracking number.
             value (any): The value associated with the key. Can be any data type.
         Returns:
             None: The function does not return anything. It modifies the hash table in place.
         """
-        index = self.hash(key)
-        bucket = self.table[index]
+        if self._old_table is not None:
+            self._rehash_step()
 
-        #update if key already exists
-        for i, (existing_key, _) in enumerate(bucket):
-            if existing_key == key:
-                bucket[i] = (key, value)
-                return
+        #update if key already exists (integer ids are mixed inline - same result as key_hash)
+        code = (key * FIBONACCI) & MASK64 if type(key) is int else key_hash(key)
+        bucket, i = self._find(key, code)
+        if bucket is not None:
+            bucket[i] = (key, value, code)
+            return
 
         #otherwise insert new key-value pair
-        bucket.append((key, value))
+        index = code % self.capacity
+        bucket = self.table[index]
+        if bucket is _EMPTY_BUCKET:
+            bucket = self.table[index] = []
+        bucket.append((key, value, code))
         self.size += 1
 
-        #update the largest bucket size to keep chaining in check
-        self.longest_bucket = max(self.longest_bucket, len(bucket))
+        #RESIZE table once the average chain length passes the maximum load factor
+        if self.size > self.capacity * MAX_LOAD_FACTOR:
+            self._resize(self._next_prime(self.capacity * 2))
 
-        #RESIZE table if any bucket exceeds chain length of 3
-        if len(bucket) > 3:
-            self._resize()
+
+    #function to load many key-value pairs at once into a table sized for all of them
+    def bulk_load(self, items, expected_size=None, unique_keys=False):
+        """
+        Inserts many key-value pairs with at most one resize.
+        The table is sized once for the existing entries plus the new ones, using
+        `expected_size`, else len(items), else the count after reading `items` into
+        a list. Pairs are then appended straight into their buckets. With
+        `unique_keys` the caller guarantees the keys are new and distinct, so the
+        per-insert duplicate scan of the bucket is skipped as well.
+
+        Args:
+            items (iterable): (key, value) pairs. Keys must be int, str or bytes.
+            expected_size (int, optional): Number of pairs to expect. Defaults to None.
+            unique_keys (bool, optional): Keys are distinct and not yet stored. Defaults to False.
+        Returns:
+            int: The number of pairs read from `items`.
+        """
+        if expected_size is None:
+            if not hasattr(items, "__len__"):
+                items = list(items)  #count the rows once so the table is sized only once
+            expected_size = len(items)
+
+        self._finish_rehash()
+        target = self.size + expected_size
+        if target > self.capacity * MAX_LOAD_FACTOR:
+            self._resize(self._next_prime(int(target / MAX_LOAD_FACTOR) + 1))
+            self._finish_rehash()  #bulk loading is one pause by design - never leave buckets behind
+
+        table, capacity = self.table, self.capacity
+        count = 0
+        added = 0
+        try:
+            for key, value in items:
+                count += 1
+                code = (key * FIBONACCI) & MASK64 if type(key) is int else key_hash(key)
+                index = code % capacity
+                bucket = table[index]
+                if bucket is _EMPTY_BUCKET:
+                    bucket = table[index] = []
+                elif not unique_keys:
+                    position = next((i for i, entry in enumerate(bucket) if entry[2] == code and entry[0] == key), -1)
+                    if position >= 0:  #update if key already exists
+                        bucket[position] = (key, value, code)
+                        continue
+                bucket.append((key, value, code))
+                added += 1
+        finally:  #a bad key or pair partway through still leaves the count matching the buckets
+            self.size += added
+
+        #the hint was too small - one resize for the whole overflow
+        if self.size > self.capacity * MAX_LOAD_FACTOR:
+            self._resize(self._next_prime(int(self.size / MAX_LOAD_FACTOR) + 1))
+        return count
 
 
     # function to look up data or retrieve from hash table via package ID key
@@ -84,17 +219,21 @@ class HashTable:
         If the key is found, it returns the associated value; otherwise, it returns None.
 
         Args:
-            key (int): The key for the data entry. Must be an integer.
+            key (int, str or bytes): The key for the data entry.
         Returns:
             any: The value associated with the key if found,
             or None if the key does not exist in the hash table.
         """
-        index = self.hash(key)
-        bucket = self.table[index]
+        if self._old_table is not None:
+            self._rehash_step()
+
+        if self.track_stats:
+            return self._counted_lookup(key)
 
-        for existing_key, value in bucket:
-            if existing_key == key:
-                return value   #when key is found, return value (package object)
+        code = (key * FIBONACCI) & MASK64 if type(key) is int else key_hash(key)
+        bucket, i = self._find(key, code)
+        if bucket is not None:
+            return bucket[i][1]   #when key is found, return value (package object)
 
         return None #only if key not found
 
@@ -108,18 +247,19 @@ class HashTable:
         If the key is not found, it returns False.
 
         Args:
-            key (int): The key identifying the entry to update.
+            key (int, str or bytes): The key identifying the entry to update.
             new_value (any): The new value to associate with the key.
         Returns:
             bool: True if the update was successful, False if the key was not found.
         """
-        index = self.hash(key)
-        bucket = self.table[index]
+        if self._old_table is not None:
+            self._rehash_step()
 
-        for i, (existing_key, _) in enumerate(bucket):
-            if existing_key == key:
-                bucket[i] = (key, new_value)
-                return True  #operation successful - key found, object updated
+        code = key_hash(key)
+        bucket, i = self._find(key, code)
+        if bucket is not None:
+            bucket[i] = (key, new_value, code)
+            return True  #operation successful - key found, object updated
 
         return False #if key not found
 
@@ -130,60 +270,335 @@ class HashTable:
         Removes a key-value pair from the hash table.
         This function searches for the specified key in the hash table.
         If found, it deletes the key-value pair and reduces the size count.
-        If the key is not found, it returns False.
+        If the key is not found, it returns False. The table shrinks once the
+        load factor falls below MIN_LOAD_FACTOR.
 
         Args:
-            key (int): The key of the entry to remove.
+            key (int, str or bytes): The key of the entry to remove.
         Returns:
             bool: True if the key was successfully deleted, False if the key was not found.
         """
-        index = self.hash(key)
-        bucket = self.table[index]
+        if self._old_table is not None:
+            self._rehash_step()
 
-        for i, (existing_key, _) in enumerate(bucket):
-            if existing_key == key:
-                del bucket[i]   #remove this key value pair
-                self.size -= 1   #reduce load count of hash table
-                return True  #successful find and delete
+        bucket, i = self._find(key, key_hash(key))
+        if bucket is None:
+            return False #if key not found
 
-        return False #if key not found
+        del bucket[i]   #remove this key value pair
+        self.size -= 1   #reduce load count of hash table
 
+        #SHRINK table when it is mostly empty buckets
+        if self.capacity > self._min_capacity and self.size < self.capacity * MIN_LOAD_FACTOR:
+            self._resize(max(self._min_capacity, self._next_prime(self.capacity // 2)))
+        return True  #successful find and delete
 
-    #function to RESIZE table - resizes to the next prime number for modulo
-    def _resize(self):
+
+    #function to empty the table and return it to its initial capacity
+    def clear(self):
         """
-        Dynamically resizes the hash table to maintain efficiency.
-        This function increases the table size to the next prime number
-        greater than twice the current capacity to maintain optimal hashing performance.
-        It then rehashes all existing key-value pairs into the new table.
+        Removes every entry and returns the table to its initial capacity.
 
         Args:
             None
         Returns:
             None: The function modifies the hash table in place.
         """
-        new_capacity = self._next_prime(self.capacity*2)
-        new_table = [ [] for _ in range(new_capacity) ]
+        self.capacity = self._min_capacity
+        self.table = [_EMPTY_BUCKET] * self.capacity
+        self.size = 0
+        self._old_table = None
+        self._old_capacity = 0
+        self._migrated = 0
+
+
+    #number of key-value pairs stored - len(table)
+    def __len__(self):
+        return self.size
+
+
+    #membership test - `key in table`; never migrates buckets
+    def __contains__(self, key):
+        return self._find(key, key_hash(key))[0] is not None
+
+
+    #walk every stored entry
+    def _entries(self):
+        """
+        Yields every stored (key, value, hash) entry, in bucket order.
+        The entries are the tuples already stored in the buckets, so the walk
+        allocates nothing per entry. A pending incremental rehash is completed
+        first: the walk visits every entry anyway, and afterwards each entry lives
+        in exactly one bucket. Inserting a new key or deleting one while the walk
+        is in progress raises RuntimeError, as it does for a dict; replacing the
+        value of an existing key is allowed.
+
+        Args:
+            None
+        Returns:
+            generator: (key, value, hash) tuples.
+        Raises:
+            RuntimeError: If the table changes size or is resized during iteration.
+        """
+        self._finish_rehash()
+        table, size = self.table, self.size
+        for bucket in table:
+            for entry in bucket:
+                yield entry
+                if self.size != size or self.table is not table:
+                    raise RuntimeError("HashTable changed size during iteration")
+
+
+    #walk every key - `for key in table`
+    def __iter__(self):
+        return map(_KEY, self._entries())
 
-        self.longest_bucket = 0  # Reset max bucket length tracker
 
-        for bucket in self.table:
-            for key, value in bucket:
-                new_index = key % new_capacity
-                new_table[new_index].append((key, value))
+    #walk every stored (key, value) pair
+    def items(self):
+        """
+        Yields every stored (key, value) pair, in bucket order (see `_entries`).
+
+        Args:
+            None
+        Returns:
+            iterator: (key, value) tuples.
+        """
+        return map(_PAIR, self._entries())
+
+
+    #walk every value
+    def values(self):
+        """
+        Yields every stored value, in bucket order (see `_entries`).
+
+        Args:
+            None
+        Returns:
+            iterator: The stored values.
+        """
+        return map(_VALUE, self._entries())
+
 
+    #walk every (key, value) pair in ascending key order
+    def ordered_items(self):
+        """
+        Yields every stored (key, value) pair in ascending key order.
+        The pairs are sorted by key up front, so the table can be changed while
+        the caller is still consuming them. Integer ids come first, then
+        tracking numbers (see `key_order`), so a mix of key types still sorts.
+
+        Args:
+            None
+        Returns:
+            generator: (key, value) tuples, smallest key first.
+        """
+        yield from sorted(self.items(), key=lambda item: key_order(item[0]))
+
+
+    #value stored under a key, never counted as a lookup - for a subclass's own bookkeeping
+    def _find_entry(self, key):
+        """
+        Retrieves a value like `lookup`, but is not counted by `track_stats`, so
+        the lookups a subclass makes to maintain its own indexes do not inflate
+        the hit, miss and comparison counts.
+
+        Args:
+            key (int, str or bytes): The key for the data entry.
+        Returns:
+            any: The value associated with the key, or None if the key does not exist.
+        """
+        if self._old_table is not None:
+            self._rehash_step()
+        bucket, i = self._find(key, key_hash(key))
+        return None if bucket is None else bucket[i][1]
+
+
+    #lookup that counts its hit or miss and the entries it compared (track_stats)
+    def _counted_lookup(self, key):
+        """
+        Same search as `_find`, counting as it goes. Every entry whose cached hash
+        is checked counts as one comparison.
+
+        Args:
+            key (int, str or bytes): The key for the data entry.
+        Returns:
+            any: The value associated with the key, or None if the key does not exist.
+        """
+        code = (key * FIBONACCI) & MASK64 if type(key) is int else key_hash(key)
+        bucket = self.table[code % self.capacity]
+        for i, entry in enumerate(bucket):
+            if entry[2] == code and entry[0] == key:
+                self.hits += 1
+                self.comparisons += i + 1
+                return entry[1]
+        compared = len(bucket)
+
+        if self._old_table is not None:
+            bucket = self._old_table[code % self._old_capacity]
+            for i, entry in enumerate(bucket):
+                if entry[2] == code and entry[0] == key:
+                    self.hits += 1
+                    self.comparisons += compared + i + 1
+                    return entry[1]
+            compared += len(bucket)
+
+        self.misses += 1
+        self.comparisons += compared
+        return None
+
+
+    #function to zero the lookup and resize counters
+    def reset_stats(self):
+        """
+        Zeroes the lookup counters and the resize count and time.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.hits = 0
+        self.misses = 0
+        self.comparisons = 0  #keys compared by counted lookups
+        self.resizes = 0
+        self.rehash_seconds = 0.0
+
+
+    #length of the longest chain, in the current table or a not-yet-migrated old bucket
+    @property
+    def longest_bucket(self):
+        longest = max(map(len, self.table), default=0)
+        if self._old_table is not None:
+            longest = max(longest, max(map(len, self._old_table), default=0))
+        return longest
+
+
+    #chain length -> number of buckets with that length
+    def bucket_histogram(self):
+        """
+        Counts the buckets of each chain length in the current table.
+        Mid-rehash, entries still in the old table are not included.
+
+        Args:
+            None
+        Returns:
+            dict: Chain length -> number of buckets, in ascending length order.
+        """
+        return dict(sorted(Counter(map(len, self.table)).items()))
+
+
+    #function to report the table's shape and the counters
+    def stats(self):
+        """
+        Reports how the table is performing, to tell a bad hash distribution on
+        real keys apart from other slowdowns. The bucket histogram and longest
+        chain are computed on each call (one pass over the buckets, in C); the
+        counters cost nothing to read.
+
+        Args:
+            None
+        Returns:
+            dict: size, capacity, load_factor, bucket_histogram, longest_bucket,
+                  resizes, rehash_seconds and pending_rehash_buckets; with
+                  `track_stats` also lookups, hits, misses and comparisons_per_lookup
+                  (these are None when lookups are not counted).
+        """
+        lookups = self.hits + self.misses
+        counted = self.track_stats or lookups > 0  #counters from an earlier tracked period still count
+        return {
+            "size": self.size,
+            "capacity": self.capacity,
+            "load_factor": self.size / self.capacity,
+            "bucket_histogram": self.bucket_histogram(),
+            "longest_bucket": self.longest_bucket,
+            "resizes": self.resizes,
+            "rehash_seconds": self.rehash_seconds,
+            "pending_rehash_buckets": self._old_capacity - self._migrated if self._old_table is not None else 0,
+            "lookups": lookups if counted else None,
+            "hits": self.hits if counted else None,
+            "misses": self.misses if counted else None,
+            "comparisons_per_lookup": self.comparisons / lookups if lookups else None,
+        }
+
+
+    #function to RESIZE table - resizes to a prime number of buckets for modulo
+    def _resize(self, new_capacity):
+        """
+        Dynamically resizes the hash table to maintain efficiency.
+        The new capacity is a prime (the next prime above twice the current
+        capacity when growing, above half of it when shrinking). Normally every
+        existing key-value pair is rehashed into the new table at once; in
+        incremental mode the old buckets are kept and migrated a few at a time
+        by later operations (see `_rehash_step`).
+
+        Args:
+            new_capacity (int): The number of buckets of the new table.
+        Returns:
+            None: The function modifies the hash table in place.
+        """
+        if self._old_table is not None:
+            self._finish_rehash()  #a previous incremental rehash must complete first
+
+        old_table = self.table
+        self._old_capacity = self.capacity
         self.capacity = new_capacity
-        self.table = new_table
-        self.longest_bucket = max(self.longest_bucket, len(new_table))
+        self.table = [_EMPTY_BUCKET] * new_capacity  #no per-bucket allocation, so resizing itself is O(1)-ish
+        self.resizes += 1
+
+        self._old_table = old_table
+        self._migrated = 0
+        if not self.incremental:
+            self._finish_rehash()
+
+
+    #move a few old buckets into the current table (incremental mode)
+    def _rehash_step(self, buckets=REHASH_STEP):
+        """
+        Migrates up to `buckets` buckets of the old table into the current table.
+        Releases the old table once every bucket has been moved.
+
+        Args:
+            buckets (int, optional): Number of old buckets to migrate. Defaults to REHASH_STEP.
+        Returns:
+            None: The function modifies the hash table in place.
+        """
+        start = time.perf_counter()
+        old_table, table, capacity = self._old_table, self.table, self.capacity
+        stop = min(self._migrated + buckets, self._old_capacity)
+        for old_index in range(self._migrated, stop):
+            for entry in old_table[old_index]:
+                new_index = entry[2] % capacity  #cached hash - keys are never rehashed
+                new_bucket = table[new_index]
+                if new_bucket is _EMPTY_BUCKET:
+                    new_bucket = table[new_index] = []
+                new_bucket.append(entry)
+            old_table[old_index] = _EMPTY_BUCKET
+        self._migrated = stop
+        self.rehash_seconds += time.perf_counter() - start
+
+        if stop == self._old_capacity:
+            self._old_table = None
+            self._old_capacity = 0
+            self._migrated = 0
+
+
+    #migrate every remaining old bucket
+    def _finish_rehash(self):
+        if self._old_table is not None:
+            self._rehash_step(self._old_capacity)
 
 
     #function needed for resize to determine next prime to use as new table size
-    def _next_prime(self, n):
+    @staticmethod
+    def _next_prime(n):
         """
         Finds the next prime number greater than or equal to `n`.
         This function is used to determine the next prime number when resizing
         the hash table to optimize hashing efficiency. It ensures that the new
-        table size is a prime number to reduce collisions.
+        table size is a prime number to reduce collisions. Candidates are tested
+        with a deterministic Miller-Rabin test (O(log n) per candidate) instead of
+        trial division, so finding a multi-million-bucket capacity is immediate.
 
         Args:
             n (int): The starting number to check for the next prime.
@@ -192,9 +607,7 @@ class HashTable:
         """
         def is_prime(num):
             """
-            Checks whether a given number is prime.
-            A prime number is only divisible by 1 and itself. This function
-            determines primality by checking divisibility up to the square root of the number.
+            Checks whether a given number is prime with a deterministic Miller-Rabin test.
 
             Args:
                 num (int): The number to check for primality.
@@ -203,13 +616,33 @@ class HashTable:
             """
             if num < 2:
                 return False
-            for i in range(2, int(num ** 0.5) + 1):
-                if num % i == 0:
-                    return False
+            for base in _PRIME_BASES:
+                if num % base == 0:
+                    return num == base
+
+            #write num - 1 as d * 2^r with d odd
+            d, r = num - 1, 0
+            while d % 2 == 0:
+                d //= 2
+                r += 1
+
+            for base in _PRIME_BASES:
+                x = pow(base, d, num)
+                if x == 1 or x == num - 1:
+                    continue
+                for _ in range(r - 1):
+                    x = x * x % num
+                    if x == num - 1:
+                        break
+                else:
+                    return False  #base proves num composite
             return True
 
+        if n <= 2:
+            return 2
+        n |= 1  #even numbers above 2 are never prime
         while not is_prime(n):
-            n += 1
+            n += 2
 
         return n
 
@@ -227,4 +660,4 @@ class HashTable:
             str: A multi-line string representing the hash table, where each line
                  corresponds to a bucket index and its contents.
         """
-        return "\n".join(f"{i}: {bucket}" for i, bucket in enumerate(self.table))
+        return "\n".join(f"{i}: {[entry[:2] for entry in bucket]}" for i, bucket in enumerate(self.table))
@@ -0,0 +1,57 @@
+#deterministic 64-bit hashing for hash table keys: integer package ids and string/bytes tracking numbers
+#the same key hashes to the same value in every process (unlike hash(), which is salted per process for str/bytes)
+#Sources for code: Python 3.9.21 documentation for hashlib.blake2b found at https://docs.python.org/3.9/library/hashlib.html
+#and Knuth's multiplicative (Fibonacci) hashing as described at https://en.wikipedia.org/wiki/Hash_function#Fibonacci_hashing
+
+from hashlib import blake2b
+
+FIBONACCI = 0x9E3779B97F4A7C15  #2^64 / golden ratio
+MASK64 = (1 << 64) - 1
+
+
+#64-bit hash of an integer, string or bytes key
+def key_hash(key):
+    """
+    Computes a deterministic, well-distributed 64-bit hash for a hash table key.
+    Integers are multiplied by 2^64 divided by the golden ratio (one multiply,
+    and sequential ids land far apart). Strings are UTF-8 encoded and bytes
+    are hashed as-is with an 8-byte BLAKE2b digest. BLAKE2b runs in C, so a
+    tracking number costs about as much as a short dict lookup; a per-byte
+    FNV-1a loop in Python would be slower for anything but the shortest keys.
+
+    Integers outside the 64-bit range are folded to their low 64 bits. Such keys
+    still compare exactly; they only share a hash.
+
+    Args:
+        key (int, str or bytes): The key to hash.
+    Returns:
+        int: The hash, 0 to 2^64 - 1.
+    Raises:
+        TypeError: If the key is not an int, str or bytes.
+    """
+    if isinstance(key, int):
+        return (key * FIBONACCI) & MASK64
+    if isinstance(key, str):
+        key = key.encode("utf-8")
+    elif not isinstance(key, bytes):
+        raise TypeError(f"Hash table keys must be int, str or bytes, not {type(key).__name__}.")
+    return int.from_bytes(blake2b(key, digest_size=8).digest(), "little")
+
+
+#sort key that orders any mix of int, str and bytes keys
+def key_order(key):
+    """
+    Returns a sort key for a hash table key that never compares keys of
+    different types: integer package ids come first in numeric order, then
+    string tracking numbers, then bytes keys. Use it wherever keys are sorted
+    or kept in a sorted index, so a store holding both kinds of id still sorts.
+
+    Args:
+        key (int, str or bytes): The key.
+    Returns:
+        tuple: (type rank, key).
+    """
+    return (0 if isinstance(key, int) else 1 if isinstance(key, str) else 2, key)
+
+
+AFTER_EVERY_KEY = (3,)  #sorts after key_order(key) for every key - an upper bound for bisect
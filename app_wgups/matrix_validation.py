@@ -0,0 +1,383 @@
+#bulk validation of distance matrix data with a machine-readable anomaly report
+#checks: unparsable cells, missing pairs, asymmetric pairs, non-zero diagonal, negative distances
+#and triangle-inequality violations; runs on NumPy arrays when NumPy is installed, plain arrays otherwise
+#Sources for code: Python 3.9.21 documentation for array and json found at
+#https://docs.python.org/3.9/library/array.html and https://docs.python.org/3.9/library/json.html
+#and the NumPy documentation for broadcasting and ufuncs found at https://numpy.org/doc/stable/
+
+import argparse
+import csv
+import heapq
+import json
+import sys
+from array import array
+
+try:
+    import numpy
+except ImportError:  #optional - validation falls back to the pure-array checks
+    numpy = None
+
+DEFAULT_TOLERANCE = 1e-9
+MAX_EXAMPLES = 20
+_ROW_BLOCK = 64  #rows processed together by the NumPy triangle check (keeps the work set in cache)
+
+#the exact triangle check is O(n^3); above EXACT_TRIANGLE_LIMIT addresses only detours through each
+#stop's TRIANGLE_NEIGHBORS nearest stops are tried (O(n^2 k)), and without NumPy the check is skipped
+#above ARRAY_TRIANGLE_LIMIT addresses
+EXACT_TRIANGLE_LIMIT = 1000
+TRIANGLE_NEIGHBORS = 16
+ARRAY_TRIANGLE_LIMIT = 200
+
+
+#read a distance matrix CSV into a dense n x n array, keeping both triangles
+def read_dense_matrix(csv_path):
+    """
+    Reads a distance matrix CSV into a dense row-major array of n * n distances.
+    Unlike `load_distance_data`, both triangles are kept (so symmetry can be
+    checked) and unparsable cells are recorded instead of raised.
+
+    Args:
+        csv_path (str): The file path to the CSV containing the distance matrix.
+    Returns:
+        tuple: (addresses, dense, invalid_cells) where `dense` is an array of
+               n * n floats with NaN for blank or invalid cells, and `invalid_cells`
+               lists a dict (line, row, column, value) for every unparsable cell.
+    """
+    addresses = []
+    invalid_cells = []
+
+    with open(csv_path, mode="r") as csvfile:
+        reader = csv.reader(csvfile)
+
+        raw_headers = next(reader)[1: ]  #same header handling as load_distance_data
+        headers = list(filter(None, [header.strip() for header in raw_headers]))
+        size = len(headers)
+        dense = array("d", [float("nan")]) * (size * size)
+
+        for row in reader:
+            if not row or len(row) < 2:   #handle broken data
+                continue
+            if len(addresses) == size:
+                break
+
+            i = len(addresses)
+            addresses.append(row[0].strip())
+            for j, value in enumerate(row[1:size + 1]):
+                if not value.strip():
+                    continue
+                try:
+                    dense[i * size + j] = float(value)
+                except ValueError:
+                    invalid_cells.append({"line": reader.line_num, "row": addresses[i],
+                                          "column": headers[j], "value": value})
+
+    #fewer rows than headers: keep the square block the rows cover
+    count = len(addresses)
+    if count < size:
+        dense = array("d", (dense[i * size + j] for i in range(count) for j in range(count)))
+    return addresses, dense, invalid_cells
+
+
+#expand a loaded DistanceMatrix (packed lower triangle) into a dense array
+def dense_from_matrix(matrix):
+    """
+    Expands a loaded DistanceMatrix into a dense row-major n * n array.
+
+    Args:
+        matrix (DistanceMatrix): The matrix to expand.
+    Returns:
+        array: n * n floats, NaN where the matrix has no distance.
+    """
+    size = matrix.size
+    dense = array("d", [float("nan")]) * (size * size)
+    distance_by_id = matrix.distance_by_id
+    for i in range(size):
+        for j in range(i + 1):
+            distance = distance_by_id(i, j)
+            if distance is not None:
+                dense[i * size + j] = dense[j * size + i] = distance
+    return dense
+
+
+#one section of the report: a total plus the first few offending entries
+def _finding(count, examples):
+    return {"count": count, "examples": examples[:MAX_EXAMPLES]}
+
+
+#all checks except the triangle inequality, with NumPy
+def _basic_checks_numpy(addresses, matrix, tolerance):
+    size = len(addresses)
+    missing = numpy.isnan(matrix)
+    upper = numpy.triu(numpy.ones((size, size), dtype=bool), 1)
+
+    pairs_missing = numpy.argwhere(upper & missing & missing.T)
+    both = upper & ~missing & ~missing.T
+    pairs_asymmetric = numpy.argwhere(both & (numpy.abs(matrix - matrix.T) > tolerance))
+    diagonal = numpy.diagonal(matrix)
+    bad_diagonal = numpy.flatnonzero(numpy.isnan(diagonal) | (numpy.abs(diagonal) > tolerance))
+    with numpy.errstate(invalid="ignore"):
+        cells_negative = numpy.argwhere(matrix < 0)
+
+    return {
+        "missing": _finding(len(pairs_missing), [
+            {"from": addresses[i], "to": addresses[j]} for i, j in pairs_missing[:MAX_EXAMPLES].tolist()]),
+        "asymmetric": _finding(len(pairs_asymmetric), [
+            {"from": addresses[i], "to": addresses[j], "forward": float(matrix[i, j]), "backward": float(matrix[j, i])}
+            for i, j in pairs_asymmetric[:MAX_EXAMPLES].tolist()]),
+        "nonzero_diagonal": _finding(len(bad_diagonal), [
+            {"address": addresses[i], "distance": None if diagonal[i] != diagonal[i] else float(diagonal[i])}
+            for i in bad_diagonal[:MAX_EXAMPLES].tolist()]),
+        "negative": _finding(len(cells_negative), [
+            {"from": addresses[i], "to": addresses[j], "distance": float(matrix[i, j])}
+            for i, j in cells_negative[:MAX_EXAMPLES].tolist()]),
+    }
+
+
+#all checks except the triangle inequality, with plain arrays
+def _basic_checks_array(addresses, dense, tolerance):
+    size = len(addresses)
+    missing, asymmetric, bad_diagonal, negative = [], [], [], []
+    counts = {"missing": 0, "asymmetric": 0, "nonzero_diagonal": 0, "negative": 0}
+
+    for i in range(size):
+        row = dense[i * size:(i + 1) * size]
+        diagonal = row[i]
+        if diagonal != diagonal or abs(diagonal) > tolerance:
+            counts["nonzero_diagonal"] += 1
+            bad_diagonal.append({"address": addresses[i], "distance": None if diagonal != diagonal else diagonal})
+        for j, distance in enumerate(row):
+            if distance < 0:
+                counts["negative"] += 1
+                if len(negative) < MAX_EXAMPLES:
+                    negative.append({"from": addresses[i], "to": addresses[j], "distance": distance})
+            if j <= i:
+                continue
+            mirrored = dense[j * size + i]
+            if distance != distance and mirrored != mirrored:
+                counts["missing"] += 1
+                if len(missing) < MAX_EXAMPLES:
+                    missing.append({"from": addresses[i], "to": addresses[j]})
+            elif distance == distance and mirrored == mirrored and abs(distance - mirrored) > tolerance:
+                counts["asymmetric"] += 1
+                if len(asymmetric) < MAX_EXAMPLES:
+                    asymmetric.append({"from": addresses[i], "to": addresses[j],
+                                       "forward": distance, "backward": mirrored})
+
+    return {
+        "missing": _finding(counts["missing"], missing),
+        "asymmetric": _finding(counts["asymmetric"], asymmetric),
+        "nonzero_diagonal": _finding(counts["nonzero_diagonal"], bad_diagonal),
+        "negative": _finding(counts["negative"], negative),
+    }
+
+
+#shortest one-stop detour for every pair (min over k of d[i][k] + d[k][j]), with NumPy
+def _detours_numpy(symmetric, neighbors=None):
+    """
+    Computes the min-plus square of the matrix in row blocks.
+    Each step adds one column of the block to one row of the matrix and keeps the
+    running minimum, so the O(n^3) work runs inside NumPy on cache-sized arrays.
+    With `neighbors`, row i only tries the stops nearest to i, which is O(n^2 k).
+
+    Args:
+        symmetric (numpy.ndarray): n x n distances, inf where missing, 0 on the diagonal.
+        neighbors (int, optional): Try only this many nearest stops per row. Defaults to every stop.
+    Returns:
+        numpy.ndarray: n x n shortest distances using at most one intermediate stop
+                       (from the tried stops, so an upper bound when `neighbors` is set).
+    """
+    size = symmetric.shape[0]
+    detours = numpy.empty_like(symmetric)
+    for start in range(0, size, _ROW_BLOCK):
+        block = symmetric[start:start + _ROW_BLOCK]
+        best = detours[start:start + _ROW_BLOCK]
+        best[...] = block
+        scratch = numpy.empty_like(block)
+        if neighbors is None:
+            for k in range(size):
+                numpy.add(block[:, k, None], symmetric[k], out=scratch)
+                numpy.minimum(best, scratch, out=best)
+            continue
+        rows = numpy.arange(len(block))
+        count = min(neighbors + 1, size)  #+1: each row's own stop (distance 0) is among its nearest
+        nearest = numpy.argpartition(block, count - 1, axis=1)[:, :count]
+        for column in range(count):
+            via = nearest[:, column]
+            numpy.add(block[rows, via][:, None], symmetric[via], out=scratch)
+            numpy.minimum(best, scratch, out=best)
+    return detours
+
+
+#shortest one-stop detour for every pair, with plain arrays
+def _detours_array(symmetric, size, neighbors=None):
+    detours = array("d", symmetric)
+    for i in range(size):
+        row_i = symmetric[i * size:(i + 1) * size]
+        best = list(row_i)
+        stops = range(size) if neighbors is None else heapq.nsmallest(neighbors + 1, range(size), key=row_i.__getitem__)
+        for k in stops:
+            d_ik = row_i[k]
+            if d_ik == float("inf") or k == i:
+                continue
+            row_k = symmetric[k * size:(k + 1) * size]
+            best = list(map(min, best, [d_ik + d_kj for d_kj in row_k]))
+        detours[i * size:(i + 1) * size] = array("d", best)
+    return detours
+
+
+#describe one triangle-inequality violation, naming the stop that makes the shortest detour
+def _violation(addresses, symmetric_row, symmetric_column, i, j, direct):
+    via = min(range(len(addresses)), key=lambda k: symmetric_row[k] + symmetric_column[k])
+    return {"from": addresses[i], "to": addresses[j], "direct": direct,
+            "via": addresses[via], "via_distance": float(symmetric_row[via] + symmetric_column[via])}
+
+
+#triangle-inequality check: pairs whose direct distance is longer than a detour through a third stop
+def _triangle_check(addresses, dense, tolerance, use_numpy, neighbors):
+    size = len(addresses)
+    infinity = float("inf")
+    if neighbors is None and size > EXACT_TRIANGLE_LIMIT:
+        neighbors = TRIANGLE_NEIGHBORS
+    if neighbors is not None and neighbors >= size - 1:
+        neighbors = None  #every stop is a neighbor - the exact check costs the same
+    if not use_numpy and size > ARRAY_TRIANGLE_LIMIT:
+        return dict(_finding(0, []), skipped=f"more than {ARRAY_TRIANGLE_LIMIT} addresses without NumPy")
+
+    #loader's view: lower cell first, mirrored upper cell if the lower one is blank, inf if both are
+    examples = []
+    if use_numpy:
+        dense_matrix = numpy.frombuffer(dense, dtype=numpy.float64).reshape(size, size)
+        lower = numpy.tril(numpy.ones((size, size), dtype=bool), -1)
+        matrix = numpy.where(lower & ~numpy.isnan(dense_matrix), dense_matrix, dense_matrix.T)
+        matrix = numpy.where(lower, matrix, matrix.T)
+        matrix[numpy.isnan(matrix)] = infinity
+        numpy.fill_diagonal(matrix, 0.0)
+
+        detours = _detours_numpy(matrix, neighbors)
+        detours = numpy.minimum(detours, detours.T)  #a detour from either end counts
+        violating = numpy.triu(numpy.isfinite(matrix) & (matrix - detours > tolerance), 1)
+        pairs = numpy.argwhere(violating)
+        count = len(pairs)
+        for i, j in pairs[:MAX_EXAMPLES].tolist():
+            examples.append(_violation(addresses, matrix[i], matrix[:, j], i, j, float(matrix[i, j])))
+        return dict(_finding(count, examples), via_neighbors=neighbors)
+
+    symmetric = array("d", [infinity]) * (size * size)
+    for i in range(size):
+        symmetric[i * size + i] = 0.0
+        for j in range(i):
+            distance = dense[i * size + j]
+            if distance != distance:
+                distance = dense[j * size + i]
+            if distance == distance:
+                symmetric[i * size + j] = symmetric[j * size + i] = distance
+
+    detours = _detours_array(symmetric, size, neighbors)
+    count = 0
+    for i in range(size):
+        for j in range(i + 1, size):
+            direct = symmetric[i * size + j]
+            detour = min(detours[i * size + j], detours[j * size + i])  #a detour from either end counts
+            if direct != infinity and direct - detour > tolerance:
+                count += 1
+                if len(examples) < MAX_EXAMPLES:
+                    examples.append(_violation(addresses, symmetric[i * size:(i + 1) * size],
+                                               symmetric[j::size], i, j, direct))
+    return dict(_finding(count, examples), via_neighbors=neighbors)
+
+
+#validate a distance matrix and build the anomaly report
+def validate_distance_matrix(source, tolerance=DEFAULT_TOLERANCE, use_numpy=None, check_triangle=True,
+                             triangle_neighbors=None):
+    """
+    Runs every data check over a distance matrix in bulk and returns a report.
+    The checks work on one dense n x n array instead of per-pair lookups; with
+    NumPy installed they run as array operations, otherwise a pure-array fallback
+    gives the same report more slowly. The triangle-inequality check is the
+    min-plus square of the matrix (O(n^3)), computed in row blocks; it uses the
+    loader's view of the data (lower cells authoritative, upper cells fill gaps).
+    Above EXACT_TRIANGLE_LIMIT addresses it only tries detours through each
+    stop's TRIANGLE_NEIGHBORS nearest stops (O(n^2 k), seconds at 5k addresses
+    with NumPy), so it can miss a violation whose detour uses a farther stop.
+    Without NumPy it is skipped above ARRAY_TRIANGLE_LIMIT addresses; the report
+    marks a skipped check with a "skipped" reason and a limited one with "via_neighbors".
+
+    Args:
+        source (str or DistanceMatrix): A distance matrix CSV path or a loaded DistanceMatrix.
+        tolerance (float, optional): Differences up to this size are ignored. Defaults to 1e-9.
+        use_numpy (bool, optional): Force (True) or disable (False) NumPy. Defaults to
+                                    using NumPy when it is installed.
+        check_triangle (bool, optional): Run the triangle-inequality check. Defaults to True.
+        triangle_neighbors (int, optional): Try detours only through each stop's nearest
+                                            `triangle_neighbors` stops. Defaults to every stop up
+                                            to EXACT_TRIANGLE_LIMIT addresses, TRIANGLE_NEIGHBORS above.
+    Returns:
+        dict: JSON-ready report with "source", "addresses", "engine", "valid" and one
+              "checks" entry per check, each holding a "count" and the first few "examples".
+    Raises:
+        ImportError: If use_numpy is True and NumPy is not installed.
+    """
+    if use_numpy and numpy is None:
+        raise ImportError("NumPy is not installed; validate with use_numpy=False.")
+    use_numpy = numpy is not None if use_numpy is None else use_numpy
+
+    if isinstance(source, str):
+        addresses, dense, invalid_cells = read_dense_matrix(source)
+        source_name = source
+    else:
+        addresses, dense, invalid_cells = list(source.addresses), dense_from_matrix(source), []
+        source_name = type(source).__name__
+    size = len(addresses)
+
+    report = {"source": source_name, "addresses": size, "engine": "numpy" if use_numpy else "array",
+              "tolerance": tolerance, "checks": {"invalid_cells": _finding(len(invalid_cells), invalid_cells)}}
+
+    if use_numpy:
+        matrix = numpy.frombuffer(dense, dtype=numpy.float64).reshape(size, size)
+        report["checks"].update(_basic_checks_numpy(addresses, matrix, tolerance))
+    else:
+        report["checks"].update(_basic_checks_array(addresses, dense, tolerance))
+
+    if check_triangle:
+        report["checks"]["triangle_inequality"] = _triangle_check(addresses, dense, tolerance, use_numpy,
+                                                                  triangle_neighbors)
+
+    report["valid"] = all(check["count"] == 0 for check in report["checks"].values())
+    return report
+
+
+#command line entry point: python -m app_wgups.matrix_validation data/distance_matrix.csv
+def main(argv=None):
+    """
+    Validates a distance matrix CSV from the command line and prints the JSON report.
+    Exits with status 1 when any check finds an anomaly.
+
+    Args:
+        argv (list of str, optional): Command line arguments. Defaults to sys.argv.
+    Returns:
+        None
+    """
+    parser = argparse.ArgumentParser(description="Validate a distance matrix CSV and report anomalies as JSON.")
+    parser.add_argument("csv_path", help="distance matrix CSV to validate")
+    parser.add_argument("--output", help="write the report to this file instead of stdout")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="ignore differences up to this size")
+    parser.add_argument("--no-numpy", action="store_true", help="use the pure-array checks even if NumPy is installed")
+    parser.add_argument("--skip-triangle", action="store_true", help="skip the O(n^3) triangle-inequality check")
+    parser.add_argument("--triangle-neighbors", type=int,
+                        help=f"try detours only through each stop's N nearest stops "
+                             f"(default: all stops up to {EXACT_TRIANGLE_LIMIT} addresses, {TRIANGLE_NEIGHBORS} above)")
+    args = parser.parse_args(argv)
+
+    report = validate_distance_matrix(args.csv_path, args.tolerance, use_numpy=False if args.no_numpy else None,
+                                      check_triangle=not args.skip_triangle, triangle_neighbors=args.triangle_neighbors)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    sys.exit(0 if report["valid"] else 1)
+
+
+if __name__ == "__main__":
+    main()
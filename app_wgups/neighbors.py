@@ -0,0 +1,181 @@
+#precomputed k-nearest-neighbour candidate lists for every address in a distance matrix
+#lets the Nearest Neighbor algorithm find the closest unvisited stop without scanning every stop
+#Sources for code: Python 3.9.21 documentation for heapq and array found at
+#https://docs.python.org/3.9/library/heapq.html and https://docs.python.org/3.9/library/array.html
+
+import heapq
+from array import array
+
+DEFAULT_NEIGHBORS = 16
+NO_NEIGHBOR = -1
+
+
+class NeighborLists:
+    def __init__(self, distance_matrix, k=DEFAULT_NEIGHBORS):
+        """
+        Builds a sorted list of the k nearest addresses for every address in the matrix.
+        Each row is reduced with a partial sort (heapq.nsmallest), so building costs
+        O(n^2 log k) instead of a full O(n^2 log n) sort. Lists are stored as one flat
+        array of address ids, k entries per address, padded with -1 when an address
+        has fewer than k reachable neighbours. An address is its own nearest
+        neighbour (distance 0), so packages sharing an address stay together.
+
+        Args:
+            distance_matrix (DistanceMatrix): The matrix to index.
+            k (int, optional): Candidates kept per address. Defaults to 16.
+        Attributes:
+            k (int): Candidates kept per address.
+            size (int): The number of addresses indexed.
+            neighbor_ids (array): Flat array of neighbour ids, row i at [i * k, (i + 1) * k).
+            neighbor_distances (array): Distances matching `neighbor_ids`.
+        Returns:
+            None
+        """
+        self.distance_matrix = distance_matrix
+        self.size = distance_matrix.size
+        self.k = min(k, self.size)
+        self.neighbor_ids = array("i", [NO_NEIGHBOR]) * (self.size * self.k)
+        self.neighbor_distances = array("d", [float("inf")]) * (self.size * self.k)
+
+        for from_id in range(self.size):
+            self.build_row(from_id)
+
+
+    #(re)compute the candidate list of one address
+    def build_row(self, from_id):
+        """
+        Computes the k nearest neighbours of one address with a partial sort.
+
+        Args:
+            from_id (int): The address id whose list is built.
+        Returns:
+            None: Updates `neighbor_ids` and `neighbor_distances` in place.
+        """
+        distance_by_id = self.distance_matrix.distance_by_id
+        reachable = []
+        for to_id in range(self.size):
+            distance = distance_by_id(from_id, to_id)
+            if distance is not None:
+                reachable.append((distance, to_id))
+
+        nearest = heapq.nsmallest(self.k, reachable)
+        start = from_id * self.k
+        for offset in range(self.k):
+            if offset < len(nearest):
+                distance, to_id = nearest[offset]
+            else:
+                distance, to_id = float("inf"), NO_NEIGHBOR
+            self.neighbor_ids[start + offset] = to_id
+            self.neighbor_distances[start + offset] = distance
+
+
+    #matrix change notification: rebuild only the candidate lists the change can affect
+    def on_matrix_change(self, distance_matrix, event, address_ids):
+        """
+        Keeps the candidate lists current after an in-place matrix change.
+        An updated distance only affects the lists of its two endpoints; a new
+        address gets its own list and enters any list it is now closer than the
+        last candidate of; a removed address is dropped from the lists holding it.
+
+        Args:
+            distance_matrix (DistanceMatrix): The matrix that changed.
+            event (str): "add", "update" or "remove".
+            address_ids (list of int): The ids whose distances changed.
+        Returns:
+            None
+        """
+        if distance_matrix.size > self.size:  #room for new rows
+            added = distance_matrix.size - self.size
+            self.neighbor_ids.extend(array("i", [NO_NEIGHBOR]) * (added * self.k))
+            self.neighbor_distances.extend(array("d", [float("inf")]) * (added * self.k))
+            self.size = distance_matrix.size
+
+        if event == "update":
+            stale = set(address_ids)
+        elif event == "add":
+            stale = set(address_ids)
+            for from_id in range(self.size):
+                last = (from_id + 1) * self.k - 1
+                for new_id in address_ids:
+                    distance = distance_matrix.distance_by_id(from_id, new_id)
+                    if distance is not None and (self.neighbor_ids[last] == NO_NEIGHBOR
+                                                 or distance < self.neighbor_distances[last]):
+                        stale.add(from_id)
+        else:
+            removed = set(address_ids)
+            stale = set(address_ids)
+            stale.update(offset // self.k for offset, to_id in enumerate(self.neighbor_ids) if to_id in removed)
+
+        for from_id in stale:
+            self.build_row(from_id)
+
+
+    #sorted candidate ids for one address
+    def candidates(self, from_id):
+        """
+        Returns the candidate list of an address, nearest first.
+
+        Args:
+            from_id (int): The address id.
+        Returns:
+            array: Up to k neighbour ids, padded with -1.
+        """
+        return self.neighbor_ids[from_id * self.k:(from_id + 1) * self.k]
+
+
+    #walk the candidate list for the nearest stops not yet visited
+    def nearest_unvisited_stops(self, from_id, unvisited):
+        """
+        Finds every unvisited address tied at the nearest distance by walking the
+        precomputed candidate list. A full scan of `unvisited` happens only when the
+        list is exhausted before a farther candidate proves the nearest set complete.
+
+        Args:
+            from_id (int): The address id the search starts from.
+            unvisited (set or dict): Address ids still to be visited.
+        Returns:
+            tuple: (list of address ids, distance) of the nearest unvisited addresses,
+                   or ([], None) if no unvisited address is reachable.
+        """
+        nearest, nearest_distance = [], None
+
+        start = from_id * self.k
+        for offset in range(start, start + self.k):
+            to_id = self.neighbor_ids[offset]
+            if to_id == NO_NEIGHBOR:  #fewer than k reachable addresses - the list is complete
+                return nearest, nearest_distance
+            distance = self.neighbor_distances[offset]
+            if nearest and distance > nearest_distance:
+                return nearest, nearest_distance
+            if to_id in unvisited:
+                nearest.append(to_id)
+                nearest_distance = distance
+
+        #candidate list exhausted - scan the remaining stops directly
+        for to_id in unvisited:
+            distance = self.distance_matrix.distance_by_id(from_id, to_id)
+            if distance is None:
+                continue
+            if nearest_distance is None or distance < nearest_distance:
+                nearest, nearest_distance = [to_id], distance
+            elif distance == nearest_distance and to_id not in nearest:
+                nearest.append(to_id)
+        return nearest, nearest_distance
+
+
+    #the single nearest unvisited stop
+    def nearest_unvisited(self, from_id, unvisited):
+        """
+        Finds the nearest unvisited address; ties are broken by the lower address id.
+
+        Args:
+            from_id (int): The address id the search starts from.
+            unvisited (set or dict): Address ids still to be visited.
+        Returns:
+            tuple: (address id, distance) of the nearest unvisited address,
+                   or (None, None) if no unvisited address is reachable.
+        """
+        nearest, distance = self.nearest_unvisited_stops(from_id, unvisited)
+        if not nearest:
+            return None, None
+        return min(nearest), distance
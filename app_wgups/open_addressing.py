@@ -0,0 +1,524 @@
+# open-addressing alternative to HashTable: linear probing over flat parallel arrays
+# same insert/lookup/update/delete API as app_wgups.hash_table.HashTable, with tombstones for deletes
+# sources for code:  Zybooks section 6, Hash Tables (all sub-sections) at https://learn.zybooks.com/zybook/WGUC950Template2023/chapter/6/section/1
+# also Python 3.9.21 documentation for array found at https://docs.python.org/3.9/library/array.html
+# and Knuth's multiplicative (Fibonacci) hashing as described at https://en.wikipedia.org/wiki/Hash_function#Fibonacci_hashing
+# and Python 3.9.21 documentation for collections.Counter and time.perf_counter found at
+# https://docs.python.org/3.9/library/collections.html and https://docs.python.org/3.9/library/time.html
+
+import time
+from array import array
+from collections import Counter
+
+from app_wgups.key_hash import key_hash, key_order
+
+_EMPTY = 0
+_OCCUPIED = 1
+_DELETED = 2  #tombstone: keeps probe sequences intact after a delete
+
+MAX_LOAD_FACTOR = 0.7  #occupied + tombstone slots, as a fraction of capacity
+
+
+class OpenAddressHashTable:
+    def __init__(self, capacity=32, track_stats=False):
+        """
+        Initializes an open-addressing hash table.
+        Instead of a list of bucket lists holding (key, value) tuples, every entry
+        lives directly in parallel arrays: a 64-bit hash array, a one-byte slot state
+        array and lists of key and value references. Keys are int, str or bytes,
+        hashed with `key_hash`; a probe compares the stored hash before the key, and
+        a rehash reuses the stored hashes instead of hashing every key again. A collision moves on to the
+        next slot (linear probing), so a lookup reads consecutive memory instead of
+        following bucket pointers. Deleted slots become tombstones until the next
+        rehash, so later keys in the same probe run stay reachable.
+
+        Resizes and rehash time are always counted; `track_stats` also counts the
+        hits, misses and slots probed by each lookup (see `stats`).
+
+        Args:
+            capacity (int, optional): The initial number of slots, rounded up to a
+                                      power of two. Defaults to 32.
+            track_stats (bool, optional): Count lookup hits, misses and probes. Defaults to False.
+        Attributes:
+            capacity (int): The number of slots in the table.
+            size (int): The current number of key-value pairs stored in the table.
+            tombstones (int): Slots freed by `delete` that still hold a tombstone.
+            slot_keys (list): Key of each slot (None for free slots).
+            slot_hashes (array): Unsigned 64-bit `key_hash` of each slot's key.
+            states (bytearray): Slot states - empty, occupied or tombstone.
+            slot_values (list): Value of each slot (None for free slots).
+            track_stats (bool): Whether lookups are counted.
+            resizes (int): Rehashes since the table was created or `reset_stats` was called.
+            rehash_seconds (float): Time spent in those rehashes.
+        Returns:
+            None
+        """
+        self.size = 0
+        self.tombstones = 0
+        self._initial_capacity = max(8, capacity)
+        self._allocate(self._initial_capacity)
+        self.track_stats = track_stats
+        self.reset_stats()
+
+
+    #set up empty slot arrays; capacity is rounded up to a power of two so probing can mask instead of modulo
+    def _allocate(self, capacity):
+        bits = max(3, (capacity - 1).bit_length())
+        self.capacity = 1 << bits
+        self._mask = self.capacity - 1
+        self._shift = 64 - bits
+        self.slot_keys = [None] * self.capacity
+        self.slot_hashes = array("Q", [0]) * self.capacity
+        self.states = bytearray(self.capacity)
+        self.slot_values = [None] * self.capacity
+
+
+    #function to hash keys
+    def hash(self, key):
+        """
+        Computes the home slot for a given key from the top bits of `key_hash`
+        (Fibonacci hashing for integers), so runs of sequential package ids land far apart.
+
+        Args:
+            key (int, str or bytes): The key to be hashed.
+        Returns:
+            int: The computed slot index (0 to capacity - 1).
+        Raises:
+            TypeError: If the key is not an int, str or bytes.
+        """
+        return key_hash(key) >> self._shift
+
+
+    #probe for the slot holding a key
+    def _find(self, key):
+        """
+        Follows the probe sequence of a key until the key or an empty slot is found.
+
+        Args:
+            key (int, str or bytes): The key to find.
+        Returns:
+            int: The slot index holding the key, or -1 if the key is not in the table.
+        """
+        states, hashes, keys, mask = self.states, self.slot_hashes, self.slot_keys, self._mask
+        code = key_hash(key)
+        index = code >> self._shift
+        while True:
+            state = states[index]
+            if state == _EMPTY:
+                return -1
+            if state == _OCCUPIED and hashes[index] == code and keys[index] == key:
+                return index
+            index = (index + 1) & mask
+
+
+    #function to insert new data into hash table
+    def insert(self, key, value):
+        """
+        Inserts a new key-value pair into the hash table.
+        If the key already exists, its value is updated. A new key reuses the first
+        tombstone on its probe sequence when there is one. The table is rehashed
+        before occupied and tombstone slots would exceed the maximum load factor.
+
+        Args:
+            key (int, str or bytes): The key for the data entry.
+            value (any): The value associated with the key. Can be any data type.
+        Returns:
+            None: The function does not return anything. It modifies the hash table in place.
+        Raises:
+            TypeError: If the key is not an int, str or bytes.
+        """
+        code = key_hash(key)  #before any change, so a bad key leaves the table as it was
+        if self.size + self.tombstones + 1 > self.capacity * MAX_LOAD_FACTOR:
+            self._resize()
+
+        states, hashes, keys, mask = self.states, self.slot_hashes, self.slot_keys, self._mask
+        index = code >> self._shift
+        free_slot = -1
+        while True:
+            state = states[index]
+            if state == _EMPTY:
+                break
+            if state == _OCCUPIED:
+                if hashes[index] == code and keys[index] == key:
+                    self.slot_values[index] = value  #update if key already exists
+                    return
+            elif free_slot < 0:
+                free_slot = index  #first tombstone - reuse it unless the key turns up later
+            index = (index + 1) & mask
+
+        if free_slot >= 0:
+            index = free_slot
+            self.tombstones -= 1
+        keys[index] = key
+        hashes[index] = code
+        states[index] = _OCCUPIED
+        self.slot_values[index] = value
+        self.size += 1
+
+
+    #function to load many key-value pairs at once into a table sized for all of them
+    def bulk_load(self, items, expected_size=None, unique_keys=False):
+        """
+        Inserts many key-value pairs with at most one rehash.
+        The slot arrays are sized once for the existing entries plus the new ones
+        (from `expected_size`, else len(items), else by reading `items` into a list).
+        With `unique_keys` the caller guarantees the keys are new and distinct, so
+        each pair goes into the first free slot without looking for an existing key.
+
+        Args:
+            items (iterable): (key, value) pairs. Keys must be int, str or bytes.
+            expected_size (int, optional): Number of pairs to expect. Defaults to None.
+            unique_keys (bool, optional): Keys are distinct and not yet stored. Defaults to False.
+        Returns:
+            int: The number of pairs read from `items`.
+        """
+        if expected_size is None:
+            if not hasattr(items, "__len__"):
+                items = list(items)  #count the rows once so the table is sized only once
+            expected_size = len(items)
+
+        needed = int((self.size + expected_size) / MAX_LOAD_FACTOR) + 1
+        if needed > self.capacity or self.tombstones:
+            self._resize(max(needed, self.capacity))  #one rehash straight to the final size
+
+        if not unique_keys:
+            count = 0
+            for key, value in items:
+                self.insert(key, value)
+                count += 1
+            return count
+
+        states, hashes, keys, values = self.states, self.slot_hashes, self.slot_keys, self.slot_values
+        mask, shift = self._mask, self._shift
+        count = 0
+        for key, value in items:
+            code = key_hash(key)
+            if self.size + 1 > self.capacity * MAX_LOAD_FACTOR:  #the hint was too small
+                self._resize()
+                states, hashes, keys, values = self.states, self.slot_hashes, self.slot_keys, self.slot_values
+                mask, shift = self._mask, self._shift
+            index = code >> shift
+            while states[index]:
+                index = (index + 1) & mask
+            keys[index] = key
+            hashes[index] = code
+            states[index] = _OCCUPIED
+            values[index] = value
+            self.size += 1
+            count += 1
+        return count
+
+
+    # function to look up data or retrieve from hash table via package ID key
+    def lookup(self, key):
+        """
+        Retrieves a value from the hash table using the given key.
+
+        Args:
+            key (int, str or bytes): The key for the data entry.
+        Returns:
+            any: The value associated with the key if found,
+            or None if the key does not exist in the hash table.
+        """
+        if self.track_stats:
+            return self._counted_lookup(key)
+        index = self._find(key)
+        return None if index < 0 else self.slot_values[index]
+
+
+    #lookup that counts its hit or miss and the slots it probed (track_stats)
+    def _counted_lookup(self, key):
+        states, hashes, keys, mask = self.states, self.slot_hashes, self.slot_keys, self._mask
+        code = key_hash(key)
+        index = code >> self._shift
+        probed = 1
+        while True:
+            state = states[index]
+            if state == _EMPTY:
+                self.misses += 1
+                self.probes += probed
+                return None
+            if state == _OCCUPIED and hashes[index] == code and keys[index] == key:
+                self.hits += 1
+                self.probes += probed
+                return self.slot_values[index]
+            index = (index + 1) & mask
+            probed += 1
+
+
+    # function to update an object stored in the hash table
+    def update(self, key, new_value):
+        """
+        Updates the value associated with a given key in the hash table.
+
+        Args:
+            key (int, str or bytes): The key identifying the entry to update.
+            new_value (any): The new value to associate with the key.
+        Returns:
+            bool: True if the update was successful, False if the key was not found.
+        """
+        index = self._find(key)
+        if index < 0:
+            return False
+        self.slot_values[index] = new_value
+        return True
+
+
+    # function to delete from hash table - remove key/value pair
+    def delete(self, key):
+        """
+        Removes a key-value pair from the hash table.
+        The slot becomes a tombstone. When the next slot is empty no probe run
+        passes through it, so the tombstone (and any tombstones just before it)
+        are turned back into empty slots right away.
+
+        Args:
+            key (int, str or bytes): The key of the entry to remove.
+        Returns:
+            bool: True if the key was successfully deleted, False if the key was not found.
+        """
+        index = self._find(key)
+        if index < 0:
+            return False
+
+        self.slot_keys[index] = None
+        self.slot_values[index] = None
+        self.size -= 1
+        states, mask = self.states, self._mask
+        if states[(index + 1) & mask] == _EMPTY:
+            states[index] = _EMPTY
+            index = (index - 1) & mask
+            while states[index] == _DELETED:
+                states[index] = _EMPTY
+                self.tombstones -= 1
+                index = (index - 1) & mask
+        else:
+            states[index] = _DELETED
+            self.tombstones += 1
+        return True
+
+
+    #function to empty the table and return it to its initial capacity
+    def clear(self):
+        """
+        Removes every entry and returns the table to its initial capacity.
+
+        Args:
+            None
+        Returns:
+            None: The function modifies the hash table in place.
+        """
+        self.size = 0
+        self.tombstones = 0
+        self._allocate(self._initial_capacity)
+
+
+    #number of key-value pairs stored - len(table)
+    def __len__(self):
+        return self.size
+
+
+    #membership test - `key in table`
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+
+    #slot index of every occupied slot, in slot order
+    def _occupied_slots(self):
+        """
+        Yields the index of every occupied slot.
+        `bytearray.find` skips runs of free slots in C. Inserting a new key or
+        deleting one during the walk raises RuntimeError, as it does for a dict.
+
+        Args:
+            None
+        Returns:
+            generator: Slot indexes.
+        Raises:
+            RuntimeError: If the table changes size or is rehashed during iteration.
+        """
+        states, size = self.states, self.size
+        index = states.find(_OCCUPIED)
+        while index >= 0:
+            yield index
+            if self.size != size or self.states is not states:
+                raise RuntimeError("OpenAddressHashTable changed size during iteration")
+            index = states.find(_OCCUPIED, index + 1)
+
+
+    #walk every key - `for key in table`
+    def __iter__(self):
+        keys = self.slot_keys
+        return (keys[index] for index in self._occupied_slots())
+
+
+    #walk every value
+    def values(self):
+        """
+        Yields every stored value, in slot order.
+
+        Args:
+            None
+        Returns:
+            generator: The stored values.
+        """
+        values = self.slot_values
+        return (values[index] for index in self._occupied_slots())
+
+
+    #walk every stored (key, value) pair
+    def items(self):
+        """
+        Yields every stored (key, value) pair, in slot order.
+
+        Args:
+            None
+        Returns:
+            generator: (key, value) tuples.
+        """
+        keys, values = self.slot_keys, self.slot_values
+        return ((keys[index], values[index]) for index in self._occupied_slots())
+
+
+    #walk every (key, value) pair in ascending key order
+    def ordered_items(self):
+        """
+        Yields every stored (key, value) pair in ascending key order.
+        The pairs are collected and sorted up front, so the table can be changed
+        while the caller is still consuming them. Keys of different types are
+        ordered with `key_order` (integer ids first, then tracking numbers).
+
+        Args:
+            None
+        Returns:
+            generator: (key, value) tuples, smallest key first.
+        """
+        yield from sorted(self.items(), key=lambda item: key_order(item[0]))
+
+
+    #slots a probe for a key hash examined: up to its slot on a hit, up to the first empty slot on a miss
+    def _probe_length(self, code, index):
+        home = code >> self._shift
+        if index < 0:
+            index = self.states.find(_EMPTY, home)  #bytearray.find scans in C
+            if index < 0:
+                index = self.states.find(_EMPTY)  #the probe wrapped around
+        return ((index - home) & self._mask) + 1
+
+
+    #function to zero the lookup and resize counters
+    def reset_stats(self):
+        """
+        Zeroes the lookup counters and the resize count and time.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.hits = 0
+        self.misses = 0
+        self.probes = 0  #slots examined by counted lookups
+        self.resizes = 0
+        self.rehash_seconds = 0.0
+
+
+    #probe length -> number of keys found after that many probes
+    def probe_histogram(self):
+        """
+        Counts, for every stored key, how many slots a lookup of it probes (1 when
+        it sits in its home slot). Walks every occupied slot, so it costs O(size).
+
+        Args:
+            None
+        Returns:
+            dict: Probe length -> number of keys, in ascending length order.
+        """
+        hashes = self.slot_hashes
+        return dict(sorted(Counter(self._probe_length(hashes[index], index)
+                                   for index in self._occupied_slots()).items()))
+
+
+    #function to report the table's shape and the counters
+    def stats(self):
+        """
+        Reports how the table is performing, to tell a bad hash distribution on
+        real keys apart from other slowdowns. The probe histogram is computed on
+        each call; the counters cost nothing to read.
+
+        Args:
+            None
+        Returns:
+            dict: size, capacity, load_factor, tombstones, probe_histogram,
+                  longest_probe, resizes and rehash_seconds; also lookups, hits,
+                  misses and probes_per_lookup (None when lookups are not counted).
+        """
+        histogram = self.probe_histogram()
+        lookups = self.hits + self.misses
+        counted = self.track_stats or lookups > 0  #counters from an earlier tracked period still count
+        return {
+            "size": self.size,
+            "capacity": self.capacity,
+            "load_factor": self.size / self.capacity,
+            "tombstones": self.tombstones,
+            "probe_histogram": histogram,
+            "longest_probe": max(histogram, default=0),
+            "resizes": self.resizes,
+            "rehash_seconds": self.rehash_seconds,
+            "lookups": lookups if counted else None,
+            "hits": self.hits if counted else None,
+            "misses": self.misses if counted else None,
+            "probes_per_lookup": self.probes / lookups if lookups else None,
+        }
+
+
+    #function to rehash into a larger (or same-size, tombstone-free) table
+    def _resize(self, new_capacity=None):
+        """
+        Rehashes every entry into a fresh set of arrays.
+        By default the capacity doubles when live entries alone fill more than half
+        of the maximum load; otherwise the table was mostly tombstones and is rebuilt
+        at the same capacity to clear them.
+
+        Args:
+            new_capacity (int, optional): Slots wanted, rounded up to a power of two.
+                                          Defaults to the rule above.
+        Returns:
+            None: The function modifies the hash table in place.
+        """
+        start = time.perf_counter()
+        old_keys, old_hashes, old_states, old_values = self.slot_keys, self.slot_hashes, self.states, self.slot_values
+        if new_capacity is None:
+            new_capacity = self.capacity * 2 if self.size + 1 > self.capacity * MAX_LOAD_FACTOR / 2 else self.capacity
+        self._allocate(new_capacity)
+        self.tombstones = 0
+
+        keys, hashes, states, values = self.slot_keys, self.slot_hashes, self.states, self.slot_values
+        mask, shift = self._mask, self._shift
+        for old_index in range(len(old_states)):
+            if old_states[old_index] != _OCCUPIED:
+                continue
+            code = old_hashes[old_index]  #stored, so no key is hashed again
+            index = code >> shift
+            while states[index]:
+                index = (index + 1) & mask
+            keys[index] = old_keys[old_index]
+            hashes[index] = code
+            states[index] = _OCCUPIED
+            values[index] = old_values[old_index]
+        self.resizes += 1
+        self.rehash_seconds += time.perf_counter() - start
+
+
+    #print a text copy of hash table contents
+    def __str__(self):
+        """
+        Returns a string representation of the hash table, one occupied slot per line.
+
+        Args:
+            None
+        Returns:
+            str: A multi-line string of "slot: (key, value)" lines.
+        """
+        return "\n".join(f"{i}: {(self.slot_keys[i], self.slot_values[i])}"
+                         for i in range(self.capacity) if self.states[i] == _OCCUPIED)
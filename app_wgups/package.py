@@ -31,6 +31,11 @@ class Package:
             status (PackageStatus): The current status of the package (AT_HUB by default).
             departure_time (datetime, optional): The time the package leaves the hub. Defaults to None.
             delivery_time (datetime, optional): The actual time the package is delivered. Defaults to None.
+            address_id (int, optional): The distance matrix id of the address, set by `resolve_address`.
+            store (PackageStore, optional): The store indexing this package; notified when the
+                                            truck, address, status or a delivery time changes,
+                                            so it can re-index the package and keep its history.
+                                            Defaults to None.
         Returns:
             None
         """
@@ -48,6 +53,72 @@ class Package:
         self.status = PackageStatus.AT_HUB  # Default status using enum - AT HUB
         self.departure_time = None #Time package left the hub on a truck, default None
         self.delivery_time = None  #Time of delivery (default: not delivered), default None
+        self.address_id = None  #Distance matrix id of the address, resolved once after loading
+        self.store = None  #PackageStore holding this package, kept in sync through _changed
+
+
+    #key used for distance lookups: the resolved address id, or the raw address if unresolved
+    @property
+    def location(self):
+        """
+        Returns the key routing code should use for distance lookups.
+        Once the address has been resolved this is its integer matrix id, so
+        lookups skip string matching entirely; otherwise it is the address string.
+
+        Args:
+            None
+        Returns:
+            int or str: The resolved address id, or the address if it is not resolved.
+        """
+        return self.address_id if self.address_id is not None else self.address
+
+
+    #resolve this package's address against the distance matrix
+    def resolve_address(self, distance_matrix, at=None):
+        """
+        Resolves the package address to its distance matrix id.
+        Spelling differences (trailing spaces, "South" vs "S", "Station" vs "Sta")
+        are handled by the matrix's canonicalization index.
+
+        Args:
+            distance_matrix (DistanceMatrix): The matrix used for routing.
+            at (datetime, optional): When the change takes effect, for the store's history.
+                                     Defaults to None (the id holds at every time).
+        Returns:
+            int or None: The resolved address id, or None if the address is not in the matrix.
+        """
+        old_location, old_address_id = self.location, self.address_id
+        self._resolve(distance_matrix)
+        self._changed("address_id", old_address_id, at)
+        self._changed("location", old_location)
+        return self.address_id
+
+
+    #look up the matrix id of the current address, without notifying the store
+    def _resolve(self, distance_matrix):
+        resolve = getattr(distance_matrix, "resolve", None)
+        self.address_id = resolve(self.address) if resolve else None
+        if self.address_id is None and resolve:
+            logging.warning(f"Package {self.package_id} address {self.address!r} is not in the distance matrix")
+
+
+    #package ids: numeric ids stay integers, anything else is an alphanumeric tracking number
+    @staticmethod
+    def parse_package_id(text):
+        """
+        Converts a package id read from a file or typed by a user into a hash table key.
+
+        Args:
+            text (str): The raw id, e.g. "14" or "1z999aa10123456784".
+        Returns:
+            int or str: An integer for numeric ids, otherwise the upper-case tracking number.
+        Raises:
+            ValueError: If the id is empty or not alphanumeric.
+        """
+        text = text.strip()
+        if not text.isalnum():
+            raise ValueError(f"Invalid package id {text!r}.")
+        return int(text) if text.isdigit() else text.upper()
 
 
     #define method to load packages from the csv file
@@ -75,7 +146,8 @@ class Package:
             - Reads each row from the CSV.
             - Converts `deadline` from string to a `time` object, defaulting to 23:59 if "EOD".
             - Converts `weight` and `truck` values to integers where applicable.
-            - Inserts each package into the `hash_table` using its `package_id` as the key.
+            - Loads all packages into the `hash_table` in one `bulk_load`, using each
+              `package_id` as the key, so the table is sized once for the whole file.
         Returns:
             None: The function modifies the `hash_table` in place.
         """
@@ -86,6 +158,7 @@ class Package:
         CSV_FILE_PATH = os.path.join(DATA_DIR, "packages_data.csv")  # Adjust file name if needed
 
 
+        packages = []
         with open(CSV_FILE_PATH, mode="r", encoding="utf-8-sig") as file:
             reader = csv.reader(file)
 
@@ -98,7 +171,7 @@ class Package:
                     deadline = time(16, 59)
 
                 package = Package(
-                    package_id=int(row[0]),
+                    package_id=Package.parse_package_id(row[0]),
                     address=row[1],
                     city=row[2],
                     state=row[3],
@@ -108,13 +181,32 @@ class Package:
                     notes=row[7] if len(row) > 7 else "",
                     truck=int(row[8]) if len(row) > 8 and row[8].strip() else None
                 )
-                hash_table.insert(package.package_id, package)
+                packages.append((package.package_id, package))
+
+        #one presized load instead of growing the table one insert at a time
+        hash_table.bulk_load(packages)
+
+
+    #resolve every package address once, so routing never does string matching
+    @staticmethod
+    def resolve_address_ids(hash_table, distance_matrix):
+        """
+        Resolves the address of every package in the hash table to its distance matrix id.
+
+        Args:
+            hash_table (HashTable): The hash table storing package data.
+            distance_matrix (DistanceMatrix): The matrix used for routing.
+        Returns:
+            None: Sets `address_id` on each package in place.
+        """
+        for package in hash_table.values():
+            package.resolve_address(distance_matrix)
 
 
     # define methods to update attributes (status, delivery time, address, etc.)
 
     #update delivery status
-    def update_status(self, new_status):
+    def update_status(self, new_status, at=None):
         """
         Updates the delivery status of the package.
         This function modifies the `status` attribute of a `Package` object to reflect
@@ -123,13 +215,17 @@ class Package:
         Args:
             new_status (PackageStatus): The new status of the package. Expected values
                                         are from the `PackageStatus` enum.
+            at (datetime, optional): When the status changed, for the store's history.
+                                     Defaults to None (no history is kept for the change).
         Returns:
             None: The function updates the status in place.
         """
+        old_status = self.status
         self.status = new_status
+        self._changed("status", old_status, at)
 
     #update departure time
-    def update_departure_time(self, departure_time):
+    def update_departure_time(self, departure_time, at=None):
         """
         Updates the departure time of the package.
         This function sets the `departure_time` attribute to track when the package
@@ -138,47 +234,89 @@ class Package:
         Args:
             departure_time (datetime): The timestamp indicating when the package
                                        departs on a truck.
+            at (datetime, optional): When the change takes effect, for the store's history.
+                                     Defaults to None (no history is kept for the change).
         Returns:
             None: The function updates the departure time in place.
         """
+        old_departure_time = self.departure_time
         self.departure_time = departure_time
+        self._changed("departure_time", old_departure_time, at)
 
     #update delivery time (expected)
-    def update_delivery_time(self, delivery_time):
+    def update_delivery_time(self, delivery_time, at=None):
         """
         Updates the delivery time of the package.
         This function records the actual delivery time when the package is delivered.
         Args:
             delivery_time (datetime): The timestamp indicating when the package
                                       was delivered.
+            at (datetime, optional): When the change takes effect, for the store's history.
+                                     Defaults to None (no history is kept for the change).
         Returns:
             None: The function updates the delivery time in place.
         """
+        old_delivery_time = self.delivery_time
         self.delivery_time = delivery_time
+        self._changed("delivery_time", old_delivery_time, at)
 
     #update street address & Print confirmation to console
-    def update_address(self, new_address, new_city = None, new_state = None, new_zip=None):
+    def update_address(self, new_address, new_city = None, new_state = None, new_zip=None, distance_matrix=None, at=None):
         """
         Updates the delivery address of the package.
         This function allows modification of the package's address details, including
         the street address, city, state, and ZIP code. If optional parameters are
-        provided, they will be updated as well.
+        provided, they will be updated as well. The resolved address id is refreshed
+        when a distance matrix is given, and cleared otherwise.
 
         Args:
             new_address (str): The new street address for the package.
             new_city (str, optional): The new city for the package. Defaults to None.
             new_state (str, optional): The new state for the package. Defaults to None.
             new_zip (str, optional): The new ZIP code for the package. Defaults to None.
+            distance_matrix (DistanceMatrix, optional): Matrix used to re-resolve the address id.
+            at (datetime, optional): When the new address takes effect, for the store's history.
+                                     Defaults to None (no history is kept for the change).
         Returns:
             None: The function updates the package's address attributes in place.
         """
         logging.info(f"Address update: Package {self.package_id} now has address {new_address} - was {self.address}")
+        old_location = self.location
+        old_values = {"address": self.address, "city": self.city, "state": self.state,
+                      "zip_code": self.zip_code, "address_id": self.address_id}
         self.address = new_address
         if new_city:
             self.city = new_city
+        if new_state:
+            self.state = new_state
         if new_zip:
             self.zip_code = new_zip
 
+        self.address_id = None
+        if distance_matrix is not None:
+            self._resolve(distance_matrix)
+        for field, old_value in old_values.items():
+            self._changed(field, old_value, at)
+        self._changed("location", old_location)
+
+
+    #tell the package store (if any) that a field changed, so it can re-index and record the old version
+    def _changed(self, field, old_value, at=None):
+        if self.store is not None and getattr(self, field) != old_value:
+            self.store.package_changed(self, field, old_value, at)
+
+
+    #pickle support (DiskHashTable): save the package's own fields, never the store it belongs to
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["store"] = None
+        return state
+
+
+    #restore a pickled package detached from any store
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
 
 
     #METHODS TO RETRIEVE INFO FROM HASH TABLE OR RESET TABLE
@@ -197,7 +335,10 @@ class Package:
         Returns:
             list: A list of Package objects assigned to the specified truck.
         """
-        return [pkg for bucket in hash_table.table for key, pkg in bucket if pkg.truck == truck_id]
+        packages_by_truck = getattr(hash_table, "packages_by_truck", None)
+        if packages_by_truck is not None:  #PackageStore: read the truck index instead of scanning
+            return packages_by_truck(truck_id)
+        return [pkg for pkg in hash_table.values() if pkg.truck == truck_id]
 
     #define way to clear all info upon reset at start of new day
     @staticmethod
@@ -212,9 +353,7 @@ class Package:
         Returns:
             None: Modifies the hash table in place.
         """
-        hash_table.table = [[] for _ in range(hash_table.capacity)]
-        hash_table.size = 0
-        hash_table.longest_bucket = 0
+        hash_table.clear()
 
 
     #print human-readable package data when hash table prints
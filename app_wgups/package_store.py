@@ -0,0 +1,435 @@
+# package store: the package HashTable plus secondary indexes kept current as packages change
+# indexes: truck id -> ids, address (resolved id or raw address) -> ids, status -> ids, and deadline order
+# history: per-package, per-field version chains, so lookup(key, as_of=t) returns the package as it was at t
+# sources for code:  Zybooks section 6, Hash Tables (all sub-sections) at https://learn.zybooks.com/zybook/WGUC950Template2023/chapter/6/section/1
+# and Python 3.9.21 documentation for bisect found at https://docs.python.org/3.9/library/bisect.html
+
+from bisect import bisect_left, bisect_right, insort
+from copy import copy
+from datetime import datetime
+
+from app_wgups.hash_table import HashTable
+from app_wgups.key_hash import AFTER_EVERY_KEY, key_order
+
+#fields whose changes are kept as versions ("location" is derived from address/address_id)
+VERSIONED_FIELDS = frozenset(("status", "address", "city", "state", "zip_code",
+                              "address_id", "departure_time", "delivery_time"))
+_BEGINNING = datetime.min  #valid_from of the first version in every chain
+
+
+class PackageStore(HashTable):
+    def __init__(self, capacity=23, incremental=False, retention=None, track_stats=False):
+        """
+        Initializes a package hash table with maintained secondary indexes.
+        Lookups by package id work exactly as in HashTable. In addition, every
+        stored package is indexed by truck, address and status (dicts of id sets)
+        and by deadline (a sorted list), so those queries cost O(result size)
+        instead of a walk over every bucket. Packages report their own changes
+        (`update_status`, `update_address`, `resolve_address`) to the store they
+        are in, which moves them between index entries. Trucks are assigned in the
+        package data and do not change once a package is stored.
+
+        The store also keeps each package's history. A change made with a time
+        (`update_status(..., at=t)` etc.) adds a (valid_from, value) version to the
+        chain of that one field, so `lookup(key, as_of=t)` can rebuild the package
+        as it was at t with one binary search per changed field. Fields that never
+        changed cost nothing. With `retention`, versions that stopped being current
+        more than `retention` before the latest change are dropped as changes
+        arrive; `collect_versions` drops them for a given horizon.
+
+        Args:
+            capacity (int, optional): The initial number of buckets. Defaults to 23.
+            incremental (bool, optional): Spread rehashing across operations. Defaults to False.
+            retention (timedelta, optional): How much history to keep. Defaults to all of it.
+            track_stats (bool, optional): Count lookups for `stats` (see HashTable). Defaults to False.
+        Attributes:
+            by_truck (dict): Truck id -> set of package ids.
+            by_address (dict): Address id (or the raw address while unresolved) -> set of package ids.
+            by_status (dict): PackageStatus -> set of package ids.
+            deadlines (list): Sorted (deadline, key_order(package id)) pairs; ids are
+                              ranked by type, so int and tracking-number ids can mix.
+            retention (timedelta or None): History kept behind the latest change.
+        Returns:
+            None
+        """
+        super().__init__(capacity, incremental, track_stats)
+        self.by_truck = {}
+        self.by_address = {}
+        self.by_status = {}
+        self.deadlines = []
+        self.retention = retention
+        self._versions = {}  #package id -> {field: ([valid_from, ...], [value, ...])}
+
+
+    #add a package to the truck, address and status indexes and subscribe to its changes
+    def _index_fields(self, package):
+        package_id = package.package_id
+        self.by_truck.setdefault(package.truck, set()).add(package_id)
+        self.by_address.setdefault(package.location, set()).add(package_id)
+        self.by_status.setdefault(package.status, set()).add(package_id)
+        package.store = self
+
+
+    #add a package to every secondary index
+    def _index(self, package):
+        self._index_fields(package)
+        insort(self.deadlines, (package.deadline, key_order(package.package_id)))
+
+
+    #remove a package from every secondary index
+    def _unindex(self, package):
+        package_id = package.package_id
+        for index, value in ((self.by_truck, package.truck), (self.by_address, package.location),
+                             (self.by_status, package.status)):
+            self._discard(index, value, package_id)
+        entry = (package.deadline, key_order(package_id))
+        position = bisect_left(self.deadlines, entry)
+        if position < len(self.deadlines) and self.deadlines[position] == entry:
+            del self.deadlines[position]
+        if package.store is self:
+            package.store = None
+
+
+    #drop one id from an index entry, removing the entry once it is empty
+    @staticmethod
+    def _discard(index, value, package_id):
+        ids = index.get(value)
+        if ids is not None:
+            ids.discard(package_id)
+            if not ids:
+                del index[value]
+
+
+    #change notification from a package: re-index it and record the new version
+    def package_changed(self, package, field, old_value, at=None):
+        """
+        Re-indexes a package after one of its fields changed and records the change
+        in the field's version chain.
+        Called by the Package update methods; `old_value` is the value the package
+        was indexed under before the change.
+
+        Args:
+            package (Package): The package that changed.
+            field (str): "location", "status" or another field in VERSIONED_FIELDS.
+            old_value (any): The previous value of the field.
+            at (datetime, optional): When the new value took effect. Without a time the
+                                     field's history is dropped and the new value holds
+                                     at every time. Defaults to None.
+        Returns:
+            None
+        """
+        index = {"location": self.by_address, "status": self.by_status}.get(field)
+        if index is not None:
+            self._discard(index, old_value, package.package_id)
+            index.setdefault(getattr(package, field), set()).add(package.package_id)
+        if field in VERSIONED_FIELDS:
+            self._record(package.package_id, field, old_value, getattr(package, field), at)
+
+
+    #add one version to a field's chain
+    def _record(self, key, field, old_value, new_value, at):
+        """
+        Adds `new_value`, valid from `at`, to the version chain of one field.
+        The first change of a field also records `old_value` as the version that
+        was valid from the beginning. A change with an earlier time than the
+        chain's latest version is placed by time and holds until the next version.
+
+        Args:
+            key (int or str): The package id.
+            field (str): The field that changed.
+            old_value (any): The value before the change.
+            new_value (any): The value after the change.
+            at (datetime or None): When the change took effect.
+        Returns:
+            None
+        """
+        chains = self._versions.get(key)
+        if at is None:
+            if chains is not None:
+                chains.pop(field, None)  #history unknown - the current value holds at every time
+                if not chains:
+                    del self._versions[key]
+            return
+
+        if chains is None:
+            chains = self._versions[key] = {}
+        chain = chains.get(field)
+        if chain is None:
+            chain = chains[field] = ([_BEGINNING], [old_value])
+        times, values = chain
+        position = bisect_right(times, at)
+        times.insert(position, at)
+        values.insert(position, new_value)
+
+        if self.retention is not None:
+            self._trim(chains, field, at - self.retention)
+            if not chains:
+                del self._versions[key]
+
+
+    #drop the versions of one chain that nothing at or after the horizon can see
+    @staticmethod
+    def _trim(chains, field, horizon):
+        """
+        Drops every version that was replaced at or before `horizon`.
+        The oldest remaining version becomes valid from the beginning, and a chain
+        left with one version (the current value) is removed entirely.
+
+        Args:
+            chains (dict): The package's field -> (times, values) chains.
+            field (str): The field to trim.
+            horizon (datetime): Queries earlier than this no longer need exact answers.
+        Returns:
+            int: The number of versions dropped.
+        """
+        times, values = chains[field]
+        dropped = bisect_right(times, horizon) - 1
+        if dropped > 0:
+            del times[:dropped]
+            del values[:dropped]
+            times[0] = _BEGINNING
+        if len(times) == 1:
+            del chains[field]
+            dropped += 1
+        return dropped
+
+
+    #garbage-collect history older than a horizon
+    def collect_versions(self, horizon):
+        """
+        Drops every version that stopped being current at or before `horizon`.
+        `lookup(key, as_of=t)` stays exact for t at or after the horizon; earlier
+        times get the oldest version that is kept.
+
+        Args:
+            horizon (datetime): The retention horizon.
+        Returns:
+            int: The number of versions dropped.
+        """
+        dropped = 0
+        for key in list(self._versions):
+            chains = self._versions[key]
+            for field in list(chains):
+                dropped += self._trim(chains, field, horizon)
+            if not chains:
+                del self._versions[key]
+        return dropped
+
+
+    #(valid_from, value) versions of one field of one package
+    def history(self, key, field):
+        """
+        Returns the recorded versions of one field of a package, oldest first.
+
+        Args:
+            key (int or str): The package id.
+            field (str): A field in VERSIONED_FIELDS.
+        Returns:
+            list of tuple: (valid_from, value) pairs; the first valid_from is datetime.min.
+                           Empty if the field has no recorded changes.
+        """
+        chain = self._versions.get(key, {}).get(field)
+        return list(zip(*chain)) if chain else []
+
+
+    # function to look up a package, now or as it was at an earlier time
+    def lookup(self, key, as_of=None):
+        """
+        Retrieves a package by id, optionally as it was at a given time.
+        For a time, every field with a version chain is set to the version valid at
+        that time (one binary search per changed field, O(log versions)). The result
+        is then a detached copy that is not in the store; without changes, or
+        without a time, the stored package itself is returned.
+
+        Args:
+            key (int or str): The package id.
+            as_of (datetime, optional): The time to rebuild the package at. Defaults to now.
+        Returns:
+            Package or None: The package, or None if the id is not stored.
+        """
+        package = super().lookup(key)
+        if as_of is None or package is None:
+            return package
+        chains = self._versions.get(key)
+        if not chains:
+            return package
+
+        snapshot = copy(package)
+        snapshot.store = None  #changes to a past version must not touch the indexes
+        for field, (times, values) in chains.items():
+            setattr(snapshot, field, values[bisect_right(times, as_of) - 1])
+        return snapshot
+
+
+    #function to insert new data into hash table (and the indexes)
+    def insert(self, key, value):
+        """
+        Inserts (or replaces) a package and indexes it.
+
+        Args:
+            key (int): The package id.
+            value (Package): The package.
+        Returns:
+            None
+        """
+        previous = self._find_entry(key)
+        if previous is not None:
+            self._unindex(previous)
+        self._versions.pop(key, None)
+        super().insert(key, value)
+        self._index(value)
+
+
+    #function to load many packages at once
+    def bulk_load(self, items, expected_size=None, unique_keys=False):
+        """
+        Loads many packages with at most one resize (see HashTable.bulk_load) and indexes them.
+
+        Args:
+            items (iterable): (package id, Package) pairs.
+            expected_size (int, optional): Number of pairs to expect. Defaults to None.
+            unique_keys (bool, optional): Ids are distinct and not yet stored. Defaults to False.
+        Returns:
+            int: The number of pairs read from `items`.
+        """
+        items = list(items)
+        if not unique_keys:
+            for key, _ in items:
+                previous = self._find_entry(key)
+                if previous is not None:
+                    self._unindex(previous)
+                self._versions.pop(key, None)
+
+        count = super().bulk_load(items, expected_size, unique_keys)
+
+        #the final package for each id is the one stored - index only those
+        final = dict(items)
+        for package in final.values():
+            self._index_fields(package)
+        self.deadlines.extend((package.deadline, key_order(package.package_id)) for package in final.values())
+        self.deadlines.sort()  #one sort instead of an insort per package
+        return count
+
+
+    # function to update an object stored in the hash table
+    def update(self, key, new_value):
+        """
+        Replaces the package stored under an id and re-indexes it.
+
+        Args:
+            key (int): The package id.
+            new_value (Package): The replacement package.
+        Returns:
+            bool: True if the update was successful, False if the id was not found.
+        """
+        previous = self._find_entry(key)
+        if previous is None:
+            return False
+        self._unindex(previous)
+        self._versions.pop(key, None)  #history belonged to the replaced object
+        super().update(key, new_value)
+        self._index(new_value)
+        return True
+
+
+    # function to delete a package and its index entries
+    def delete(self, key):
+        """
+        Removes a package from the table, every index and its history.
+
+        Args:
+            key (int): The package id.
+        Returns:
+            bool: True if the package was deleted, False if the id was not found.
+        """
+        previous = self._find_entry(key)
+        if previous is None:
+            return False
+        self._unindex(previous)
+        self._versions.pop(key, None)
+        return super().delete(key)
+
+
+    #function to empty the table and its indexes
+    def clear(self):
+        """
+        Removes every package and empties the indexes and history.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        for package in self.values():
+            if package.store is self:
+                package.store = None
+        super().clear()
+        self.by_truck.clear()
+        self.by_address.clear()
+        self.by_status.clear()
+        self.deadlines.clear()
+        self._versions.clear()
+
+
+    #packages for a set of ids, in package id order (integer ids before tracking numbers)
+    def _packages(self, ids):
+        return [self._find_entry(package_id) for package_id in sorted(ids, key=key_order)]
+
+
+    #every package assigned to one truck
+    def packages_by_truck(self, truck_id):
+        """
+        Returns the packages assigned to a truck, in package id order.
+
+        Args:
+            truck_id (int): The truck number.
+        Returns:
+            list: The Package objects on that truck.
+        """
+        return self._packages(self.by_truck.get(truck_id, ()))
+
+
+    #every package going to one address
+    def packages_by_address(self, location):
+        """
+        Returns the packages going to an address, in package id order.
+
+        Args:
+            location (int or str): The resolved address id, or the raw address of
+                                   packages that are not resolved.
+        Returns:
+            list: The Package objects for that address.
+        """
+        return self._packages(self.by_address.get(location, ()))
+
+
+    #every package with one status
+    def packages_by_status(self, status):
+        """
+        Returns the packages currently in a status, in package id order.
+
+        Args:
+            status (PackageStatus): The status to select.
+        Returns:
+            list: The Package objects in that status.
+        """
+        return self._packages(self.by_status.get(status, ()))
+
+
+    #packages with a deadline in a range, earliest deadline first
+    def packages_by_deadline(self, earliest=None, latest=None):
+        """
+        Returns the packages whose deadline lies in [earliest, latest].
+        The range is found by binary search in the sorted deadline index, so the
+        cost is O(log n + result size).
+
+        Args:
+            earliest (time, optional): Lower bound (inclusive). Defaults to no bound.
+            latest (time, optional): Upper bound (inclusive). Defaults to no bound.
+        Returns:
+            list: The Package objects, earliest deadline first (ties by package id,
+                  integer ids before tracking numbers).
+        """
+        start = 0 if earliest is None else bisect_left(self.deadlines, (earliest,))
+        stop = len(self.deadlines) if latest is None else bisect_right(self.deadlines, (latest, AFTER_EVERY_KEY))
+        return [self._find_entry(package_id) for _, (_, package_id) in self.deadlines[start:stop]]
@@ -0,0 +1,217 @@
+#parallel chunked parsing of very large distance matrix CSVs
+#the file is split into byte ranges at row boundaries; worker processes parse their rows and write
+#them straight into one shared-memory packed lower triangle, giving the same result as the serial loader
+#Sources for code: Python 3.9.21 documentation for concurrent.futures and multiprocessing.shared_memory found at
+#https://docs.python.org/3.9/library/concurrent.futures.html and https://docs.python.org/3.9/library/multiprocessing.shared_memory.html
+
+import csv
+import io
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from app_wgups.distance_matrix import DistanceMatrix, packed_index, packed_size
+
+
+#parse the rows of one byte range of the file
+def _read_chunk(csv_path, start, end, first_line):
+    """
+    Reads one byte range of the CSV and returns its usable rows.
+    Blank and broken lines are skipped exactly like the serial loader does.
+
+    Args:
+        csv_path (str): The distance matrix CSV.
+        start (int): Byte offset of the first row in the chunk.
+        end (int): Byte offset just past the last row in the chunk.
+        first_line (int): Line number of the chunk's first line in the file.
+    Returns:
+        list of tuple: (line number, parsed row) pairs.
+    """
+    with open(csv_path, "rb") as csv_file:
+        csv_file.seek(start)
+        text = csv_file.read(end - start).decode("utf-8")
+    reader = csv.reader(io.StringIO(text))
+    return [(first_line + reader.line_num - 1, row) for row in reader if row and len(row) >= 2]
+
+
+#whether a line is a row the loaders use (not blank, at least a label and one cell)
+def _is_data_row(line):
+    if b'"' in line:  #a quoted label may hold commas - let csv decide
+        row = next(csv.reader([line.decode("utf-8")]), [])
+        return len(row) >= 2
+    return b"," in line
+
+
+#parse one cell, naming its position when it is not a number (same message as the serial loader)
+def _parse_cell(csv_path, line_number, value, row_address, header):
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{csv_path}:{line_number}: invalid distance {value!r} "
+                         f"from {row_address} to {header}") from None
+
+
+#attach to the shared output buffer as an array of doubles
+def _attach(buffer_name):
+    shared = shared_memory.SharedMemory(name=buffer_name)
+    return shared, shared.buf.cast("d")
+
+
+#phase 1: write the lower-triangle cells of every row in the chunk
+def _parse_lower(csv_path, start, end, first_line, first_row, row_count, headers, buffer_name):
+    """
+    Parses the chunk's rows and writes their cells on or below the diagonal.
+    Each row owns one contiguous slice of the packed triangle, so workers never
+    write the same memory in this phase.
+
+    Args:
+        csv_path (str): The distance matrix CSV.
+        start (int): Byte offset of the chunk.
+        end (int): Byte offset just past the chunk.
+        first_line (int): Line number of the chunk's first line.
+        first_row (int): Global row id of the chunk's first row.
+        row_count (int): Number of rows to take from the chunk (extra rows are ignored).
+        headers (list of str): The address column headers.
+        buffer_name (str): Name of the shared output buffer.
+    Returns:
+        tuple: (row labels, number of empty lower cells).
+    """
+    rows = _read_chunk(csv_path, start, end, first_line)[:row_count]
+    shared, distances = _attach(buffer_name)
+    labels = []
+    empty_cells = 0
+    try:
+        for i, (line_number, row) in enumerate(rows, start=first_row):
+            labels.append(row[0].strip())
+            values = row[1:len(headers) + 1][:i + 1]
+            packed_row = array("d", [float("nan")]) * (i + 1)
+            for j, value in enumerate(values):
+                if value.strip():
+                    packed_row[j] = _parse_cell(csv_path, line_number, value, labels[-1], headers[j])
+            empty_cells += (i + 1) - sum(1 for value in values if value.strip())
+            offset = packed_index(i, 0)
+            distances[offset:offset + i + 1] = packed_row
+    finally:
+        distances.release()
+        shared.close()
+    return labels, empty_cells
+
+
+#phase 2 (only when lower cells were empty): fill them from the mirrored upper-triangle cells
+def _fill_upper(csv_path, start, end, first_line, first_row, row_count, headers, buffer_name):
+    """
+    Fills still-empty cells from the chunk's cells above the diagonal.
+    Runs only after every lower cell has been written, so - as in the serial
+    loader - an upper cell never overrides a lower one.
+
+    Args:
+        (same as _parse_lower)
+    Returns:
+        None
+    """
+    rows = _read_chunk(csv_path, start, end, first_line)[:row_count]
+    shared, distances = _attach(buffer_name)
+    try:
+        for i, (line_number, row) in enumerate(rows, start=first_row):
+            for j, value in enumerate(row[i + 2:len(headers) + 1], start=i + 1):
+                index = packed_index(i, j)
+                if index < len(distances) and distances[index] != distances[index] and value.strip():
+                    distances[index] = _parse_cell(csv_path, line_number, value, row[0].strip(), headers[j])
+    finally:
+        distances.release()
+        shared.close()
+
+
+#split the data rows into byte ranges that start and end on line boundaries, counting their rows
+def _chunk_ranges(csv_path, data_start, chunks):
+    """
+    Splits the file after the header into roughly equal byte ranges at row boundaries.
+    One pass over the lines finds the boundaries and counts the usable rows of
+    every range, so each worker knows its global row ids without a parse of its
+    own. Only a line holding a quote character is run through csv.
+
+    Args:
+        csv_path (str): The distance matrix CSV.
+        data_start (int): Byte offset of the first data row (line 2).
+        chunks (int): Desired number of ranges.
+    Returns:
+        list of tuple: (start, end, first line number, usable rows) for each range.
+    """
+    file_size = os.path.getsize(csv_path)
+    step = max(1, (file_size - data_start) // chunks)
+    ranges = []
+    start, first_line, rows = data_start, 2, 0
+    position, line_number = data_start, 2
+    with open(csv_path, "rb") as csv_file:
+        csv_file.seek(data_start)
+        for line in csv_file:
+            rows += _is_data_row(line)
+            position += len(line)
+            line_number += 1
+            if position - start >= step and position < file_size:
+                ranges.append((start, position, first_line, rows))
+                start, first_line, rows = position, line_number, 0
+    if position > start:
+        ranges.append((start, position, first_line, rows))
+    return ranges
+
+
+#parallel version of load_distance_data
+def load_distance_data_parallel(csv_path, workers=None):
+    """
+    Loads a distance matrix CSV with a pool of worker processes.
+    Produces exactly the same DistanceMatrix as the serial `load_distance_data`.
+    Rows containing quoted line breaks are not supported (addresses never span lines).
+
+    Args:
+        csv_path (str): The file path to the CSV containing the distance matrix.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+    Returns:
+        DistanceMatrix: The loaded matrix, indexed by address id.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with open(csv_path, mode="r") as csvfile:
+        raw_headers = next(csv.reader(csvfile))[1: ]  #same header handling as the serial loader
+    headers = list(filter(None, [header.strip() for header in raw_headers]))
+    size = len(headers)
+
+    with open(csv_path, "rb") as csv_file:
+        csv_file.readline()
+        data_start = csv_file.tell()
+
+    ranges = _chunk_ranges(csv_path, data_start, workers * 4)
+
+    #start the resource tracker before the workers exist, so they share the parent's tracker
+    #instead of each starting one that would unlink the buffer again when the worker exits
+    resource_tracker.ensure_running()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        #global id of each chunk's first row; rows past the header count are ignored
+        tasks = []
+        first_row = 0
+        for start, end, first_line, count in ranges:
+            count = min(count, size - first_row)
+            if count > 0:
+                tasks.append((csv_path, start, end, first_line, first_row, count, headers))
+            first_row += max(count, 0)
+        row_total = first_row
+
+        cells = packed_size(row_total)
+        shared = shared_memory.SharedMemory(create=True, size=max(8, cells * 8))
+        try:
+            task_args = list(zip(*[task + (shared.name,) for task in tasks])) if tasks else []
+            results = list(pool.map(_parse_lower, *task_args)) if tasks else []
+            if any(empty_cells for _, empty_cells in results):
+                list(pool.map(_fill_upper, *task_args))
+
+            distances = array("d")
+            distances.frombytes(shared.buf[:cells * 8])
+        finally:
+            shared.close()
+            shared.unlink()
+
+    row_addresses = [label for labels, _ in results for label in labels]
+    aliases = {header: i for i, header in enumerate(headers[:len(row_addresses)]) if header != row_addresses[i]}
+    return DistanceMatrix(row_addresses, distances, aliases)
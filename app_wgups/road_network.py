@@ -0,0 +1,234 @@
+#sparse road-network distance backend: edge list -> CSR adjacency arrays, distances by on-demand Dijkstra
+#for service areas where materializing every address pair is impossible
+#Sources for code: Python 3.9.21 documentation for heapq and collections.OrderedDict found at
+#https://docs.python.org/3.9/library/heapq.html and https://docs.python.org/3.9/library/collections.html
+
+import bisect
+import csv
+import heapq
+from array import array
+from collections import OrderedDict
+
+from app_wgups.distance_matrix import AddressIndex
+
+DEFAULT_ROW_CACHE_SIZE = 256
+
+
+#road graph with the same lookup interface as DistanceMatrix
+class RoadNetwork(AddressIndex):
+    def __init__(self, addresses, offsets, targets, weights, directed=False, cache_size=DEFAULT_ROW_CACHE_SIZE):
+        """
+        Initializes a road network stored as compressed sparse row (CSR) arrays.
+        The roads leaving node i are targets[offsets[i]:offsets[i + 1]], with the
+        matching lengths in `weights`. Distances are shortest paths, computed with
+        single-source Dijkstra the first time a row is needed and kept in a bounded
+        LRU cache of rows.
+
+        Args:
+            addresses (list of str): The address of each node, in id order.
+            offsets (array): CSR row offsets, len(addresses) + 1 entries.
+            targets (array): CSR edge targets (node ids).
+            weights (array): CSR edge lengths in miles.
+            directed (bool, optional): Whether roads are one-way. Defaults to False.
+            cache_size (int, optional): Maximum number of cached Dijkstra rows. Defaults to 256.
+        Attributes:
+            cache_hits (int): Row requests served from the cache.
+            cache_misses (int): Row requests that ran Dijkstra.
+        Returns:
+            None
+        Raises:
+            ValueError: If a road length is negative or NaN (Dijkstra needs non-negative lengths).
+        """
+        for edge, weight in enumerate(weights):
+            if not weight >= 0:
+                source = bisect.bisect_right(offsets, edge) - 1
+                raise ValueError(f"Invalid length {weight} for road {addresses[source]} → "
+                                 f"{addresses[targets[edge]]}; road lengths must be non-negative.")
+        super().__init__(addresses)
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.directed = directed
+        self.cache_size = cache_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._rows = OrderedDict()  #from id -> array of shortest distances, least recently used first
+
+
+    #single-source shortest paths from one node
+    def dijkstra(self, source_id):
+        """
+        Computes the shortest distance from one node to every node.
+
+        Args:
+            source_id (int): The id of the source node.
+        Returns:
+            array: Distance in miles to every node id; float("inf") if unreachable.
+        """
+        infinity = float("inf")
+        distances = array("d", [infinity]) * self.size
+        distances[source_id] = 0.0
+        offsets, targets, weights = self.offsets, self.targets, self.weights
+
+        heap = [(0.0, source_id)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue  #stale heap entry
+            for edge in range(offsets[node], offsets[node + 1]):
+                candidate = distance + weights[edge]
+                target = targets[edge]
+                if candidate < distances[target]:
+                    distances[target] = candidate
+                    heapq.heappush(heap, (candidate, target))
+
+        return distances
+
+
+    #fetch a row of shortest distances, from the LRU cache when possible
+    def row(self, from_id):
+        """
+        Returns the shortest distances from one node, running Dijkstra on a cache miss.
+
+        Args:
+            from_id (int): The id of the source node.
+        Returns:
+            array: Distance in miles to every node id; float("inf") if unreachable.
+        """
+        cached = self._rows.get(from_id)
+        if cached is not None:
+            self.cache_hits += 1
+            self._rows.move_to_end(from_id)
+            return cached
+
+        self.cache_misses += 1
+        distances = self.dijkstra(from_id)
+        self._rows[from_id] = distances
+        if len(self._rows) > self.cache_size:
+            self._rows.popitem(last=False)  #evict the least recently used row
+        return distances
+
+
+    #shortest distance between two node ids
+    def distance_by_id(self, from_id, to_id):
+        """
+        Retrieves the shortest road distance between two node ids.
+        On an undirected network a cached row of either endpoint answers the query.
+
+        Args:
+            from_id (int): The id of the starting node.
+            to_id (int): The id of the destination node.
+        Returns:
+            float or None: The distance in miles, or None if the destination is unreachable.
+        """
+        if not self.directed and from_id not in self._rows and to_id in self._rows:
+            from_id, to_id = to_id, from_id  #reuse the cached row of the other endpoint
+        distance = self.row(from_id)[to_id]
+        return None if distance == float("inf") else distance
+
+
+    #shortest distance between two addresses (same signature as DistanceMatrix.get_distance)
+    def get_distance(self, from_address, to_address):
+        """
+        Retrieves the shortest road distance between two addresses.
+
+        Args:
+            from_address (int or str): The starting address id or address.
+            to_address (int or str): The destination address id or address.
+        Returns:
+            float or None: The distance in miles, or None if either address is unknown
+                           or unreachable.
+        """
+        from_id = self.location_id(from_address)
+        to_id = self.location_id(to_address)
+        if from_id is None or to_id is None:
+            return None
+        return self.distance_by_id(from_id, to_id)
+
+
+    #row cache statistics
+    def cache_info(self):
+        """
+        Returns hit/miss counters for the Dijkstra row cache.
+
+        Args:
+            None
+        Returns:
+            dict: hits, misses, cached rows and the cache capacity.
+        """
+        return {"hits": self.cache_hits, "misses": self.cache_misses,
+                "rows": len(self._rows), "capacity": self.cache_size}
+
+
+#load a local edge-list file into a RoadNetwork
+def load_road_network(edge_list_path, directed=False, cache_size=DEFAULT_ROW_CACHE_SIZE):
+    """
+    Loads a road network from an edge-list CSV and builds CSR adjacency arrays.
+    The file has a header row followed by one road per row:
+    from_address, to_address, distance (miles). Nodes are assigned ids in the
+    order they first appear. Unless `directed` is set, every road is usable in
+    both directions.
+
+    Args:
+        edge_list_path (str): The file path to the edge-list CSV.
+        directed (bool, optional): Treat each row as a one-way road. Defaults to False.
+        cache_size (int, optional): Maximum number of cached Dijkstra rows. Defaults to 256.
+    Returns:
+        RoadNetwork: The loaded network.
+    Raises:
+        FileNotFoundError: If the edge-list file does not exist.
+        ValueError: If a row has a missing, invalid or negative distance.
+    """
+    node_ids = {}
+    sources = array("i")
+    destinations = array("i")
+    lengths = array("d")
+
+    with open(edge_list_path, mode="r", encoding="utf-8-sig") as edge_file:
+        reader = csv.reader(edge_file)
+        next(reader, None)  #skip header row
+
+        for line_number, row in enumerate(reader, start=2):
+            if not row or len(row) < 3:   #handle broken data
+                continue
+            from_address, to_address = row[0].strip(), row[1].strip()
+            try:
+                length = float(row[2])
+            except ValueError:
+                length = None
+            if length is None or not length >= 0:  #also rejects negative and NaN lengths
+                raise ValueError(f"{edge_list_path}:{line_number}: invalid distance {row[2]!r} "
+                                 f"for road {from_address} → {to_address}")
+
+            from_id = node_ids.setdefault(from_address, len(node_ids))
+            to_id = node_ids.setdefault(to_address, len(node_ids))
+            sources.append(from_id)
+            destinations.append(to_id)
+            lengths.append(length)
+            if not directed:
+                sources.append(to_id)
+                destinations.append(from_id)
+                lengths.append(length)
+
+    #counting sort of the edges by source node into CSR form
+    size = len(node_ids)
+    offsets = array("l", [0]) * (size + 1)
+    for source in sources:
+        offsets[source + 1] += 1
+    for node in range(size):
+        offsets[node + 1] += offsets[node]
+
+    targets = array("i", [0]) * len(sources)
+    weights = array("d", [0.0]) * len(sources)
+    next_slot = array("l", offsets[:size])
+    for source, destination, length in zip(sources, destinations, lengths):
+        slot = next_slot[source]
+        targets[slot] = destination
+        weights[slot] = length
+        next_slot[source] = slot + 1
+
+    addresses = [None] * size
+    for address, node_id in node_ids.items():
+        addresses[node_id] = address
+
+    return RoadNetwork(addresses, offsets, targets, weights, directed, cache_size)
@@ -15,10 +15,10 @@ class NearestNeighbor:
 
         Args:
             truck (Truck): The truck object for which the route is being optimized.
-            distance_matrix (dict): A dictionary containing distance data between locations.
+            distance_matrix (DistanceMatrix or RoadNetwork): The indexed distance data between locations.
         Attributes:
             truck (Truck): The truck assigned to this route optimization.
-            distance_matrix (dict): The distance matrix used for calculating routes.
+            distance_matrix (DistanceMatrix): The distance matrix used for calculating routes.
             optimized_manifest (list): A list that stores the optimized package delivery order.
         Returns:
             None
@@ -28,6 +28,21 @@ class NearestNeighbor:
         self.optimized_manifest = []
 
 
+    #distance used for ranking candidates - a missing distance ranks last, a 0.0 (same address) ranks first
+    def _distance_or_inf(self, from_location, to_location):
+        """
+        Returns the distance between two locations, or infinity if it is unknown.
+
+        Args:
+            from_location (int or str): The starting address id or address.
+            to_location (int or str): The destination address id or address.
+        Returns:
+            float: The distance in miles, or float("inf") if the lookup fails.
+        """
+        distance = get_distance(self.distance_matrix, from_location, to_location)
+        return float("inf") if distance is None else distance
+
+
     #algorithm logic and implementation
     def calculate_NN_route(self, truck):
         """
@@ -43,7 +58,10 @@ class NearestNeighbor:
         Returns:
             list: An ordered list of Package objects representing the optimized delivery sequence.
         """
-    
+        #fast path: every address resolved to a matrix id, so walk the precomputed candidate lists
+        if hasattr(self.distance_matrix, "neighbor_lists") and all(type(pkg.location) is int for pkg in truck.manifest):
+            return self.calculate_NN_route_indexed(truck)
+
         remaining_packages = set(truck.manifest[:])  #list of unvisited vertices
         current_vertex = "hub"    #current vertex for comparison
 
@@ -53,12 +71,12 @@ class NearestNeighbor:
             closest_package = min(
                 remaining_packages,
                 key=lambda pkg: (
-                    get_distance(self.distance_matrix, current_vertex, pkg.address) or float("inf"),
+                    self._distance_or_inf(current_vertex, pkg.location),
                     pkg.deadline  #sort distance, then check for deadlines
                 )
             )
             #check that distance has been calculated
-            distance = get_distance(self.distance_matrix, current_vertex, closest_package.address)
+            distance = get_distance(self.distance_matrix, current_vertex, closest_package.location)
             if distance is None:
                 logging.warning(f"WARNING: Distance lookup failed for {current_vertex} → {closest_package.address} for {closest_package.package_id}")
                 break    #prevents infinite loop
@@ -66,7 +84,54 @@ class NearestNeighbor:
             # update all variables, move package from unvisited to visited vertices list
             self.optimized_manifest.append(closest_package)
             remaining_packages.remove(closest_package)
-            current_vertex = closest_package.address #store this as the next starting place for check_distance
+            current_vertex = closest_package.location #store this as the next starting place for check_distance
 
         return self.optimized_manifest
 
+
+    #Nearest Neighbor over address ids, using the matrix's k-nearest candidate lists
+    def calculate_NN_route_indexed(self, truck):
+        """
+        Computes the Nearest Neighbor route by walking precomputed candidate lists.
+
+        Packages are grouped by resolved address id. At each step the nearest
+        unvisited address is taken from the current address's k-nearest list
+        (a full scan happens only when that list is exhausted), so building a
+        route costs roughly O(n*k) lookups instead of O(n^2). Packages sharing
+        the chosen address are delivered earliest deadline first, and equally near
+        addresses are ranked by their earliest deadline, as in `calculate_NN_route`.
+
+        Args:
+            truck (Truck): The truck object whose route is being optimized. Every
+                           package on its manifest must have a resolved address id.
+
+        Returns:
+            list: An ordered list of Package objects representing the optimized delivery sequence.
+        """
+        neighbor_lists = self.distance_matrix.neighbor_lists()
+
+        remaining_stops = {}  #address id -> unvisited packages for that address
+        for pkg in truck.manifest:
+            remaining_stops.setdefault(pkg.location, []).append(pkg)
+
+        current_vertex = self.distance_matrix.resolve("hub")
+
+        while remaining_stops:
+            nearest_stops, _ = neighbor_lists.nearest_unvisited_stops(current_vertex, remaining_stops)
+            if not nearest_stops:
+                #no matrix distance to any remaining stop - get_distance may still estimate one (see DistanceMatrix.estimator)
+                distance, stop = min((self._distance_or_inf(current_vertex, stop), stop) for stop in remaining_stops)
+                if distance == float("inf"):
+                    unreachable = [pkg.package_id for pkgs in remaining_stops.values() for pkg in pkgs]
+                    logging.warning(f"WARNING: Distance lookup failed from {current_vertex} for packages {unreachable}")
+                    break    #prevents infinite loop
+                nearest_stops = [stop]
+
+            #equally near stops: prioritize the one with the earliest delivery deadline
+            next_stop = min(nearest_stops, key=lambda stop: (min(pkg.deadline for pkg in remaining_stops[stop]), stop))
+
+            #deliver everything at this stop, earliest deadline first
+            self.optimized_manifest.extend(sorted(remaining_stops.pop(next_stop), key=lambda pkg: pkg.deadline))
+            current_vertex = next_stop
+
+        return self.optimized_manifest
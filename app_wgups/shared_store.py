@@ -0,0 +1,545 @@
+#package store in one multiprocessing.shared_memory block, so worker processes read packages without a copy each
+#fixed-width package records, an interned string table and an open-addressing index over the package ids
+#Sources for code: Python 3.9.21 documentation for multiprocessing.shared_memory, struct and memoryview found at
+#https://docs.python.org/3.9/library/multiprocessing.shared_memory.html, https://docs.python.org/3.9/library/struct.html
+#and https://docs.python.org/3.9/library/stdtypes.html#memoryview
+#
+#Block layout (all integers little-endian, every section 8-byte aligned):
+#   header          MAGIC, format version, record count, index slots, string count, string bytes
+#   records         count fixed-width records (see _RECORD)
+#   index           index slots of (key hash, record number + 1) pairs with linear probing; 0 marks an empty slot
+#   string offsets  string count + 1 offsets into the string bytes; string i is bytes[offsets[i]:offsets[i + 1]]
+#   string bytes    the interned strings, UTF-8 encoded, each stored once
+
+import struct
+from datetime import datetime, time, timedelta
+from multiprocessing import resource_tracker, shared_memory
+
+from app_wgups.key_hash import key_hash, key_order
+from app_wgups.package import Package
+from app_wgups.status import PackageStatus
+
+MAGIC = b"WGPS"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHxxQQQQ")  #magic, version, pad, record count, index slots, string count, string bytes
+_HEADER_SIZE = 64  #room to grow the header without moving the records
+
+#one package: key, deadline, departure, delivery, weight, address, city, state, zip, notes,
+#address id, truck, status, key kind, pad
+_RECORD = struct.Struct("<qqqqdIIIIIiiBBxx")
+_KEY, _DEADLINE, _DEPARTURE, _DELIVERY, _WEIGHT = 0, 8, 16, 24, 32
+_ADDRESS, _CITY, _STATE, _ZIP, _NOTES = 40, 44, 48, 52, 56
+_ADDRESS_ID, _TRUCK, _STATUS, _KIND = 60, 64, 68, 69
+
+_INT64 = struct.Struct("<q")
+_INT32 = struct.Struct("<i")
+_UINT32 = struct.Struct("<I")
+_DOUBLE = struct.Struct("<d")
+_BYTE = struct.Struct("<B")
+_PAIR = struct.Struct("<QQ")  #an index slot (key hash, record number + 1), or two adjacent string offsets
+_OFFSET = struct.Struct("<Q")
+
+_INT_KEY, _STR_KEY, _BYTES_KEY = range(3)
+_NONE = -1  #stored for a missing time, truck or address id
+_STATUSES = list(PackageStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_MICROSECOND = timedelta(microseconds=1)
+
+
+#round a section size up to a multiple of 8 bytes
+def _aligned(size):
+    return (size + 7) & ~7
+
+
+#datetime <-> microseconds since datetime.min (-1 for None)
+def _encode_datetime(value):
+    return _NONE if value is None else (value - datetime.min) // _MICROSECOND
+
+
+def _decode_datetime(value):
+    return None if value == _NONE else datetime.min + timedelta(microseconds=value)
+
+
+#time of day <-> microseconds since midnight (-1 for None)
+def _encode_time(value):
+    if value is None:
+        return _NONE
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1_000_000 + value.microsecond
+
+
+def _decode_time(value):
+    if value == _NONE:
+        return None
+    seconds, microsecond = divmod(value, 1_000_000)
+    return time(seconds // 3600, seconds // 60 % 60, seconds % 60, microsecond)
+
+
+#optional small integer <-> int32 (-1 for None)
+def _encode_optional(value):
+    return _NONE if value is None else value
+
+
+def _decode_optional(value):
+    return None if value == _NONE else value
+
+
+#weights load as ints from the CSV; keep whole weights ints so a view prints like the Package it came from
+def _decode_weight(value):
+    return int(value) if value.is_integer() else value
+
+
+#property reading (and optionally writing) one fixed-width field of a PackageView's record
+def _field(offset, packer, decode=None, encode=None, doc=None):
+    def getter(view):
+        value = packer.unpack_from(view._store._buf, view._offset + offset)[0]
+        return value if decode is None else decode(value)
+
+    def setter(view, value):
+        packer.pack_into(view._store._buf, view._offset + offset, value if encode is None else encode(value))
+
+    return property(getter, setter if encode is not None else None, doc=doc)
+
+
+#property reading one interned string field of a PackageView's record
+def _string_field(offset, doc=None):
+    def getter(view):
+        return view._store._string(_UINT32.unpack_from(view._store._buf, view._offset + offset)[0])
+    return property(getter, doc=doc)
+
+
+class PackageView:
+    """
+    Read-mostly view of one package record in a SharedPackageStore.
+    Every attribute is read straight from shared memory when it is accessed, so
+    a view costs two references no matter how many processes look at the
+    package. It has the same attributes as Package. The fixed-width fields
+    (status, truck, departure_time, delivery_time, address_id) can be assigned;
+    the change is written in place and every attached process sees it. Fields
+    held in the string table (address, city, state, zip_code, notes) are read-only.
+
+    Attributes:
+        package_id (int, str or bytes): The package's key.
+    """
+    __slots__ = ("_store", "_offset")
+
+    def __init__(self, store, record):
+        self._store = store
+        self._offset = store._records_start + record * _RECORD.size
+
+
+    #the key is an int in place or a string table id
+    @property
+    def package_id(self):
+        kind = _BYTE.unpack_from(self._store._buf, self._offset + _KIND)[0]
+        return self._store._record_key(self._offset, kind)
+
+    address = _string_field(_ADDRESS, "Delivery address.")
+    city = _string_field(_CITY, "Delivery city.")
+    state = _string_field(_STATE, "Delivery state.")
+    zip_code = _string_field(_ZIP, "Delivery ZIP code.")
+    notes = _string_field(_NOTES, "Special delivery notes.")
+    deadline = _field(_DEADLINE, _INT64, _decode_time, doc="Delivery deadline (time of day).")
+    weight = _field(_WEIGHT, _DOUBLE, _decode_weight, doc="Weight in kg.")
+    status = _field(_STATUS, _BYTE, _STATUSES.__getitem__, _STATUS_CODES.__getitem__, "PackageStatus.")
+    truck = _field(_TRUCK, _INT32, _decode_optional, _encode_optional, "Assigned truck, or None.")
+    address_id = _field(_ADDRESS_ID, _INT32, _decode_optional, _encode_optional,
+                        "Distance matrix id of the address, or None.")
+    departure_time = _field(_DEPARTURE, _INT64, _decode_datetime, _encode_datetime, "Time the package left the hub.")
+    delivery_time = _field(_DELIVERY, _INT64, _decode_datetime, _encode_datetime, "Time of delivery.")
+
+
+    #key used for distance lookups: the resolved address id, or the raw address if unresolved
+    @property
+    def location(self):
+        address_id = self.address_id
+        return address_id if address_id is not None else self.address
+
+
+    #copy the record into an ordinary (detached) Package
+    def to_package(self):
+        """
+        Builds a Package with this record's current values.
+        The Package is a private copy: changing it does not change shared memory.
+
+        Args:
+            None
+        Returns:
+            Package: A new Package not attached to any store.
+        """
+        package = Package(self.package_id, self.address, self.city, self.state, self.zip_code,
+                          self.deadline, self.weight, self.notes, self.truck)
+        package.status = self.status
+        package.departure_time = self.departure_time
+        package.delivery_time = self.delivery_time
+        package.address_id = self.address_id
+        return package
+
+
+    #print human-readable package data, formatted like Package
+    def __str__(self):
+        return (f"Package {self.package_id}: {self.status} | "
+            f"Deadline: {self.deadline}, Expected delivery: {self.delivery_time} | "
+            f"Truck: {self.truck}, Left hub: {self.departure_time} | "
+            f"Address: {self.address}, {self.city}, {self.state}, {self.zip_code}")
+
+
+class SharedPackageStore:
+    def __init__(self, shared, owner):
+        """
+        Wraps a shared memory block laid out as a package store.
+        Use `create` to build a store from packages and `attach` to open one by
+        name; a store passed to a worker process is pickled as its name and
+        re-attached there, so `pool.map(work, [store] * n)` copies no packages.
+
+        Lookups go through an open-addressing index of (key hash, record number)
+        slots and return a PackageView over the record, so no package is ever
+        copied or unpickled. The set of packages is fixed when the store is
+        created; the fixed-width fields of a package can be changed in place
+        through its view. Two processes changing the same package at once are
+        not coordinated.
+
+        Args:
+            shared (SharedMemory): The block holding the store.
+            owner (bool): Whether this process created the block and should unlink it.
+        Attributes:
+            name (str): Name of the shared memory block; pass it to `attach`.
+            size (int): The number of packages stored.
+            capacity (int): The number of index slots.
+        Returns:
+            None
+        Raises:
+            ValueError: If the block does not hold a package store.
+        """
+        self._shared = shared
+        self._owner = owner
+        self._buf = shared.buf
+        magic, version, self.size, self.capacity, string_count, string_bytes = _HEADER.unpack_from(self._buf)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            self._buf = None
+            shared.close()
+            raise ValueError(f"Shared memory block {shared.name!r} is not a version {FORMAT_VERSION} package store.")
+
+        self._records_start = _HEADER_SIZE
+        index_start = self._records_start + _aligned(self.size * _RECORD.size)
+        offsets_start = index_start + self.capacity * 16
+        self._strings_start = offsets_start + (string_count + 1) * 8
+        #sections are read with struct rather than cast memoryviews: a view left exported
+        #would stop the block from closing when a store is garbage collected without close()
+        self._index_start = index_start
+        self._offsets_start = offsets_start
+        self._mask = self.capacity - 1
+        self._shift = 64 - (self.capacity.bit_length() - 1)
+        self._strings = {}  #string id -> decoded str; addresses, cities and notes repeat, so decode each once
+
+
+    @property
+    def name(self):
+        return self._shared.name
+
+
+    #build a new store from packages
+    @classmethod
+    def create(cls, packages, name=None):
+        """
+        Copies packages into a new shared memory block.
+        Strings are interned: an address shared by a thousand packages is stored
+        once. The index gets a power-of-two number of slots, at least twice the
+        package count, so probe runs stay short.
+
+        Args:
+            packages (iterable): Package objects (or views), e.g. `hash_table.values()`.
+            name (str, optional): Name for the block. Defaults to a generated name.
+        Returns:
+            SharedPackageStore: The new store; this process owns it and should `unlink` it when done.
+        Raises:
+            ValueError: If two packages have the same id or an integer id does not fit in 64 bits.
+            TypeError: If a package id is not an int, str or bytes.
+        """
+        packages = list(packages)
+        strings = {}  #interned string -> id
+        blob = []
+
+        #intern a string (or bytes key) into the string table
+        def intern(value):
+            string_id = strings.get(value)
+            if string_id is None:
+                string_id = strings[value] = len(blob)
+                blob.append(value.encode("utf-8") if isinstance(value, str) else value)
+            return string_id
+
+        rows = []
+        for package in packages:
+            key = package.package_id
+            if isinstance(key, int):
+                if not -(1 << 63) <= key < (1 << 63):
+                    raise ValueError(f"Package id {key} does not fit in 64 bits.")
+                kind, stored_key = _INT_KEY, key
+            elif isinstance(key, (str, bytes)):
+                kind = _STR_KEY if isinstance(key, str) else _BYTES_KEY
+                stored_key = intern(key if kind == _STR_KEY else bytes(key))
+            else:
+                raise TypeError(f"Package ids must be int, str or bytes, not {type(key).__name__}.")
+            rows.append((key, _RECORD.pack(
+                stored_key, _encode_time(package.deadline), _encode_datetime(package.departure_time),
+                _encode_datetime(package.delivery_time), float(package.weight),
+                intern(package.address), intern(package.city), intern(package.state),
+                intern(str(package.zip_code)), intern(package.notes or ""),
+                _encode_optional(package.address_id), _encode_optional(package.truck),
+                _STATUS_CODES[package.status], kind)))
+
+        count = len(rows)
+        capacity = 1 << max(3, (2 * count).bit_length())
+        string_bytes = sum(map(len, blob))
+        records_start = _HEADER_SIZE
+        index_start = records_start + _aligned(count * _RECORD.size)
+        offsets_start = index_start + capacity * 16
+        strings_start = offsets_start + (len(blob) + 1) * 8
+
+        #start the resource tracker now, so worker processes share it instead of each
+        #starting one that would unlink the block when the worker exits
+        resource_tracker.ensure_running()
+        shared = shared_memory.SharedMemory(name=name, create=True, size=strings_start + max(string_bytes, 1))
+        try:
+            buf = shared.buf
+            _HEADER.pack_into(buf, 0, MAGIC, FORMAT_VERSION, count, capacity, len(blob), string_bytes)
+            for record, (_, packed) in enumerate(rows):
+                start = records_start + record * _RECORD.size
+                buf[start:start + _RECORD.size] = packed
+
+            position = 0
+            for string_id, raw in enumerate(blob):
+                _OFFSET.pack_into(buf, offsets_start + string_id * 8, position)
+                buf[strings_start + position:strings_start + position + len(raw)] = raw
+                position += len(raw)
+            _OFFSET.pack_into(buf, offsets_start + len(blob) * 8, position)
+
+            cls._build_index(buf, index_start, capacity, [key for key, _ in rows])
+            return cls(shared, owner=True)
+        except BaseException:
+            shared.close()
+            shared.unlink()
+            raise
+
+
+    #fill the index slots for keys stored in record order
+    @staticmethod
+    def _build_index(buf, index_start, capacity, keys):
+        """
+        Places every key in the index with linear probing.
+
+        Args:
+            buf (memoryview): The block's buffer.
+            index_start (int): Byte offset of the zeroed index slots.
+            capacity (int): The number of slots (a power of two).
+            keys (list): Package ids in record order.
+        Returns:
+            None
+        Raises:
+            ValueError: If a package id appears twice.
+        """
+        mask = capacity - 1
+        shift = 64 - (capacity.bit_length() - 1)
+        for record, key in enumerate(keys):
+            code = key_hash(key)
+            slot = code >> shift
+            while True:
+                stored_code, stored_record = _PAIR.unpack_from(buf, index_start + 16 * slot)
+                if not stored_record:
+                    break
+                if stored_code == code and keys[stored_record - 1] == key:
+                    raise ValueError(f"Package id {key!r} appears more than once.")
+                slot = (slot + 1) & mask
+            _PAIR.pack_into(buf, index_start + 16 * slot, code, record + 1)
+
+
+    #open a store another process created
+    @classmethod
+    def attach(cls, name):
+        """
+        Attaches to an existing store by the name of its shared memory block.
+        Nothing is copied: the packages are read from the shared block. Worker
+        processes started by the creating process share its resource tracker, so
+        the block outlives any worker; Python 3.13 and later also skip tracking
+        for an attached block, which makes attaching from an unrelated process safe.
+
+        Args:
+            name (str): The `name` of the store.
+        Returns:
+            SharedPackageStore: The attached store; `close` it when done, never `unlink`.
+        Raises:
+            FileNotFoundError: If no block has that name.
+            ValueError: If the block does not hold a package store.
+        """
+        try:
+            shared = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:  #Python before 3.13 has no track argument
+            shared = shared_memory.SharedMemory(name=name)
+        return cls(shared, owner=False)
+
+
+    #pickle as the block name, so a store passed to a worker process is attached there, not copied
+    def __reduce__(self):
+        return SharedPackageStore.attach, (self.name,)
+
+
+    #decode string table entry i
+    def _string(self, string_id):
+        value = self._strings.get(string_id)
+        if value is None:
+            value = self._strings[string_id] = self._raw_string(string_id).decode("utf-8")
+        return value
+
+
+    #bytes of string table entry i
+    def _raw_string(self, string_id):
+        start, end = _PAIR.unpack_from(self._buf, self._offsets_start + 8 * string_id)
+        return bytes(self._buf[self._strings_start + start:self._strings_start + end])
+
+
+    #the key of the record at a byte offset; tracking numbers are not cached (each is used once)
+    def _record_key(self, offset, kind):
+        stored = _INT64.unpack_from(self._buf, offset + _KEY)[0]
+        if kind == _INT_KEY:
+            return stored
+        raw = self._raw_string(stored)
+        return raw.decode("utf-8") if kind == _STR_KEY else raw
+
+
+    #probe the index for a key
+    def _find(self, key):
+        """
+        Follows the probe sequence of a key until the key or an empty slot is found.
+        A slot with the same hash is confirmed by comparing the record's key.
+
+        Args:
+            key (int, str or bytes): The key to find.
+        Returns:
+            int: The record number, or -1 if the key is not stored.
+        """
+        if not isinstance(key, (int, str, bytes)):
+            return -1
+        buf, index_start, mask = self._buf, self._index_start, self._mask
+        code = key_hash(key)
+        slot = code >> self._shift
+        while True:
+            stored_code, record = _PAIR.unpack_from(buf, index_start + 16 * slot)
+            if not record:
+                return -1
+            if stored_code == code:
+                offset = self._records_start + (record - 1) * _RECORD.size
+                if self._record_key(offset, _BYTE.unpack_from(self._buf, offset + _KIND)[0]) == key:
+                    return record - 1
+            slot = (slot + 1) & mask
+
+
+    # function to look up a package by package ID key
+    def lookup(self, key):
+        """
+        Retrieves a package by id without copying it.
+
+        Args:
+            key (int, str or bytes): The package id.
+        Returns:
+            PackageView: A view of the package's record, or None if the key does not exist.
+        """
+        record = self._find(key)
+        return None if record < 0 else PackageView(self, record)
+
+
+    #number of packages stored - len(store)
+    def __len__(self):
+        return self.size
+
+
+    #membership test - `key in store`
+    def __contains__(self, key):
+        return self._find(key) >= 0
+
+
+    #walk every package id - `for key in store`
+    def __iter__(self):
+        return (view.package_id for view in self.values())
+
+
+    #walk every package
+    def values(self):
+        """
+        Yields a view of every package, in record order (the order they were given to `create`).
+
+        Args:
+            None
+        Returns:
+            generator: PackageView objects.
+        """
+        return (PackageView(self, record) for record in range(self.size))
+
+
+    #walk every (package id, package) pair
+    def items(self):
+        """
+        Yields every (package id, view) pair, in record order.
+
+        Args:
+            None
+        Returns:
+            generator: (key, PackageView) tuples.
+        """
+        return ((view.package_id, view) for view in self.values())
+
+
+    #walk every (package id, package) pair in ascending key order
+    def ordered_items(self):
+        """
+        Yields every (package id, view) pair in ascending key order.
+
+        Args:
+            None
+        Returns:
+            generator: (key, PackageView) tuples, smallest key first.
+        """
+        yield from sorted(self.items(), key=lambda item: key_order(item[0]))
+
+
+    #detach this process from the block
+    def close(self):
+        """
+        Releases this process's mapping of the block. Views from this store must
+        not be used afterwards. The block itself lives on until `unlink`.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        if self._buf is None:
+            return
+        self._buf = None
+        self._shared.close()
+
+
+    #destroy the block (creator only), once every process is done with it
+    def unlink(self):
+        """
+        Closes the store and frees the shared memory block. Only the creating
+        process should call this; processes still attached keep their mapping
+        until they close it.
+
+        Args:
+            None
+        Returns:
+            None
+        """
+        self.close()
+        if self._owner:
+            self._shared.unlink()
+            self._owner = False
+
+
+    def __enter__(self):
+        return self
+
+
+    #the creator frees the block on exit, other processes only detach
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.unlink()
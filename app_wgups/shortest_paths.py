@@ -0,0 +1,242 @@
+#all-pairs shortest-path closure of the distance matrix (Floyd-Warshall)
+#the provided point-to-point distances do not always obey the triangle inequality, so driving
+#via an intermediate stop can be shorter than the listed direct distance
+#Sources for code: Python 3.9.21 documentation for hashlib found at https://docs.python.org/3.9/library/hashlib.html
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from app_wgups.distance_binary import load_distance_binary, write_distance_binary
+from app_wgups.distance_matrix import DistanceMatrix, load_distance_data, packed_index
+
+NO_PREDECESSOR = -1
+PREDECESSOR_ITEM_SIZE = array("i").itemsize  #cached predecessor tables are int32 entries
+CACHE_VERSION = 1  #part of every cache file name - bump it when the cached closure or its files change
+
+
+#distance matrix whose distances are shortest paths, with a predecessor table to recover via-stops
+class ShortestPathMatrix(DistanceMatrix):
+    def __init__(self, addresses, distances, predecessors, aliases=None):
+        """
+        Initializes a closed distance matrix.
+        Lookups behave exactly like DistanceMatrix, but every distance is the
+        shortest path between the two addresses, so routing code can use it unchanged.
+
+        Args:
+            addresses (list of str): The addresses of the matrix, in row/column order.
+            distances (sequence of float): Packed lower-triangle shortest-path distances.
+            predecessors (sequence of int): Dense row-major table, n * n entries. Entry
+                                            [i * n + j] is the stop visited just before j on
+                                            the shortest path from i to j, or -1 if none.
+            aliases (dict, optional): Extra address spellings mapped to an existing id.
+        Attributes:
+            predecessors (array): The predecessor table described above.
+        Returns:
+            None
+        """
+        super().__init__(addresses, distances, aliases)
+        self.predecessors = predecessors
+
+
+    #a closed matrix cannot be patched cell by cell - one change can shorten many other paths
+    def _ensure_writable(self):
+        raise TypeError("A ShortestPathMatrix cannot be changed in place; update the source "
+                        "DistanceMatrix and run shortest_path_closure again.")
+
+
+    #expand a single leg into every stop actually driven through
+    def path_by_id(self, from_id, to_id):
+        """
+        Rebuilds the shortest path between two address ids from the predecessor table.
+
+        Args:
+            from_id (int): The id of the starting address.
+            to_id (int): The id of the destination address.
+        Returns:
+            list of int: The ids on the path, including both endpoints,
+                         or an empty list if the destination is unreachable.
+        """
+        if from_id == to_id:
+            return [from_id]
+
+        path = [to_id]
+        while path[-1] != from_id:
+            previous = self.predecessors[from_id * self.size + path[-1]]
+            if previous == NO_PREDECESSOR or len(path) > self.size:
+                return []
+            path.append(previous)
+
+        path.reverse()
+        return path
+
+
+    #expand a leg between two addresses into its via-stops
+    def expand_route(self, from_address, to_address):
+        """
+        Returns the addresses driven through on the shortest path between two addresses.
+
+        Args:
+            from_address (int or str): The starting address id, or the address as written
+                                       anywhere in the input data.
+            to_address (int or str): The destination address id or address.
+        Returns:
+            list of str: The addresses on the path, including both endpoints,
+                         or an empty list if either address is unknown or unreachable.
+        """
+        from_id = self.location_id(from_address)
+        to_id = self.location_id(to_address)
+        if from_id is None or to_id is None or not (0 <= from_id < self.size and 0 <= to_id < self.size):
+            return []
+        return [self.addresses[address_id] for address_id in self.path_by_id(from_id, to_id)]
+
+
+#run Floyd-Warshall over a loaded matrix
+def shortest_path_closure(matrix):
+    """
+    Computes the all-pairs shortest-path closure of a distance matrix.
+    The matrix is expanded into dense rows, relaxed through every intermediate
+    stop k (Floyd-Warshall, O(n^3)), and packed back into lower-triangle storage.
+    Missing distances are treated as unreachable.
+
+    Args:
+        matrix (DistanceMatrix): The matrix of direct point-to-point distances.
+    Returns:
+        ShortestPathMatrix: The closed matrix with its predecessor table.
+    """
+    size = matrix.size
+    infinity = float("inf")
+
+    #dense working copy, one list per row so the inner loop stays on plain lists
+    rows = []
+    previous_rows = []
+    for i in range(size):
+        row = []
+        previous = []
+        for j in range(size):
+            distance = matrix.distance_by_id(i, j)
+            if distance is None:
+                row.append(infinity)
+                previous.append(NO_PREDECESSOR)
+            else:
+                row.append(distance)
+                previous.append(i if i != j else NO_PREDECESSOR)
+        rows.append(row)
+        previous_rows.append(previous)
+
+    for k in range(size):
+        row_k = rows[k]
+        previous_k = previous_rows[k]
+        for i in range(size):
+            row_i = rows[i]
+            distance_ik = row_i[k]
+            if distance_ik == infinity or i == k:
+                continue
+            previous_i = previous_rows[i]
+            for j in range(size):
+                candidate = distance_ik + row_k[j]
+                if candidate < row_i[j]:
+                    row_i[j] = candidate
+                    previous_i[j] = previous_k[j]
+
+    distances = array("d", [0.0]) * len(matrix.distances)
+    for i in range(size):
+        row_i = rows[i]
+        for j in range(i + 1):
+            distance = row_i[j]
+            distances[packed_index(i, j)] = distance if distance != infinity else float("nan")
+
+    predecessors = array("i", [NO_PREDECESSOR]) * (size * size)
+    for i in range(size):
+        predecessors[i * size:(i + 1) * size] = array("i", previous_rows[i])
+
+    return ShortestPathMatrix(matrix.addresses, distances, predecessors, matrix.aliases())
+
+
+#fingerprint the input file so cached closures are reused only for identical data
+def _file_digest(path):
+    """
+    Computes the SHA-256 hex digest of a file.
+
+    Args:
+        path (str): The file to hash.
+    Returns:
+        str: The hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as data_file:
+        for block in iter(lambda: data_file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+#write the predecessor table as little-endian int32, atomically
+def _write_predecessors(predecessors, path):
+    data = array("i", predecessors)
+    if sys.byteorder == "big":  #file data is always little-endian
+        data.byteswap()
+
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as predecessor_file:
+        data.tofile(predecessor_file)
+        predecessor_file.flush()
+        os.fsync(predecessor_file.fileno())
+    os.replace(temporary_path, path)
+
+
+#map a cached predecessor table written by _write_predecessors
+def _load_predecessors(path):
+    with open(path, "rb") as predecessor_file:
+        mapped = mmap.mmap(predecessor_file.fileno(), 0, access=mmap.ACCESS_READ)
+    predecessors = memoryview(mapped).cast("i")
+    if sys.byteorder == "big":  #no zero-copy on big-endian hosts - swap into a private array
+        predecessors = array("i", predecessors)
+        predecessors.byteswap()
+    return predecessors
+
+
+#load the distance matrix and close it, reusing a cached closure when the input is unchanged
+def load_shortest_path_matrix(csv_path, cache_dir=None):
+    """
+    Loads a distance matrix and returns its shortest-path closure.
+    The closure is cached next to the input (in a `.cache` folder by default),
+    keyed by a SHA-256 hash of the input file and CACHE_VERSION. When the cache
+    is present the closed distances and predecessor table are memory-mapped
+    instead of recomputed; cache files that are unreadable or the wrong size
+    are recomputed and replaced.
+
+    Args:
+        csv_path (str): The file path to the CSV (or compiled .wgdm) distance matrix.
+        cache_dir (str, optional): Folder for cached closures. Defaults to a `.cache`
+                                   folder beside `csv_path`.
+    Returns:
+        ShortestPathMatrix: The closed distance matrix.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), ".cache")
+    cache_key = os.path.join(cache_dir, f"{_file_digest(csv_path)}.v{CACHE_VERSION}")
+    matrix_path = cache_key + ".closure.wgdm"
+    predecessor_path = cache_key + ".closure.pred"
+
+    if os.path.exists(matrix_path) and os.path.exists(predecessor_path):
+        try:
+            cached = load_distance_binary(matrix_path)
+        except (ValueError, struct.error):  #corrupt or truncated - recompute below
+            cached = None
+        if cached is not None and os.path.getsize(predecessor_path) == cached.size * cached.size * PREDECESSOR_ITEM_SIZE:
+            return ShortestPathMatrix(cached.addresses, cached.distances,
+                                      _load_predecessors(predecessor_path), cached.aliases())
+
+    closed = shortest_path_closure(load_distance_data(csv_path))
+
+    #write each file under a temporary name and rename it into place, predecessors last,
+    #so an interrupted run never leaves a half-written cache that looks complete
+    os.makedirs(cache_dir, exist_ok=True)
+    write_distance_binary(closed, matrix_path + ".tmp")
+    os.replace(matrix_path + ".tmp", matrix_path)
+    _write_predecessors(closed.predecessors, predecessor_path)
+
+    return closed
@@ -0,0 +1,309 @@
+#coordinate-based spatial index (uniform grid) over address latitudes/longitudes
+#answers nearest-address and radius queries, and estimates distances the matrix is missing
+#Sources for code: Python 3.9.21 documentation for math and array found at
+#https://docs.python.org/3.9/library/math.html and https://docs.python.org/3.9/library/array.html
+#and the haversine formula as described at https://en.wikipedia.org/wiki/Haversine_formula
+
+import csv
+import math
+from array import array
+
+from app_wgups.distance_matrix import canonicalize_address
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE = math.pi * EARTH_RADIUS_MILES / 180  #north-south miles per degree of latitude
+DEFAULT_CELL_MILES = 0.5
+DEFAULT_CIRCUITY = 1.3  #typical ratio of road distance to straight-line distance in a city grid
+
+
+#great-circle distance between two coordinates
+def haversine_miles(lat1, lon1, lat2, lon2):
+    """
+    Computes the straight-line (great-circle) distance between two coordinates.
+
+    Args:
+        lat1 (float): Latitude of the first point in degrees.
+        lon1 (float): Longitude of the first point in degrees.
+        lat2 (float): Latitude of the second point in degrees.
+        lon2 (float): Longitude of the second point in degrees.
+    Returns:
+        float: The distance in miles.
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    half_dphi = (phi2 - phi1) / 2
+    half_dlambda = math.radians(lon2 - lon1) / 2
+    a = math.sin(half_dphi) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(half_dlambda) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
+
+
+#load address coordinates from a local CSV file
+def load_coordinates(csv_path):
+    """
+    Loads address coordinates from a CSV with a header row followed by
+    address, latitude, longitude rows.
+
+    Args:
+        csv_path (str): The file path to the coordinates CSV.
+    Returns:
+        dict: Maps each address to a (latitude, longitude) tuple.
+    Raises:
+        FileNotFoundError: If the coordinates file does not exist.
+        ValueError: If a row has a missing or invalid coordinate.
+    """
+    coordinates = {}
+    with open(csv_path, mode="r", encoding="utf-8-sig") as coordinates_file:
+        reader = csv.reader(coordinates_file)
+        next(reader, None)  #skip header row
+
+        for row in reader:
+            if not row or len(row) < 3:   #handle broken data
+                continue
+            address = row[0].strip()
+            try:
+                latitude, longitude = float(row[1]), float(row[2])
+            except ValueError:
+                raise ValueError(f"{csv_path}:{reader.line_num}: invalid coordinates "
+                                 f"{row[1]!r}, {row[2]!r} for {address}") from None
+            if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+                raise ValueError(f"{csv_path}:{reader.line_num}: coordinates out of range for {address}")
+            coordinates[address] = (latitude, longitude)
+    return coordinates
+
+
+class SpatialIndex:
+    def __init__(self, coordinates, cell_miles=DEFAULT_CELL_MILES):
+        """
+        Builds a uniform grid over address coordinates.
+        Coordinates are projected onto a flat plane around the mean latitude
+        (accurate to well under 1% across a city) and bucketed into square cells
+        of `cell_miles`; a query only visits the rings of cells around its own cell
+        that can still hold a closer point. Reported distances are haversine miles.
+
+        Args:
+            coordinates (dict): Maps each address to a (latitude, longitude) tuple.
+            cell_miles (float, optional): Width of a grid cell in miles. Defaults to 0.5.
+        Attributes:
+            addresses (list of str): The indexed addresses, in point-id order.
+            latitudes (array): Latitude of each point.
+            longitudes (array): Longitude of each point.
+        Returns:
+            None
+        """
+        self.cell_miles = cell_miles
+        self.addresses = list(coordinates)
+        self.latitudes = array("d", (coordinates[address][0] for address in self.addresses))
+        self.longitudes = array("d", (coordinates[address][1] for address in self.addresses))
+        self.point_ids = {canonicalize_address(address): point_id for point_id, address in enumerate(self.addresses)}
+
+        mean_latitude = sum(self.latitudes) / len(self.latitudes) if self.addresses else 0.0
+        self._x_miles = MILES_PER_DEGREE * math.cos(math.radians(mean_latitude))
+
+        self._cells = {}  #(column, row) -> list of point ids
+        for point_id in range(len(self.addresses)):
+            cell = self._cell(self.latitudes[point_id], self.longitudes[point_id])
+            self._cells.setdefault(cell, []).append(point_id)
+        columns = [column for column, _ in self._cells] or [0]
+        rows = [row for _, row in self._cells] or [0]
+        self._columns = (min(columns), max(columns))  #occupied extent - searches never go past it
+        self._rows = (min(rows), max(rows))
+
+
+    #grid cell holding a coordinate
+    def _cell(self, latitude, longitude):
+        return (math.floor(longitude * self._x_miles / self.cell_miles),
+                math.floor(latitude * MILES_PER_DEGREE / self.cell_miles))
+
+
+    #point ids in the square ring of cells at Chebyshev distance `ring` around a cell
+    def _ring(self, center, ring):
+        column, row = center
+        if ring == 0:
+            yield from self._cells.get(center, ())
+            return
+        for offset in range(-ring, ring + 1):
+            for cell in ((column + offset, row - ring), (column + offset, row + ring)):
+                yield from self._cells.get(cell, ())
+        for offset in range(-ring + 1, ring):
+            for cell in ((column - ring, row + offset), (column + ring, row + offset)):
+                yield from self._cells.get(cell, ())
+
+
+    #coordinates of an indexed address (any spelling)
+    def coordinates(self, address):
+        """
+        Returns the coordinates of an address, matched by its canonical form.
+
+        Args:
+            address (str): The address to look up.
+        Returns:
+            tuple or None: (latitude, longitude), or None if the address has no coordinates.
+        """
+        point_id = self.point_ids.get(canonicalize_address(address))
+        if point_id is None:
+            return None
+        return self.latitudes[point_id], self.longitudes[point_id]
+
+
+    #k nearest indexed addresses to a coordinate
+    def nearest(self, latitude, longitude, k=1, accept=None):
+        """
+        Finds the k indexed addresses closest to a coordinate.
+        Rings of cells are searched outward until the next ring cannot hold a
+        point closer than the k-th best found so far.
+
+        Args:
+            latitude (float): Query latitude.
+            longitude (float): Query longitude.
+            k (int, optional): Number of addresses to return. Defaults to 1.
+            accept (callable, optional): Only points for which accept(point_id) is true
+                                         are considered. Defaults to every point.
+        Returns:
+            list of tuple: (address, miles) pairs, nearest first.
+        """
+        center = self._cell(latitude, longitude)
+        max_ring = max(abs(center[0] - self._columns[0]), abs(center[0] - self._columns[1]),
+                       abs(center[1] - self._rows[0]), abs(center[1] - self._rows[1]))
+        found = []
+        for ring in range(max_ring + 1):
+            #every point in this ring is at least (ring - 1) cells away from the query
+            if len(found) >= k and (ring - 1) * self.cell_miles * 0.99 > found[k - 1][0]:
+                break
+            for point_id in self._ring(center, ring):
+                if accept is None or accept(point_id):
+                    miles = haversine_miles(latitude, longitude, self.latitudes[point_id], self.longitudes[point_id])
+                    found.append((miles, point_id))
+            found.sort()
+        return [(self.addresses[point_id], miles) for miles, point_id in found[:k]]
+
+
+    #every indexed address within a radius (for clustering nearby stops)
+    def within_radius(self, latitude, longitude, miles):
+        """
+        Finds every indexed address within `miles` of a coordinate.
+
+        Args:
+            latitude (float): Query latitude.
+            longitude (float): Query longitude.
+            miles (float): The search radius in miles.
+        Returns:
+            list of tuple: (address, miles) pairs, nearest first.
+        """
+        center = self._cell(latitude, longitude)
+        rings = math.ceil(miles * 1.01 / self.cell_miles) + 1  #small margin for the flat projection
+        found = []
+        for ring in range(rings + 1):
+            for point_id in self._ring(center, ring):
+                distance = haversine_miles(latitude, longitude, self.latitudes[point_id], self.longitudes[point_id])
+                if distance <= miles:
+                    found.append((distance, point_id))
+        found.sort()
+        return [(self.addresses[point_id], distance) for distance, point_id in found]
+
+
+    def __len__(self):
+        return len(self.addresses)
+
+
+#fills the gaps of a distance matrix with coordinate-based estimates
+class DistanceEstimator:
+    def __init__(self, distance_matrix, spatial_index, circuity=DEFAULT_CIRCUITY):
+        """
+        Estimates distances the matrix cannot answer, from address coordinates.
+        A pair of known addresses with a missing cell is estimated as the
+        straight-line distance times `circuity`. An address that is not in the
+        matrix is first connected to its nearest known address (by coordinates),
+        so most of the leg still uses the matrix's real road distance.
+
+        Args:
+            distance_matrix (DistanceMatrix): The matrix being completed.
+            spatial_index (SpatialIndex): Coordinates for matrix and non-matrix addresses.
+            circuity (float, optional): Road miles per straight-line mile. Defaults to 1.3.
+        Attributes:
+            estimates (int): Number of distances estimated so far.
+        Returns:
+            None
+        """
+        self.distance_matrix = distance_matrix
+        self.spatial_index = spatial_index
+        self.circuity = circuity
+        self.estimates = 0
+        self._matrix_ids = None
+        self._matrix_version = None
+
+
+    #matrix id of every indexed point (-1 if not in the matrix), rebuilt after matrix changes
+    def _point_matrix_ids(self):
+        version = getattr(self.distance_matrix, "version", 0)
+        if self._matrix_ids is None or version != self._matrix_version:
+            removed = getattr(self.distance_matrix, "removed_ids", ())
+            matrix_ids = array("i", [-1]) * len(self.spatial_index)
+            for point_id, address in enumerate(self.spatial_index.addresses):
+                matrix_id = self.distance_matrix.resolve(address)
+                if matrix_id is not None and matrix_id not in removed:
+                    matrix_ids[point_id] = matrix_id
+            self._matrix_ids, self._matrix_version = matrix_ids, version
+        return self._matrix_ids
+
+
+    #coordinates of a location given as a matrix id or an address string
+    def _coordinates(self, location):
+        if type(location) is int:
+            location = self.distance_matrix.addresses[location]
+        return self.spatial_index.coordinates(location)
+
+
+    #nearest address that the matrix knows
+    def nearest_known(self, location):
+        """
+        Finds the matrix address closest to a location by coordinates.
+
+        Args:
+            location (int or str): An address id or address with known coordinates.
+        Returns:
+            tuple: (address id, straight-line miles), or (None, None) if the location
+                   has no coordinates or no matrix address has coordinates.
+        """
+        coordinates = self._coordinates(location)
+        if coordinates is None:
+            return None, None
+        matrix_ids = self._point_matrix_ids()
+        nearest = self.spatial_index.nearest(*coordinates, accept=lambda point_id: matrix_ids[point_id] >= 0)
+        if not nearest:
+            return None, None
+        address, miles = nearest[0]
+        return self.distance_matrix.resolve(address), miles
+
+
+    #estimated road distance between two locations
+    def estimate(self, from_location, to_location):
+        """
+        Estimates the road distance between two locations.
+
+        Args:
+            from_location (int or str): The starting address id or address.
+            to_location (int or str): The destination address id or address.
+        Returns:
+            float or None: The estimated distance in miles, or None if a location
+                           without a matrix entry also has no coordinates.
+        """
+        from_id = self.distance_matrix.location_id(from_location)
+        to_id = self.distance_matrix.location_id(to_location)
+        if from_id is not None and from_id == to_id:
+            return 0.0
+
+        #one side unknown to the matrix: drive to its nearest known address, then use the matrix
+        if (from_id is None) != (to_id is None):
+            unknown, known_id = (from_location, to_id) if from_id is None else (to_location, from_id)
+            anchor_id, anchor_miles = self.nearest_known(unknown)
+            if anchor_id is not None:
+                road_miles = self.distance_matrix.distance_by_id(anchor_id, known_id)
+                if road_miles is not None:
+                    self.estimates += 1
+                    return anchor_miles * self.circuity + road_miles
+
+        from_coordinates = self._coordinates(from_location if from_id is None else from_id)
+        to_coordinates = self._coordinates(to_location if to_id is None else to_id)
+        if from_coordinates is None or to_coordinates is None:
+            return None
+        self.estimates += 1
+        return haversine_miles(*from_coordinates, *to_coordinates) * self.circuity
@@ -0,0 +1,208 @@
+#time-of-day travel-time slices: one base travel-time array shared by every slice,
+#plus a speed multiplier per time band and optional per-leg delay arrays
+#sources used when building this code: Python datetime documentation at https://docs.python.org/3.9/library/datetime.html
+#and Python 3.9.21 documentation for array found at https://docs.python.org/3.9/library/array.html
+
+from array import array
+from datetime import datetime, timedelta
+
+from app_wgups.distance_matrix import packed_index
+
+MINUTES_PER_DAY = 24 * 60
+
+#example profile for the simulation day: slower traffic in the morning and evening rush hours
+RUSH_HOUR_BANDS = [("00:00", 1.0), ("07:00", 1.35), ("09:00", 1.0), ("16:00", 1.4), ("18:30", 1.0)]
+
+
+#minute of the day for a "HH:MM" string, datetime or time
+def minute_of_day(moment):
+    """
+    Converts a time of day into minutes since midnight.
+
+    Args:
+        moment (str, datetime or time): "HH:MM" string or a datetime/time object.
+    Returns:
+        int: Minutes since midnight (0-1439).
+    """
+    if isinstance(moment, str):
+        moment = datetime.strptime(moment, "%H:%M")
+    return moment.hour * 60 + moment.minute
+
+
+class TravelTimeSlices:
+    def __init__(self, distance_matrix, speed, bands, interpolate=False):
+        """
+        Builds time-of-day travel-time slices on top of a distance matrix.
+        Slices are not stored as full matrices: every slice shares the matrix's base
+        travel-time array at `speed` (see `DistanceMatrix.travel_seconds`) and adds only
+        a multiplier, plus a per-leg delay array for slices given one with `add_delay`.
+        A table with one entry per minute of the day maps a departure time to its
+        slice (and interpolation weight), so every lookup is O(1).
+
+        Args:
+            distance_matrix (DistanceMatrix): The matrix the travel times are based on.
+            speed (float): Free-flow travel speed in miles per hour.
+            bands (list of tuple): (start, multiplier) pairs, start as "HH:MM" or a time;
+                                   a band runs until the next start, and the last band
+                                   wraps around midnight to the first.
+            interpolate (bool, optional): Blend linearly from each band's times to the next
+                                          band's instead of switching at the boundary.
+                                          Defaults to False.
+        Attributes:
+            starts (array): Start minute of each slice, ascending.
+            multipliers (array): Travel-time multiplier of each slice (1.0 = free flow).
+        Returns:
+            None
+        Raises:
+            ValueError: If no bands are given, a start repeats, or a multiplier is not positive.
+        """
+        if not bands:
+            raise ValueError("At least one time band is required.")
+        bands = sorted((minute_of_day(start), float(multiplier)) for start, multiplier in bands)
+        starts = [start for start, _ in bands]
+        if len(set(starts)) != len(starts):
+            raise ValueError("Time bands must have distinct start times.")
+        if any(multiplier <= 0 for _, multiplier in bands):
+            raise ValueError("Time band multipliers must be positive.")
+
+        self.distance_matrix = distance_matrix
+        self.speed = speed
+        self.interpolate = interpolate
+        self.starts = array("l", starts)
+        self.multipliers = array("d", [multiplier for _, multiplier in bands])
+        self._deltas = {}  #slice index -> packed array of extra seconds per leg, created on first delay
+
+        #per-minute lookup tables: slice index and the weight of the following slice
+        self._minute_slice = array("H", [0]) * MINUTES_PER_DAY
+        self._minute_weight = array("d", [0.0]) * MINUTES_PER_DAY
+        count = len(starts)
+        for minute in range(MINUTES_PER_DAY):
+            current = count - 1  #before the first start the last band is still in effect
+            for index, start in enumerate(starts):
+                if start <= minute:
+                    current = index
+            self._minute_slice[minute] = current
+            if interpolate and count > 1:
+                begin = starts[current]
+                end = starts[(current + 1) % count]
+                length = (end - begin) % MINUTES_PER_DAY or MINUTES_PER_DAY
+                self._minute_weight[minute] = ((minute - begin) % MINUTES_PER_DAY) / length
+
+        #the matrix keeps this array current on in-place changes, so the slices never go stale
+        self._base = distance_matrix.travel_seconds(speed)
+        distance_matrix.subscribe(self.on_matrix_change)
+
+
+    #matrix change notification: grow the delay arrays with the matrix
+    def on_matrix_change(self, distance_matrix, event, address_ids):
+        """
+        Keeps the per-leg delay arrays the same length as the packed matrix.
+        New legs start without a delay; the base travel times are refreshed by
+        the matrix itself.
+
+        Args:
+            distance_matrix (DistanceMatrix): The matrix that changed.
+            event (str): "add", "update" or "remove".
+            address_ids (list of int): The ids whose distances changed.
+        Returns:
+            None
+        """
+        for deltas in self._deltas.values():
+            missing = len(distance_matrix.distances) - len(deltas)
+            if missing > 0:
+                deltas.extend(array("l", [0]) * missing)
+
+
+    #extra delay on one leg during one slice (e.g. a known bottleneck at rush hour)
+    def add_delay(self, slice_index, from_address, to_address, seconds):
+        """
+        Adds a fixed delay to one leg during one slice, on top of its multiplier.
+
+        Args:
+            slice_index (int): The slice the delay applies to (index into `starts`).
+            from_address (int or str): One address id or address.
+            to_address (int or str): The other address id or address.
+            seconds (int): Extra seconds added to the leg's travel time.
+        Returns:
+            None
+        Raises:
+            ValueError: If either address is unknown.
+        """
+        from_id = self.distance_matrix.location_id(from_address)
+        to_id = self.distance_matrix.location_id(to_address)
+        if from_id is None or to_id is None:
+            raise ValueError(f"Unknown address in delay: {from_address!r} → {to_address!r}.")
+        deltas = self._deltas.get(slice_index)
+        if deltas is None:
+            deltas = self._deltas[slice_index] = array("l", [0]) * len(self.distance_matrix.distances)
+        deltas[packed_index(from_id, to_id)] += int(seconds)
+
+
+    #slice in effect at a departure time
+    def slice_at(self, depart_time):
+        """
+        Returns the slice and interpolation weight for a departure time in O(1).
+
+        Args:
+            depart_time (str, datetime or time): The departure time.
+        Returns:
+            tuple: (slice index, weight of the next slice); the weight is 0.0 unless
+                   interpolation is enabled.
+        """
+        minute = minute_of_day(depart_time)
+        return self._minute_slice[minute], self._minute_weight[minute]
+
+
+    #travel time of one slice for a packed cell
+    def _slice_seconds(self, slice_index, index, base):
+        seconds = base * self.multipliers[slice_index]
+        deltas = self._deltas.get(slice_index)
+        if deltas is not None:
+            seconds += deltas[index]
+        return seconds
+
+
+    #O(1) travel-time lookup for a departure time
+    def travel_seconds(self, from_address, to_address, depart_time):
+        """
+        Retrieves the travel time between two addresses when leaving at `depart_time`.
+
+        Args:
+            from_address (int or str): The starting address id or address.
+            to_address (int or str): The destination address id or address.
+            depart_time (str, datetime or time): The departure time.
+        Returns:
+            int or None: The travel time in seconds, or None if the distance is unknown.
+        """
+        from_id = self.distance_matrix.location_id(from_address)
+        to_id = self.distance_matrix.location_id(to_address)
+        if from_id is None or to_id is None:
+            return None
+
+        index = packed_index(from_id, to_id)
+        base = self._base[index]
+        if base < 0:
+            return None
+
+        slice_index, weight = self.slice_at(depart_time)
+        seconds = self._slice_seconds(slice_index, index, base)
+        if weight:
+            following = (slice_index + 1) % len(self.starts)
+            seconds += weight * (self._slice_seconds(following, index, base) - seconds)
+        return round(seconds)
+
+
+    #same lookup as a timedelta, ready to add to a truck's clock
+    def travel_time(self, from_address, to_address, depart_time):
+        """
+        Retrieves the travel time between two addresses when leaving at `depart_time`.
+
+        Args:
+            from_address (int or str): The starting address id or address.
+            to_address (int or str): The destination address id or address.
+            depart_time (str, datetime or time): The departure time.
+        Returns:
+            timedelta or None: The travel time, or None if the distance is unknown.
+        """
+        seconds = self.travel_seconds(from_address, to_address, depart_time)
+        return None if seconds is None else timedelta(seconds=seconds)
@@ -24,9 +24,14 @@ class Truck:
             truck_id (int): Unique identifier for the truck.
             capacity (int): Maximum number of packages the truck can carry.
             speed (float): Speed of the truck in miles per hour.
+            traffic (TravelTimeSlices or None): Optional time-of-day travel times; when set,
+                                                leg times depend on the departure time
+                                                (default: None, constant speed).
             distance_traveled (float): Total miles traveled by the truck.
             departure_time (datetime or None): The time the truck departs from the hub.
             current_location (str): The truck's current location (default: "hub").
+            current_stop (int or str): Distance lookup key for the current location -
+                                       the resolved address id once the truck has moved.
             current_time (datetime or None): The current simulation time for the truck.
             manifest (list): List of packages assigned to the truck.
             return_time (datetime or None): The time the truck returns to the hub.
@@ -39,9 +44,11 @@ class Truck:
         self.truck_id = truck_id
         self.capacity = 16
         self.speed = 18.0  #mph
+        self.traffic = None  #TravelTimeSlices for time-of-day travel times (off by default)
         self.distance_traveled = 0.0
         self.departure_time = None
         self.current_location = "hub"
+        self.current_stop = "hub"
         self.current_time = None
         self.manifest = []
         self.return_time = None
@@ -84,8 +91,8 @@ class Truck:
 
         #update status of all packages to EN_ROUTE, update package departure time
         for package in self.manifest:
-            package.update_status(PackageStatus.EN_ROUTE)
-            package.update_departure_time(departure_time)
+            package.update_status(PackageStatus.EN_ROUTE, at=departure_time)
+            package.update_departure_time(departure_time, at=departure_time)
 
         return self.manifest
 
@@ -99,7 +106,7 @@ class Truck:
         a log entry is recorded and no optimization is performed.
 
         Args:
-            distance_matrix (dict): A nested dictionary representing distance
+            distance_matrix (DistanceMatrix): The indexed matrix of distance
                                     values between delivery locations.
         Returns:
             list: The optimized list of Package objects, reordered for delivery efficiency.
@@ -134,7 +141,7 @@ class Truck:
 
         Args:
             package (Package): The package to be delivered.
-            distance_matrix (dict): A nested dictionary representing distance
+            distance_matrix (DistanceMatrix): The indexed matrix of distance
                                     values between delivery locations.
         Returns:
             datetime: The expected delivery time for the package, or None
@@ -145,21 +152,21 @@ class Truck:
             raise ValueError(f"Truck {self.truck_id} has no current location set!")
 
         #handle cases where truck is already at proper location to deliver
-        if self.current_location == package.address:
-            package.update_delivery_time(self.current_time)
+        if self.current_stop == package.location:
+            package.update_delivery_time(self.current_time, at=self.current_time)
             return package.delivery_time
 
         else:  #normal delivery (truck had to move to get here)
-            distance = get_distance(distance_matrix, self.current_location, package.address)
+            distance = get_distance(distance_matrix, self.current_stop, package.location)
 
             if distance is None:  #error handling for a missing address pair on adjacency matrix
                 logging.error(f"ERROR Distance from {self.current_location} to {package.address} not found in matrix for package {package.package_id}")
                 return None
 
             #delivery time for packages is calculated based on distance between points and truck speed
-            travel_time = timedelta(minutes=(distance / self.speed) * 60)
+            travel_time = self.travel_time(distance_matrix, self.current_stop, package.location, distance)
             delivery_time = self.current_time + travel_time
-            package.update_delivery_time(delivery_time)  #update package details
+            package.update_delivery_time(delivery_time, at=delivery_time)  #update package details
 
             #issue warning if package will be LATE
             if package.deadline != "23:59":
@@ -171,6 +178,37 @@ class Truck:
             return delivery_time
 
 
+    #helper method to convert a leg into driving time, using the matrix's integer travel-time cache
+    def travel_time(self, distance_matrix, from_location, to_location, distance):
+        """
+        Returns the driving time for one leg leaving at the truck's current time.
+        With time-of-day slices set on `traffic`, the slice for the current time
+        gives the leg time. Otherwise the leg is driven at this truck's constant
+        speed: when the matrix provides precomputed travel seconds (see
+        `DistanceMatrix.travel_seconds`), the cached integer value is used;
+        otherwise the time is computed from the distance.
+
+        Args:
+            distance_matrix (DistanceMatrix): The distance matrix used for routing.
+            from_location (int or str): The starting address id or address.
+            to_location (int or str): The destination address id or address.
+            distance (float): The leg distance in miles, used when no cache is available.
+        Returns:
+            timedelta: The driving time for the leg.
+        """
+        if self.traffic is not None:
+            leg_time = self.traffic.travel_time(from_location, to_location, self.current_time)
+            if leg_time is not None:
+                return leg_time
+
+        get_travel_seconds = getattr(distance_matrix, "get_travel_seconds", None)
+        if get_travel_seconds is not None:
+            seconds = get_travel_seconds(from_location, to_location, self.speed)
+            if seconds is not None:
+                return timedelta(seconds=seconds)
+        return timedelta(minutes=(distance / self.speed) * 60)
+
+
     #method to "deliver" package by updating package status & delivery time, move from truck manifest to log
     def deliver_package(self, package, distance_matrix):
         """
@@ -187,7 +225,7 @@ class Truck:
 
         Args:
             package (Package): The package object to be delivered.
-            distance_matrix (dict): The distance matrix used to calculate travel distances.
+            distance_matrix (DistanceMatrix): The distance matrix used to calculate travel distances.
         Returns:
             None: Modifies package and truck attributes in place.
         """
@@ -209,18 +247,18 @@ class Truck:
               f"Status: {package.status}, Delivery Time: {package.delivery_time}")
 
         # Update package status & delivery time, update truck delivery time log
-        package.update_status(PackageStatus.DELIVERED)
-        package.update_delivery_time(delivery_time)
+        package.update_status(PackageStatus.DELIVERED, at=delivery_time)
+        package.update_delivery_time(delivery_time, at=delivery_time)
         self.current_time = delivery_time  # Update truck's "current time"
 
         # Handle deliveries at the same location (truck did not move)
-        if self.current_location == package.address:
+        if self.current_stop == package.location:
             logging.info(f"Package {package.package_id} is already at {package.address}. Delivered instantly!")
 
         # else normal delivery location updates
         else:
             # Calculate movement and update truck location variables
-            distance = get_distance(distance_matrix, self.current_location, package.address)
+            distance = get_distance(distance_matrix, self.current_stop, package.location)
 
             #FOR TESTING & DEBUGGING
             # Get distance from current location to package destination
@@ -231,6 +269,7 @@ class Truck:
 
             self.distance_traveled += distance  # Track total miles traveled at this point on route
             self.current_location = package.address  # Truck location set to this address ahead of next move
+            self.current_stop = package.location
 
         # FOR TESTING Ensure package has a valid delivery time
         if package.delivery_time is None:  # Still None? Try to force re-calculation
@@ -265,14 +304,14 @@ class Truck:
         the total distance traveled and the number of packages delivered.
 
         Args:
-            distance_matrix (dict): The distance matrix used to calculate distances
+            distance_matrix (DistanceMatrix): The distance matrix used to calculate distances
                                     between locations.
         Returns:
             datetime: The time the truck returns to the hub.
         """
         if not self.manifest:  #if manifest is empty
-            distance_to_hub = get_distance(distance_matrix, self.current_location, "hub")                             # calculate distance from last stop to hub
-            travel_time = timedelta(minutes=(distance_to_hub / self.speed) * 60)
+            distance_to_hub = get_distance(distance_matrix, self.current_stop, "hub")                             # calculate distance from last stop to hub
+            travel_time = self.travel_time(distance_matrix, self.current_stop, "hub", distance_to_hub)
             self.return_time = self.current_time + travel_time  # add that time to overall accumulated time
 
             #FOR TESTING
@@ -296,7 +335,7 @@ class Truck:
         Args:
             truck1 (Truck): The first delivery truck.
             truck2 (Truck): The second delivery truck.
-            distance_matrix (dict): The distance matrix used to calculate travel times.
+            distance_matrix (DistanceMatrix): The distance matrix used to calculate travel times.
         Returns:
             datetime: The calculated departure time for Truck 3.
         """
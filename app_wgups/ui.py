@@ -5,13 +5,13 @@ import sys
 
 from app_wgups import package
 from app_wgups.distance_matrix import load_distance_data
-from app_wgups.hash_table import HashTable
+from app_wgups.package_store import PackageStore
 from app_wgups.package import Package
 from app_wgups.status import PackageStatus
 from app_wgups.truck import Truck
 
 #INITIALIZE GLOBAL VARIABLES
-package_hash = HashTable()
+package_hash = PackageStore()
 distance_matrix = None
 trucks = []
 
@@ -43,21 +43,21 @@ def user_interface(package_hash, trucks):
         """
         Prompts the user to enter a valid package ID and validates the input.
 
-        This function requests a package ID from the user. It ensures the input is
-        a numeric value and converts it to an integer. If the input is invalid,
-        an error message is displayed, and None is returned.
+        This function requests a package ID from the user. Numeric input becomes an
+        integer id; other alphanumeric input is treated as a tracking number. If the
+        input is invalid, an error message is displayed, and None is returned.
 
         Args:
             None
 
         Returns:
-            int or None: The package ID as an integer if valid, or None if the input is invalid.
+            int, str or None: The package ID (or tracking number) if valid, or None if the input is invalid.
         """
-        package_id = input("\nEnter Package ID#: ").strip()
-        if not package_id.isdigit():
-            print("ERROR: Package ID must be a number.")
+        try:
+            return Package.parse_package_id(input("\nEnter Package ID#: "))
+        except ValueError:
+            print("ERROR: Package ID must be a number or a tracking number.")
             return None
-        return int(package_id)
 
     def get_valid_time():
         """
@@ -239,6 +239,37 @@ def get_package_status_at_time(package, parsed_time):
     return status
 
 
+#helper function - a package as it was at a specific time, with its status then
+def package_at_time(hash_table, package, parsed_time):
+    """
+    Rebuilds a package as it was at a specific time.
+
+    A PackageStore keeps every timed change (status, truck, address, departure and
+    delivery times), so the package is rebuilt from its history and any field that
+    changed during the day is shown as it was - e.g. package 9's address before
+    its 10:20 correction. A plain hash table keeps no history: the status is then
+    worked out from the departure and delivery times and the current address is used.
+
+    Args:
+        hash_table (HashTable or PackageStore): The table holding the package.
+        package (Package): The current package.
+        parsed_time (datetime): The time to check.
+
+    Returns:
+        tuple: (Package as it was at the time, status string "AT HUB", "EN ROUTE" or "DELIVERED")
+    """
+    if isinstance(hash_table, PackageStore):
+        past = hash_table.lookup(package.package_id, as_of=parsed_time)
+        return past, past.status.value.upper()
+    return package, get_package_status_at_time(package, parsed_time)
+
+
+#helper function - display an address as it was at a time, flagging one that was later corrected
+def address_at_time(past, package):
+    address = past.address.strip()
+    return f"{address} (Incorrect)" if past.address != package.address else address
+
+
 #for Task 2 directions, part B: LOOKUP FUNCTION by PACKAGE ID
 #helper function - lookup single package by id
 def lookup_and_print_package_by_ID(package_id, hash_table, parsed_time):
@@ -249,14 +280,14 @@ def lookup_and_print_package_by_ID(package_id, hash_table, parsed_time):
     determines its status at the specified time, and prints relevant package details.
 
     Args:
-        package_id (int): The unique ID of the package to look up.
+        package_id (int or str): The unique ID (or tracking number) of the package to look up.
         hash_table (HashTable): The hash table containing package data.
         parsed_time (datetime): The time at which to check the package status.
 
     Returns:
         None: The function prints the package details to the console.
     """
-    package = hash_table.lookup(int(package_id))
+    package = hash_table.lookup(package_id)
     if not package:
         return
 
@@ -264,18 +295,16 @@ def lookup_and_print_package_by_ID(package_id, hash_table, parsed_time):
         print(f"Package with ID {package_id} not found")
         return
 
-    #package9 has wrong address till 10:20am
-    status = get_package_status_at_time(package, parsed_time)
-    address = "300 State St (Incorrect)" if (package.package_id == 9
-            and parsed_time < datetime.strptime("10:20", "%H:%M")) \
-            else package.address
+    #status and address as they were at that time (e.g. package 9's wrong address before 10:20)
+    past, status = package_at_time(hash_table, package, parsed_time)
+    address = address_at_time(past, package)
 
     #print to screen
     print(f"\nPackage {package_id} Status at {parsed_time.strftime('%H:%M')}")
     print("------------------------------------------------")
     print(f"Status: {colorize_output(status)}")
-    print(f"\nDelivery Full Address: {address}, {package.city}, {package.state}, {package.zip_code}")
-    print(f"\nDelivery by Truck: {package.truck} |  Package Weight: {package.weight}")
+    print(f"\nDelivery Full Address: {address}, {past.city}, {past.state}, {past.zip_code}")
+    print(f"\nDelivery by Truck: {past.truck} |  Package Weight: {package.weight}")
     print(f"\nDelivery Deadline: {package.deadline.strftime('%H:%M') if package.deadline else 'EOD'}")
     print(f"\nDelivery Time: {package.delivery_time.strftime('%H:%M') if package.delivery_time else 'In Transit'}")
     print("------------------------------------------------\n")
@@ -311,27 +340,23 @@ def display_all_package_statuses(hash_table, trucks, check_time):
     total_miles = sum(truck.distance_traveled for truck in trucks)
     package_status_list = []
 
-    for bucket in hash_table.table:
-        for _, pkg in bucket:
-            status = get_package_status_at_time(pkg, parsed_time)
-            address = "300 State St (Incorrect)" if (pkg.package_id == 9
-                and parsed_time < datetime.strptime("10:20","%H:%M")) else pkg.address
-            if status == "DELIVERED":
-                delivery_time = pkg.delivery_time.strftime('%H:%M')
-                delivery_time_label = "Delivered"
-            else:
-                delivery_time = pkg.deadline.strftime('%H:%M')
-                delivery_time_label = "Anticipated Delivery"
-            truck_number = pkg.truck
-            status_colored = colorize_output(status)
-
-            package_status_list.append((
-                pkg.package_id,
-                f"Package {pkg.package_id}: {status_colored} on Truck {truck_number}; "
-                f"{delivery_time_label}: {delivery_time} | Deadline: {pkg.deadline.strftime('%H:%M')} | Address: {address}"
-            ))
-
-    package_status_list.sort(key=lambda x: x[0] )
+    for _, pkg in hash_table.ordered_items():  #ascending package id
+        past, status = package_at_time(hash_table, pkg, parsed_time)
+        address = address_at_time(past, pkg)
+        if status == "DELIVERED":
+            delivery_time = pkg.delivery_time.strftime('%H:%M')
+            delivery_time_label = "Delivered"
+        else:
+            delivery_time = pkg.deadline.strftime('%H:%M')
+            delivery_time_label = "Anticipated Delivery"
+        truck_number = past.truck
+        status_colored = colorize_output(status)
+
+        package_status_list.append((
+            pkg.package_id,
+            f"Package {pkg.package_id}: {status_colored} on Truck {truck_number}; "
+            f"{delivery_time_label}: {delivery_time} | Deadline: {pkg.deadline.strftime('%H:%M')} | Address: {address}"
+        ))
 
     for _, package_info in package_status_list:
         print(package_info)
@@ -363,6 +388,7 @@ def reset_day(package_hash, trucks):
         truck.delivery_log.clear()
         truck.distance_traveled = 0.0
         truck.current_location = "hub"
+        truck.current_stop = "hub"
         truck.current_time = None
         truck.return_time = None
 
@@ -0,0 +1,121 @@
+#benchmark: lock contention of ConcurrentHashTable vs a HashTable behind one global lock
+#dispatcher-style workload: every thread mixes lookups with status updates of random packages
+#usage: python benchmarks/concurrent_hash_table_benchmark.py [--threads 1 2 4 8 16] [--packages 100000] [--ops 400000] [--writes 0.1]
+#Sources for code: Python 3.9.21 documentation for threading.Thread and threading.Barrier found at
+#https://docs.python.org/3.9/library/threading.html
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+#run from anywhere: make the project root importable
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app_wgups.concurrent_hash_table import ConcurrentHashTable
+from app_wgups.hash_table import HashTable
+
+DEFAULT_THREADS = [1, 2, 4, 8, 16]
+STATUSES = ("AT_HUB", "EN_ROUTE", "DELIVERED")
+
+
+#baseline: the plain HashTable with every operation behind one lock
+class GlobalLockHashTable:
+    def __init__(self):
+        self.table = HashTable()
+        self.lock = threading.Lock()
+
+    def insert(self, key, value):
+        with self.lock:
+            self.table.insert(key, value)
+
+    def lookup(self, key):
+        with self.lock:
+            return self.table.lookup(key)
+
+    def update(self, key, value):
+        with self.lock:
+            return self.table.update(key, value)
+
+
+#one thread's share of the workload
+def worker(table, keys, operations, write_ratio, seed, barrier):
+    """
+    Runs `operations` random lookups and updates against a shared table.
+
+    Args:
+        table (ConcurrentHashTable or GlobalLockHashTable): The shared table.
+        keys (list of int): Package ids present in the table.
+        operations (int): Operations this thread performs.
+        write_ratio (float): Fraction of operations that are updates.
+        seed (int): Seed for this thread's random choices.
+        barrier (threading.Barrier): Lines every thread up before the clock starts.
+    Returns:
+        None
+    """
+    rng = random.Random(seed)
+    picks = [(rng.choice(keys), rng.random() < write_ratio) for _ in range(operations)]
+    lookup, update = table.lookup, table.update
+    barrier.wait()
+    for key, write in picks:
+        if write:
+            update(key, STATUSES[key % 3])
+        else:
+            lookup(key)
+
+
+#throughput of one table at one thread count
+def run(table_class, keys, threads, operations, write_ratio):
+    """
+    Fills a table and times `operations` mixed operations split across `threads` threads.
+
+    Args:
+        table_class (type): ConcurrentHashTable or GlobalLockHashTable.
+        keys (list of int): Package ids to insert.
+        threads (int): Number of worker threads.
+        operations (int): Total operations across all threads.
+        write_ratio (float): Fraction of operations that are updates.
+    Returns:
+        float: Operations per second.
+    """
+    table = table_class()
+    for key in keys:
+        table.insert(key, "AT_HUB")
+
+    barrier = threading.Barrier(threads + 1)
+    share = operations // threads
+    pool = [threading.Thread(target=worker, args=(table, keys, share, write_ratio, seed, barrier))
+            for seed in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()  #every worker has built its picks; start timing together
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return share * threads / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure hash table throughput from 1 to 16 threads.")
+    parser.add_argument("--threads", type=int, nargs="+", default=DEFAULT_THREADS, help="thread counts to test")
+    parser.add_argument("--packages", type=int, default=100_000, help="packages in the table")
+    parser.add_argument("--ops", type=int, default=400_000, help="operations per run, split across the threads")
+    parser.add_argument("--writes", type=float, default=0.1, help="fraction of operations that are updates")
+    args = parser.parse_args(argv)
+
+    keys = list(range(1, args.packages + 1))
+    gil = "enabled" if getattr(sys, "_is_gil_enabled", lambda: True)() else "disabled"
+    print(f"Python {sys.version.split()[0]}, GIL {gil}, {os.cpu_count()} CPUs, "
+          f"{args.packages} packages, {args.writes:.0%} updates")
+    print(f"{'threads':>8} {'table':<22} {'ops/s':>12}")
+    for threads in args.threads:
+        for table_class in (GlobalLockHashTable, ConcurrentHashTable):
+            ops_per_second = run(table_class, keys, threads, args.ops, args.writes)
+            print(f"{threads:>8} {table_class.__name__:<22} {ops_per_second:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#benchmark: DiskHashTable bulk import, reopen after a restart, and lookup latency at millions of packages
+#usage: python benchmarks/disk_store_benchmark.py [--packages 2000000] [--lookups 100000] [--directory PATH] [--keep]
+#Sources for code: Python 3.9.21 documentation for tempfile and time.perf_counter found at
+#https://docs.python.org/3.9/library/tempfile.html and https://docs.python.org/3.9/library/time.html
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+#run from anywhere: make the project root importable
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app_wgups.disk_store import DiskHashTable
+from app_wgups.package import Package
+
+STREETS = ("195 W Oakland Ave", "2530 S 500 E", "233 Canyon Rd", "380 W 2880 S", "410 S State St")
+DEADLINES = ("EOD", "10:30 AM", "9:00 AM")
+
+
+#synthetic packages in the shape of the CSV rows
+def generate_packages(count):
+    rng = random.Random(42)
+    for package_id in range(1, count + 1):
+        yield package_id, Package(package_id, rng.choice(STREETS), "Salt Lake City", "UT", "84115",
+                                  rng.choice(DEADLINES), str(rng.randint(1, 99)))
+
+
+#time one call
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure DiskHashTable import, reopen and lookup times.")
+    parser.add_argument("--packages", type=int, default=2_000_000, help="packages to import")
+    parser.add_argument("--lookups", type=int, default=100_000, help="random lookups to time after reopening")
+    parser.add_argument("--directory", help="store folder (default: a temporary folder)")
+    parser.add_argument("--keep", action="store_true", help="keep the store files afterwards")
+    args = parser.parse_args(argv)
+
+    directory = args.directory or tempfile.mkdtemp(prefix="wgups_store_")
+    try:
+        store = DiskHashTable(directory)
+        count, import_seconds = timed(store.bulk_load, generate_packages(args.packages), unique_keys=True)
+        store.close()
+        sizes = {name: os.path.getsize(os.path.join(directory, name)) for name in sorted(os.listdir(directory))}
+        print(f"import   {count:,} packages in {import_seconds:.2f} s "
+              f"({', '.join(f'{name} {size / 2**20:,.0f} MB' for name, size in sizes.items())})")
+
+        store, open_seconds = timed(DiskHashTable, directory)
+        print(f"reopen   {len(store):,} packages in {open_seconds * 1000:.1f} ms")
+
+        rng = random.Random(7)
+        keys = [rng.randint(1, args.packages) for _ in range(args.lookups)]
+        _, lookup_seconds = timed(lambda: [store.lookup(key) for key in keys])
+        print(f"lookup   {lookup_seconds / args.lookups * 1e6:.1f} us each ({args.lookups:,} random ids)")
+
+        updates = keys[:10_000]
+        _, update_seconds = timed(lambda: [store.update(key, store.lookup(key)) for key in updates])
+        store.close()
+        print(f"update   {update_seconds / len(updates) * 1e6:.1f} us each, lookup included "
+              f"(fsync every {store.sync_every} records)")
+
+        store, reopen_seconds = timed(DiskHashTable, directory)
+        print(f"reopen   {reopen_seconds * 1000:.1f} ms after the updates")
+        store.close()
+    finally:
+        if not args.keep and not args.directory:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#benchmark: chaining HashTable vs open-addressing OpenAddressHashTable
+#reports insert time, lookup latency (hits and misses) and table memory per entry
+#usage: python benchmarks/hash_table_benchmark.py [--sizes 10000 1000000 10000000] [--lookups 200000] [--keys int|tracking] [--stats] [--concurrent]
+#Sources for code: Python 3.9.21 documentation for time.perf_counter and sys.getsizeof found at
+#https://docs.python.org/3.9/library/time.html and https://docs.python.org/3.9/library/sys.html
+
+import argparse
+import os
+import random
+import sys
+import time
+
+#run from anywhere: make the project root importable
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app_wgups.concurrent_hash_table import ConcurrentHashTable
+from app_wgups.hash_table import HashTable
+from app_wgups.open_addressing import OpenAddressHashTable
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+PACKAGE = object()  #every entry shares one value, so only the table's own memory is measured
+
+
+#UPS-style tracking number for a sequential id: "1Z", 6-character shipper, 2-digit service, 8-digit serial
+def tracking_number(package_id):
+    return f"1Z{package_id % 997:06X}{package_id % 3:02d}{package_id:08d}"
+
+
+#bytes the table structure itself occupies (keys included, shared value excluded)
+def table_bytes(table):
+    """
+    Adds up the memory of a table's internal containers and keys.
+    Small ints are cached by CPython and are not counted.
+
+    Args:
+        table (HashTable or OpenAddressHashTable): A filled table.
+    Returns:
+        int: Size in bytes.
+    """
+    if isinstance(table, OpenAddressHashTable):
+        total = sum(map(sys.getsizeof, (table.slot_keys, table.slot_hashes, table.states, table.slot_values)))
+        return total + sum(sys.getsizeof(key) for key in table if not (type(key) is int and -5 <= key <= 256))
+
+    total = sys.getsizeof(table.table)
+    for bucket in table.table:
+        total += sys.getsizeof(bucket)
+        for entry in bucket:
+            total += sys.getsizeof(entry) + sys.getsizeof(entry[2])  #entry tuple and its cached hash
+            if not (type(entry[0]) is int and -5 <= entry[0] <= 256):
+                total += sys.getsizeof(entry[0])
+    return total
+
+
+#time one table implementation at one size
+def run(table_class, keys, probes, misses, track_stats=False):
+    """
+    Fills a table with `keys`, then times lookups of present and absent keys.
+    With `track_stats` the lookups are counted, so the timings include the
+    instrumentation overhead and the table's `stats()` is returned as well.
+
+    Args:
+        table_class (type): HashTable or OpenAddressHashTable.
+        keys (list of int): Keys to insert.
+        probes (list of int): Present keys to look up.
+        misses (list of int): Absent keys to look up.
+        track_stats (bool, optional): Build the table with lookup counting on. Defaults to False.
+    Returns:
+        dict: Insert seconds, lookup nanoseconds (hit and miss), bytes per entry and the table's stats.
+    """
+    table = table_class(track_stats=track_stats)
+    start = time.perf_counter()
+    for key in keys:
+        table.insert(key, PACKAGE)
+    insert_seconds = time.perf_counter() - start
+
+    lookup = table.lookup
+    start = time.perf_counter()
+    for key in probes:
+        lookup(key)
+    hit_ns = (time.perf_counter() - start) / len(probes) * 1e9
+
+    start = time.perf_counter()
+    for key in misses:
+        lookup(key)
+    miss_ns = (time.perf_counter() - start) / len(misses) * 1e9
+
+    return {"insert_s": insert_seconds, "hit_ns": hit_ns, "miss_ns": miss_ns,
+            "bytes_per_entry": table_bytes(table) / len(keys), "capacity": table.capacity,
+            "stats": table.stats()}
+
+
+#one line summarizing a table's stats()
+def stats_line(stats):
+    histogram = stats.get("bucket_histogram") or stats.get("probe_histogram")
+    per_lookup = stats.get("comparisons_per_lookup") or stats.get("probes_per_lookup")
+    longest = stats.get("longest_bucket", stats.get("longest_probe"))
+    shown = ", ".join(f"{length}: {count}" for length, count in list(histogram.items())[:6])
+    return (f"{'':>10}   load {stats['load_factor']:.2f}, longest {longest}, {per_lookup:.2f} compared per lookup, "
+            f"{stats['resizes']} resizes in {stats['rehash_seconds']:.2f} s, lengths {{{shown}}}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the chaining and open-addressing hash tables.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="package counts to test")
+    parser.add_argument("--lookups", type=int, default=200_000, help="timed lookups per size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--keys", choices=("int", "tracking"), default="int",
+                        help="integer package ids or string tracking numbers")
+    parser.add_argument("--stats", action="store_true",
+                        help="count lookups and print each table's stats() (timings include the counting)")
+    parser.add_argument("--concurrent", action="store_true", help="also measure ConcurrentHashTable (single thread)")
+    args = parser.parse_args(argv)
+    tables = (HashTable, OpenAddressHashTable)
+    if args.concurrent:
+        tables += (ConcurrentHashTable,)
+
+    rng = random.Random(args.seed)
+    print(f"{'packages':>10} {'table':<22} {'insert s':>9} {'hit ns':>8} {'miss ns':>8} {'B/entry':>8} {'capacity':>10}")
+    for size in args.sizes:
+        keys = list(range(1, size + 1))  #package ids are sequential
+        rng.shuffle(keys)
+        probes = [rng.randint(1, size) for _ in range(args.lookups)]
+        misses = [rng.randint(size + 1, 2 * size + 1) for _ in range(args.lookups)]
+        if args.keys == "tracking":
+            keys, probes, misses = ([tracking_number(key) for key in batch] for batch in (keys, probes, misses))
+
+        for table_class in tables:
+            result = run(table_class, keys, probes, misses, args.stats)
+            print(f"{size:>10} {table_class.__name__:<22} {result['insert_s']:>9.2f} {result['hit_ns']:>8.0f} "
+                  f"{result['miss_ns']:>8.0f} {result['bytes_per_entry']:>8.1f} {result['capacity']:>10}")
+            if args.stats:
+                print(stats_line(result["stats"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#benchmark: memory of N worker processes reading every package from one SharedPackageStore
+#each worker attaches by name, reads every package through its view and reports how much memory it
+#holds privately; for comparison one worker is sent a pickled copy of the packages instead
+#usage: python benchmarks/shared_store_benchmark.py [--packages 1000000] [--workers 32]
+#Sources for code: Python 3.9.21 documentation for multiprocessing.Pool found at
+#https://docs.python.org/3.9/library/multiprocessing.html and the Linux /proc/<pid>/smaps_rollup
+#description at https://www.kernel.org/doc/html/latest/filesystems/proc.html
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import time as time_of_day
+from multiprocessing import Pool
+
+#run from anywhere: make the project root importable
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from app_wgups.package import Package
+from app_wgups.shared_store import SharedPackageStore
+
+STREETS = ("195 W Oakland Ave", "2530 S 500 E", "233 Canyon Rd", "380 W 2880 S", "410 S State St")
+DEADLINES = (time_of_day(9, 0), time_of_day(10, 30), time_of_day(16, 59))
+
+
+#synthetic packages in the shape of the CSV rows
+def generate_packages(count):
+    rng = random.Random(42)
+    return [Package(package_id, rng.choice(STREETS), "Salt Lake City", "UT", "84115",
+                    rng.choice(DEADLINES), rng.randint(1, 99)) for package_id in range(1, count + 1)]
+
+
+#memory of this process in kB from /proc (Linux only): resident, proportional and private
+def memory_kb():
+    fields = {}
+    with open("/proc/self/smaps_rollup") as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) >= 2 and parts[1].isdigit():
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return fields["Rss"], fields["Pss"], fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+
+
+#one worker: read every package of the store it was handed, then report its memory
+def read_all(store):
+    """
+    Touches every package through a zero-copy view (as a routing worker would)
+    and measures this process's memory afterwards.
+
+    Args:
+        store (SharedPackageStore): The store, re-attached by name in this process.
+    Returns:
+        tuple: (total weight, rss kB, pss kB, private kB, seconds).
+    """
+    start = time.perf_counter()
+    total = 0
+    for key in range(1, len(store) + 1):
+        view = store.lookup(key)
+        total += view.weight if view.deadline.hour < 17 else 0
+    seconds = time.perf_counter() - start
+    rss, pss, private = memory_kb()
+    store.close()
+    return (total,) + (rss, pss, private, seconds)
+
+
+#baseline worker: the packages arrive as a pickled copy, as with a plain HashTable
+def read_copy(packages_by_id):
+    total = sum(package.weight for package in packages_by_id.values() if package.deadline.hour < 17)
+    return total, memory_kb()[2]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure worker memory with a shared-memory package store.")
+    parser.add_argument("--packages", type=int, default=1_000_000, help="packages in the store")
+    parser.add_argument("--workers", type=int, default=32, help="worker processes")
+    args = parser.parse_args(argv)
+
+    packages = generate_packages(args.packages)
+    with Pool(1) as pool:  #before the store exists, so the copy worker does not inherit it
+        _, copy_private = pool.apply(read_copy, ({package.package_id: package for package in packages},))
+    start = time.perf_counter()
+    store = SharedPackageStore.create(packages)
+    create_seconds = time.perf_counter() - start
+    block = store._shared.size
+    del packages
+
+    print(f"{args.packages:,} packages: shared block {block / 2**20:,.1f} MB (built in {create_seconds:.1f} s); "
+          f"a worker sent a pickled copy holds {copy_private / 1024:,.1f} MB privately")
+    try:
+        with Pool(args.workers) as pool:
+            results = pool.map(read_all, [store] * args.workers, chunksize=1)
+    finally:
+        store.unlink()
+
+    rss = [result[1] for result in results]
+    pss = [result[2] for result in results]
+    private = [result[3] for result in results]
+    seconds = [result[4] for result in results]
+    print(f"{args.workers} workers, each read all packages in {sum(seconds) / len(seconds):.1f} s on average")
+    print(f"per worker  rss {max(rss) / 1024:,.1f} MB max, private {max(private) / 1024:,.1f} MB max, "
+          f"pss {sum(pss) / len(pss) / 1024:,.1f} MB avg")
+    print(f"all workers pss {sum(pss) / 1024:,.1f} MB total "
+          f"(pickled copies: about {args.workers * copy_private / 1024:,.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
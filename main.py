@@ -6,8 +6,9 @@ from datetime import datetime
 import os
 import logging
 from app_wgups.distance_matrix import load_distance_data
-from app_wgups.hash_table import HashTable
+from app_wgups.package_store import PackageStore
 from app_wgups.package import Package
+from app_wgups.spatial_index import DistanceEstimator, SpatialIndex, load_coordinates
 from app_wgups.truck import Truck
 from app_wgups.ui import user_interface
 
@@ -42,9 +43,9 @@ def load_all_data():
     Args:
         None
     Returns:
-        tuple: (HashTable, dict, list) containing:
-            - package_hash (HashTable): A hash table storing all package data.
-            - distance_matrix (dict): The distance matrix used for routing.
+        tuple: (PackageStore, dict, list) containing:
+            - package_hash (PackageStore): A hash table storing all package data, with secondary indexes.
+            - distance_matrix (DistanceMatrix): The distance matrix used for routing.
             - trucks (list of Truck): The initialized trucks with assigned delivery manifests.
     """
     global package_hash, distance_matrix, trucks
@@ -54,18 +55,28 @@ def load_all_data():
     DATA_DIR = os.path.join(PROJECT_ROOT, "data")
     CSV_FILE_PATH_PACKAGES = os.path.join(DATA_DIR, "packages_data.csv")
     CSV_FILE_PATH_DISTANCES = os.path.join(DATA_DIR, "distance_matrix.csv")
+    CSV_FILE_PATH_COORDINATES = os.path.join(DATA_DIR, "address_coordinates.csv")  #optional
 
     # Debug logging
     logging.info(f"Looking for data in: {DATA_DIR}")
     logging.info(f"Checking: {CSV_FILE_PATH_DISTANCES}")
 
     # Load package data into hash table
-    package_hash = HashTable()
+    package_hash = PackageStore()
     Package.load_package_data(CSV_FILE_PATH_PACKAGES, package_hash)
 
     # Load distance matrix for use in calculating NN algo
     distance_matrix = load_distance_data(CSV_FILE_PATH_DISTANCES)
 
+    # Optional address coordinates: estimate distances for addresses missing from the matrix
+    if os.path.exists(CSV_FILE_PATH_COORDINATES):
+        spatial_index = SpatialIndex(load_coordinates(CSV_FILE_PATH_COORDINATES))
+        distance_matrix.estimator = DistanceEstimator(distance_matrix, spatial_index)
+        logging.info(f"Loaded coordinates for {len(spatial_index)} addresses from {CSV_FILE_PATH_COORDINATES}")
+
+    # Resolve every package address to its matrix id once, so routing never matches strings
+    Package.resolve_address_ids(package_hash, distance_matrix)
+
     # Initialize first 2 Trucks
     trucks = [Truck(1), Truck(2)]
 
@@ -97,8 +108,8 @@ def run_delivery_simulation():
     Args:
         None
     Returns:
-        tuple: (HashTable, list) containing:
-            - package_hash (HashTable): The hash table storing package data.
+        tuple: (PackageStore, list) containing:
+            - package_hash (PackageStore): The hash table storing package data.
             - trucks (list of Truck): The list of all trucks after deliveries are completed.
     """
     package_hash, distance_matrix, trucks = load_all_data()
@@ -134,7 +145,8 @@ def run_delivery_simulation():
 
     #HANDLING KNOWN ISSUE: Correct Package 9’s address at 10:20 AM when info is available
     package_9 = package_hash.lookup(9)
-    package_9.update_address("410 S State St", "Salt Lake City", "UT", "84111")
+    package_9.update_address("410 S State St", "Salt Lake City", "UT", "84111", distance_matrix,
+                             at=datetime.strptime("10:20", "%H:%M"))
     logging.info(f"\n**Package 9 Address Updated: {package_9.address}")
 
     # Optimize Truck 3’s route
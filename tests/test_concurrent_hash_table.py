@@ -0,0 +1,55 @@
+#tests for ConcurrentHashTable: HashTable compatibility (stats included) and concurrent writers
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import threading
+import unittest
+
+from app_wgups.concurrent_hash_table import ConcurrentHashTable
+from app_wgups.hash_table import HashTable
+
+
+class ConcurrentHashTableTest(unittest.TestCase):
+    #the attributes and methods HashTable callers rely on
+    def test_stats_api_matches_hash_table(self):
+        table = ConcurrentHashTable(track_stats=True)
+        for key in range(200):
+            table.insert(key, key)
+        for key in range(300):
+            table.lookup(key)
+
+        stats = table.stats()
+        self.assertEqual(set(stats), set(HashTable().stats()))
+        self.assertEqual(table.size, 200)
+        self.assertEqual((stats["hits"], stats["misses"]), (200, 100))
+        self.assertEqual(stats["longest_bucket"], table.longest_bucket)
+        self.assertEqual(sum(stats["bucket_histogram"].values()), table.capacity)
+        self.assertGreater(stats["resizes"], 0)
+        table.reset_stats()
+        self.assertEqual((table.hits, table.resizes), (0, 0))
+
+    def test_concurrent_writers_lose_nothing(self):
+        table = ConcurrentHashTable()
+
+        #each thread owns a range of keys: insert all, update all, delete the odd ones
+        def work(first):
+            keys = range(first, first + 2000)
+            for key in keys:
+                table.insert(key, "new")
+            for key in keys:
+                self.assertTrue(table.update(key, first))
+            for key in keys[1::2]:
+                self.assertTrue(table.delete(key))
+
+        threads = [threading.Thread(target=work, args=(first,)) for first in range(0, 16000, 2000)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        expected = {key: key - key % 2000 for key in range(0, 16000, 2)}
+        self.assertEqual(len(table), len(expected))
+        self.assertEqual(dict(table.items()), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+#tests for the disk-backed DiskHashTable: checkpoints, reopening and crash recovery
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from app_wgups.disk_store import LOG_NAME, DiskHashTable
+
+
+class DiskHashTableTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="wgups_disk_test_")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    #reopen the store as a restarted process would
+    def reopen(self, table, **options):
+        table.close()
+        return DiskHashTable(self.directory, **options)
+
+    #a crash: the process dies without close() (synced records survive)
+    def crash(self, table):
+        table.sync()
+        table._unmap_index()
+        table._log.close()
+
+    def assert_contents(self, table, expected):
+        self.assertEqual(len(table), len(expected))
+        self.assertEqual(dict(table.items()), expected)
+        for key, value in expected.items():
+            self.assertEqual(table.lookup(key), value)
+
+    #rebuilding the index at the same capacity must keep the entries of the old index
+    def test_rebuild_at_same_capacity_keeps_entries(self):
+        table = DiskHashTable(self.directory)
+        for key in range(30):
+            table.insert(key, f"package {key}")
+        table.checkpoint()
+        self.assertEqual(table.capacity, 64)
+        for key in range(100, 120):
+            table.insert(key, "temporary")
+        for key in range(100, 120):
+            table.delete(key)
+        table.checkpoint()  #deleted slots push the load over the limit: rebuilt, still 64 slots
+
+        expected = {key: f"package {key}" for key in range(30)}
+        self.assert_contents(table, expected)
+        self.assert_contents(self.reopen(table), expected)
+
+    #a rebuild sized from the live count must not carry over keys deleted since the last checkpoint
+    def test_rebuild_after_mass_delete_drops_deleted_keys(self):
+        table = DiskHashTable(self.directory)
+        table.bulk_load([(key, key) for key in range(1000)], unique_keys=True)
+        table.checkpoint()
+        for key in range(990):
+            table.delete(key)
+        table.checkpoint()
+        self.assertLess(table.capacity, 1000)
+
+        expected = {key: key for key in range(990, 1000)}
+        self.assert_contents(table, expected)
+        self.assert_contents(self.reopen(table), expected)
+
+    def test_random_operations_match_dict_across_checkpoints_and_reopens(self):
+        rng = random.Random(7)
+        options = {"sync_every": 50, "checkpoint_every": 300}
+        table = DiskHashTable(self.directory, **options)
+        expected = {}
+        for step in range(6000):
+            key = rng.choice([rng.randrange(2000), f"1Z{rng.randrange(500):08d}", b"raw%d" % rng.randrange(50)])
+            roll = rng.random()
+            if roll < 0.55:
+                table.insert(key, step)
+                expected[key] = step
+            elif roll < 0.75:
+                self.assertEqual(table.update(key, -step), key in expected)
+                if key in expected:
+                    expected[key] = -step
+            else:
+                self.assertEqual(table.delete(key), expected.pop(key, None) is not None)
+            if step % 1500 == 0:
+                table = self.reopen(table, **options)
+        self.assert_contents(table, expected)
+        self.assert_contents(self.reopen(table), expected)
+
+    def test_crash_replays_records_after_the_checkpoint(self):
+        table = DiskHashTable(self.directory, checkpoint_every=100)
+        expected = {key: key * 2 for key in range(250)}
+        for key, value in expected.items():
+            table.insert(key, value)
+        self.crash(table)
+        self.assert_contents(DiskHashTable(self.directory), expected)
+
+    def test_torn_last_record_is_discarded(self):
+        table = DiskHashTable(self.directory)
+        for key in range(10):
+            table.insert(key, key)
+        self.crash(table)
+        with open(os.path.join(self.directory, LOG_NAME), "r+b") as log_file:
+            log_file.seek(-3, os.SEEK_END)
+            log_file.truncate()
+
+        with self.assertLogs(level="WARNING"):
+            table = DiskHashTable(self.directory)
+        self.assert_contents(table, {key: key for key in range(9)})
+        table.insert(9, "again")  #appends cleanly after the cut
+        self.assertEqual(self.reopen(table).lookup(9), "again")
+
+    def test_corrupted_last_record_is_discarded(self):
+        table = DiskHashTable(self.directory)
+        table.insert(1, "one")
+        table.insert(2, "two")
+        self.crash(table)
+        with open(os.path.join(self.directory, LOG_NAME), "r+b") as log_file:
+            log_file.seek(-1, os.SEEK_END)
+            log_file.write(b"\xff")
+
+        with self.assertLogs(level="WARNING"):
+            table = DiskHashTable(self.directory)
+        self.assert_contents(table, {1: "one"})
+        table.close()
+
+    def test_compact_and_clear(self):
+        table = DiskHashTable(self.directory)
+        table.bulk_load([(key, key) for key in range(200)], unique_keys=True)
+        for key in range(0, 200, 2):
+            table.delete(key)
+        self.assertGreater(table.compact(), 0)
+        expected = {key: key for key in range(1, 200, 2)}
+        self.assert_contents(table, expected)
+        table = self.reopen(table)
+        self.assert_contents(table, expected)
+
+        table.clear()
+        self.assert_contents(table, {})
+        table.insert("1Z00000001", "after clear")
+        self.assert_contents(self.reopen(table), {"1Z00000001": "after clear"})
+
+
+if __name__ == "__main__":
+    unittest.main()
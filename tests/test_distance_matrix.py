@@ -0,0 +1,38 @@
+#tests for in-place DistanceMatrix changes: bad and removed address ids are rejected
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import unittest
+
+from app_wgups.distance_matrix import DistanceMatrix, packed_size
+
+
+class DistanceMatrixUpdateTest(unittest.TestCase):
+    def setUp(self):
+        addresses = ["hub", "100 North Main Street", "200 South State Street"]
+        self.matrix = DistanceMatrix(addresses, [float(index) for index in range(packed_size(3))])
+
+    def test_out_of_range_ids_raise_value_error(self):
+        for bad_id in (3, 99, -1):
+            with self.assertRaises(ValueError):
+                self.matrix.update_distance(bad_id, 0, 1.0)
+            with self.assertRaises(ValueError):
+                self.matrix.remove_address(bad_id)
+            with self.assertRaises(ValueError):
+                self.matrix.add_address("300 East Center Street", {bad_id: 1.0})
+        self.assertEqual(self.matrix.version, 0)
+
+    #a removed address stays removed: its cells are not silently brought back
+    def test_removed_address_cannot_be_updated_or_removed_again(self):
+        removed_id = self.matrix.remove_address("100 North Main Street")
+        with self.assertRaises(ValueError):
+            self.matrix.update_distance(removed_id, 0, 2.5)
+        with self.assertRaises(ValueError):
+            self.matrix.remove_address(removed_id)
+        self.assertIsNone(self.matrix.distance_by_id(removed_id, 0))
+
+        self.matrix.update_distance("hub", 2, 2.5)
+        self.assertEqual(self.matrix.get_distance(0, "200 South State Street"), 2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
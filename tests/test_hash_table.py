@@ -0,0 +1,114 @@
+#tests for the hash tables: stats() instrumentation, bulk loads and key types
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import unittest
+from datetime import time
+
+from app_wgups.hash_table import HashTable
+from app_wgups.key_hash import key_order
+from app_wgups.open_addressing import OpenAddressHashTable
+from app_wgups.package import Package
+from app_wgups.package_store import PackageStore
+
+
+class HashTableStatsTest(unittest.TestCase):
+    def test_lookups_are_counted_only_when_tracking(self):
+        untracked = HashTable()
+        untracked.insert(1, "one")
+        untracked.lookup(1)
+        self.assertIsNone(untracked.stats()["lookups"])
+
+        table = HashTable(track_stats=True)
+        for key in range(100):
+            table.insert(key, key)
+        for key in range(150):
+            table.lookup(key)
+        stats = table.stats()
+        self.assertEqual((stats["lookups"], stats["hits"], stats["misses"]), (150, 100, 50))
+        #every hit compares up to its position in the chain, every miss the whole chain
+        expected = sum(sum(range(1, len(bucket) + 1)) for bucket in table.table)
+        expected += sum(len(table.table[table.hash(key)]) for key in range(100, 150))
+        self.assertEqual(table.comparisons, expected)
+        self.assertEqual(sum(stats["bucket_histogram"].values()), table.capacity)
+        self.assertGreater(stats["resizes"], 0)
+
+        table.reset_stats()
+        self.assertEqual(table.stats()["lookups"], 0)
+
+    def test_longest_bucket_follows_deletes_and_incremental_resizes(self):
+        table = HashTable(incremental=True)
+        for key in range(500):
+            table.insert(key, key)
+            longest = max(len(bucket) for bucket in table.table + (table._old_table or []))
+            self.assertEqual(table.longest_bucket, longest)
+        for key in range(500):
+            table.delete(key)
+        self.assertEqual(table.longest_bucket, 0)
+
+    #a bad key partway through a bulk load keeps len() in step with the entries already stored
+    def test_bulk_load_error_keeps_size_consistent(self):
+        table = HashTable()
+        table.insert("1Z00000001", "existing")
+        with self.assertRaises(TypeError):
+            table.bulk_load([(1, "one"), (2, "two"), (3.5, "bad"), (4, "four")])
+        self.assertEqual(len(table), 3)
+        self.assertEqual(len(table), len(list(table.items())))
+        with self.assertRaises(ValueError):
+            table.bulk_load(iter([(5, "five"), (6,)]), expected_size=2)
+        self.assertEqual(len(table), len(list(table.items())))
+        self.assertEqual(table.lookup(5), "five")
+
+    def test_open_addressing_probe_counts(self):
+        table = OpenAddressHashTable(track_stats=True)
+        for key in range(0, 3000, 3):
+            table.insert(key, key)
+        for key in range(0, 3000, 3):
+            table.lookup(key)
+        histogram = table.probe_histogram()
+        self.assertEqual(sum(histogram.values()), 1000)
+        self.assertEqual(table.probes, sum(length * count for length, count in histogram.items()))
+        self.assertEqual(table.stats()["hits"], 1000)
+
+    #tracking numbers and bytes keys work as in HashTable, through inserts, deletes and rehashes
+    def test_open_addressing_mixed_key_types(self):
+        table = OpenAddressHashTable()
+        expected = {}
+        for number in range(3000):
+            key = (number, f"1Z{number:08d}", b"raw%d" % number)[number % 3]
+            table.insert(key, number)
+            expected[key] = number
+        for key in list(expected)[::4]:
+            self.assertTrue(table.delete(key))
+            del expected[key]
+        table.bulk_load([("1Z99999999", "new"), (-1, "negative")])
+        expected.update({"1Z99999999": "new", -1: "negative"})
+
+        self.assertEqual(len(table), len(expected))
+        self.assertEqual(dict(table.items()), expected)
+        self.assertEqual([key for key, _ in table.ordered_items()],
+                         sorted(expected, key=key_order))
+        self.assertIsNone(table.lookup("1z00000001"))
+        with self.assertRaises(TypeError):
+            table.insert(1.5, "float")
+        self.assertEqual(len(table), len(expected))
+
+    #PackageStore looks packages up to maintain its indexes; only the caller's lookups count
+    def test_package_store_bookkeeping_is_not_counted(self):
+        store = PackageStore(track_stats=True)
+        for package_id in range(1, 21):
+            store.insert(package_id, Package(package_id, "300 State St", "Salt Lake City", "UT", "84103",
+                                             time(10, 30), 2, truck=1))
+        store.update(5, Package(5, "300 State St", "Salt Lake City", "UT", "84103", time(9, 0), 2, truck=2))
+        store.delete(6)
+        store.packages_by_truck(1)
+        store.packages_by_deadline(latest=time(12, 0))
+        self.assertEqual(store.stats()["lookups"], 0)
+
+        store.lookup(5)
+        store.lookup(6)
+        stats = store.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#tests for the bulk distance-matrix validation report, on both engines and both triangle checks
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from app_wgups import matrix_validation
+from app_wgups.distance_matrix import DistanceMatrix, packed_index, packed_size
+from app_wgups.matrix_validation import validate_distance_matrix
+
+#row 2 has an unparsable cell, row 3 a negative distance, and 1 -> 2 (9.0) is longer than 1 -> 3 -> 2 (2.0)
+MATRIX_CSV = (
+    "MATRIX,hub,100 North Main Street,200 South State Street,300 East Center Street\n"
+    "hub,0.0,5.0,,\n"
+    "100 North Main Street,5.0,0.0,,\n"
+    "200 South State Street,4.0,9.0,0.0,x\n"
+    "300 East Center Street,4.5,1.0,1.0,-0.5\n"
+)
+
+
+#points in a plane with a few pairs pushed far past their straight-line distance
+def planted_matrix(size, violations):
+    rng = random.Random(size)
+    points = [(rng.random() * 50, rng.random() * 50) for _ in range(size)]
+    distances = [0.0] * packed_size(size)
+    for i in range(size):
+        for j in range(i):
+            distances[packed_index(i, j)] = ((points[i][0] - points[j][0]) ** 2 + (points[i][1] - points[j][1]) ** 2) ** 0.5
+    for i, j in violations:
+        distances[packed_index(i, j)] += 100.0
+    return DistanceMatrix([f"{i} Test Street" for i in range(size)], distances)
+
+
+class MatrixValidationTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.csv_path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w") as csv_file:
+            csv_file.write(MATRIX_CSV)
+        self.violations = {(5, 1), (17, 3), (30, 29)}
+        self.matrix = planted_matrix(40, self.violations)
+
+    def tearDown(self):
+        os.remove(self.csv_path)
+
+    def test_csv_report_without_numpy(self):
+        report = validate_distance_matrix(self.csv_path, use_numpy=False)
+        counts = {name: check["count"] for name, check in report["checks"].items()}
+        self.assertEqual(counts, {"invalid_cells": 1, "missing": 0, "asymmetric": 0, "nonzero_diagonal": 1,
+                                  "negative": 1, "triangle_inequality": 1})
+        self.assertFalse(report["valid"])
+        self.assertEqual(report["checks"]["invalid_cells"]["examples"][0]["line"], 4)
+        (violation,) = report["checks"]["triangle_inequality"]["examples"]
+        self.assertEqual((violation["direct"], violation["via"], violation["via_distance"]),
+                         (9.0, "300 East Center Street", 2.0))
+
+    def test_exact_and_nearest_neighbor_checks_find_planted_violations(self):
+        for neighbors in (None, 4):
+            finding = validate_distance_matrix(self.matrix, use_numpy=False,
+                                               triangle_neighbors=neighbors)["checks"]["triangle_inequality"]
+            self.assertEqual(finding["via_neighbors"], neighbors)
+            self.assertEqual(finding["count"], len(self.violations))
+            found = {(example["from"], example["to"]) for example in finding["examples"]}
+            self.assertEqual(found, {(f"{j} Test Street", f"{i} Test Street") for i, j in self.violations})
+
+    #large matrices switch to the nearest-neighbor check, or skip it without NumPy
+    def test_size_limits(self):
+        with mock.patch.object(matrix_validation, "EXACT_TRIANGLE_LIMIT", 20), \
+                mock.patch.object(matrix_validation, "TRIANGLE_NEIGHBORS", 4):
+            finding = validate_distance_matrix(self.matrix, use_numpy=False)["checks"]["triangle_inequality"]
+        self.assertEqual((finding["via_neighbors"], finding["count"]), (4, len(self.violations)))
+
+        with mock.patch.object(matrix_validation, "ARRAY_TRIANGLE_LIMIT", 20):
+            finding = validate_distance_matrix(self.matrix, use_numpy=False)["checks"]["triangle_inequality"]
+        self.assertEqual(finding["count"], 0)
+        self.assertIn("skipped", finding)
+
+    @unittest.skipIf(matrix_validation.numpy is None, "NumPy is not installed")
+    def test_numpy_engine_matches_array_engine(self):
+        for source in (self.csv_path, self.matrix):
+            for neighbors in (None, 4):
+                with_numpy = validate_distance_matrix(source, use_numpy=True, triangle_neighbors=neighbors)
+                without = validate_distance_matrix(source, use_numpy=False, triangle_neighbors=neighbors)
+                self.assertEqual((with_numpy.pop("engine"), without.pop("engine")), ("numpy", "array"))
+                self.assertEqual(with_numpy, without)
+
+
+if __name__ == "__main__":
+    unittest.main()
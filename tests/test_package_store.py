@@ -0,0 +1,59 @@
+#tests for PackageStore's secondary indexes
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import unittest
+from datetime import time
+
+from app_wgups.package import Package
+from app_wgups.package_store import PackageStore
+
+
+#a package with only the fields the indexes care about filled in
+def make_package(package_id, deadline, truck=None):
+    return Package(package_id, "300 State St", "Salt Lake City", "UT", "84103", deadline, 2, truck=truck)
+
+
+class PackageStoreDeadlineIndexTest(unittest.TestCase):
+    #integer ids and tracking numbers in one store must never be compared with each other
+    def test_deadline_index_with_mixed_id_types(self):
+        store = PackageStore()
+        store.insert(3, make_package(3, time(10, 30)))
+        store.insert("1Z00000002", make_package("1Z00000002", time(10, 30)))
+        store.insert(1, make_package(1, time(9, 0)))
+        store.insert("1Z00000001", make_package("1Z00000001", time(16, 59)))
+
+        by_deadline = [package.package_id for package in store.packages_by_deadline(latest=time(10, 30))]
+        self.assertEqual(by_deadline, [1, 3, "1Z00000002"])
+        self.assertEqual([package.package_id for package in store.packages_by_deadline(earliest=time(10, 30))],
+                         [3, "1Z00000002", "1Z00000001"])
+
+        self.assertTrue(store.delete("1Z00000002"))
+        self.assertEqual([package.package_id for package in store.packages_by_deadline(time(10, 0), time(11, 0))], [3])
+
+
+class PackageStoreMixedIdsTest(unittest.TestCase):
+    #a CSV may mix numeric ids and tracking numbers (Package.parse_package_id keeps both)
+    def setUp(self):
+        self.store = PackageStore()
+        ids = [Package.parse_package_id(text) for text in ("12", "1z999aa10123456784", "2", "1Z00000001", "7")]
+        self.store.bulk_load([(package_id, make_package(package_id, time(10, 30), truck=1)) for package_id in ids])
+
+    def test_bulk_load_and_queries(self):
+        expected = [2, 7, 12, "1Z00000001", "1Z999AA10123456784"]
+        self.assertEqual([package.package_id for package in self.store.packages_by_truck(1)], expected)
+        self.assertEqual([package.package_id for package in self.store.packages_by_deadline(latest=time(10, 30))],
+                         expected)
+        self.assertEqual([key for key, _ in self.store.ordered_items()], expected)
+
+    def test_insert_and_update_after_load(self):
+        self.store.insert("1Z00000000", make_package("1Z00000000", time(9, 0), truck=1))
+        self.store.insert(1, make_package(1, time(9, 0), truck=1))
+        self.assertTrue(self.store.update(7, make_package(7, time(9, 0), truck=2)))
+        self.assertEqual([package.package_id for package in self.store.packages_by_deadline(latest=time(9, 0))],
+                         [1, 7, "1Z00000000"])
+        self.assertEqual([package.package_id for package in self.store.packages_by_truck(1)],
+                         [1, 2, 12, "1Z00000000", "1Z00000001", "1Z999AA10123456784"])
+
+
+if __name__ == "__main__":
+    unittest.main()
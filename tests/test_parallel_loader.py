@@ -0,0 +1,78 @@
+#tests for the parallel distance matrix loader: same result as the serial loader, same errors
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import os
+import random
+import tempfile
+import unittest
+
+from app_wgups.distance_matrix import load_distance_data
+from app_wgups.parallel_loader import load_distance_data_parallel
+
+
+#a full n x n matrix CSV with blank, broken and quoted rows mixed in
+def matrix_csv(size, upper_only_rows=()):
+    rng = random.Random(size)
+    lines = ["MATRIX," + ",".join(f"{i} Test Street" for i in range(size))]
+    for i in range(size):
+        cells = [f"{rng.random() * 20:.1f}" if j != i else "0.0" for j in range(size)]
+        if i in upper_only_rows:
+            cells[:i] = [""] * i  #lower cells left blank - filled from the mirrored upper cells
+        label = f'"{i} Test Street, Suite {i}"' if i % 7 == 3 else f"{i} Test Street"
+        lines.append(label + "," + ",".join(cells))
+        if i % 5 == 0:
+            lines.extend(["", "   ", "broken line"])
+    return "\n".join(lines) + "\n"
+
+
+class ParallelLoaderTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.csv_path = tempfile.mkstemp(suffix=".csv")
+        os.close(handle)
+
+    def tearDown(self):
+        os.remove(self.csv_path)
+
+    def write(self, text):
+        with open(self.csv_path, "w") as csv_file:
+            csv_file.write(text)
+
+    def assert_same_as_serial(self, workers):
+        serial = load_distance_data(self.csv_path)
+        parallel = load_distance_data_parallel(self.csv_path, workers=workers)
+        self.assertEqual(parallel.addresses, serial.addresses)
+        self.assertEqual(parallel.aliases(), serial.aliases())
+        self.assertEqual(list(map(repr, parallel.distances)), list(map(repr, serial.distances)))
+
+    def test_matches_serial_loader(self):
+        self.write(matrix_csv(60, upper_only_rows=(10, 11, 40)))
+        for workers in (1, 2, 3):
+            self.assert_same_as_serial(workers)
+
+    def test_extra_and_missing_rows(self):
+        text = matrix_csv(30)
+        self.write(text + "30 Extra Street," + ",".join(["1.0"] * 30) + "\n")
+        self.assert_same_as_serial(2)
+        self.write("\n".join(text.splitlines()[:20]) + "\n")
+        self.assert_same_as_serial(2)
+
+    #an unparsable cell is reported with the same file, line, row and column as the serial loader
+    def test_invalid_cell_error_matches_serial_loader(self):
+        lines = matrix_csv(40).splitlines()
+        row = next(line_number for line_number, line in enumerate(lines) if line.startswith("25 Test Street,"))
+        cells = lines[row].split(",")
+        cells[4] = "n/a"
+        lines[row] = ",".join(cells)
+        self.write("\n".join(lines) + "\n")
+
+        with self.assertRaises(ValueError) as serial_error:
+            load_distance_data(self.csv_path)
+        with self.assertRaises(ValueError) as parallel_error:
+            load_distance_data_parallel(self.csv_path, workers=2)
+        self.assertEqual(str(parallel_error.exception), str(serial_error.exception))
+        self.assertIn(f":{row + 1}: invalid distance 'n/a' from 25 Test Street to 3 Test Street",
+                      str(parallel_error.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+#tests for the sparse RoadNetwork backend: shortest paths and road length validation
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import os
+import tempfile
+import unittest
+from array import array
+
+from app_wgups.road_network import RoadNetwork, load_road_network
+
+EDGES_CSV = (
+    "from,to,miles\n"
+    "hub,100 North Main Street,5.0\n"
+    "hub,200 South State Street,1.0\n"
+    "200 South State Street,100 North Main Street,1.5\n"
+)
+
+
+class RoadNetworkTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.csv_path = tempfile.mkstemp(suffix=".csv")
+        os.close(handle)
+        self.write_edges(EDGES_CSV)
+
+    def tearDown(self):
+        os.remove(self.csv_path)
+
+    def write_edges(self, text):
+        with open(self.csv_path, "w") as csv_file:
+            csv_file.write(text)
+
+    def test_shortest_paths(self):
+        network = load_road_network(self.csv_path)
+        self.assertEqual(network.get_distance("hub", "100 North Main Street"), 2.5)
+        self.assertEqual(network.get_distance(1, 0), 2.5)
+
+    #a negative road would make Dijkstra return wrong distances, so it is rejected up front
+    def test_negative_lengths_are_rejected(self):
+        self.write_edges(EDGES_CSV + "100 North Main Street,hub,-4.0\n")
+        with self.assertRaisesRegex(ValueError, ":5: invalid distance '-4.0'"):
+            load_road_network(self.csv_path)
+        self.write_edges(EDGES_CSV + "100 North Main Street,hub,nan\n")
+        with self.assertRaises(ValueError):
+            load_road_network(self.csv_path)
+
+        offsets, targets = array("l", [0, 1, 2]), array("i", [1, 0])
+        with self.assertRaisesRegex(ValueError, "road b → a"):
+            RoadNetwork(["a", "b"], offsets, targets, array("d", [2.0, -2.0]), directed=True)
+        self.assertEqual(RoadNetwork(["a", "b"], offsets, targets, array("d", [2.0, 3.0]), directed=True)
+                         .get_distance("b", "a"), 3.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+#tests for the shared-memory SharedPackageStore: round trips, key types and worker processes
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import sys
+import unittest
+from datetime import datetime, time
+from multiprocessing import Pool
+
+from app_wgups.package import Package
+from app_wgups.shared_store import SharedPackageStore
+from app_wgups.status import PackageStatus
+
+
+#a worker: mark one package delivered through its view, then read another back (the store is never closed)
+def deliver(store, package_id, truck):
+    view = store.lookup(package_id)
+    view.status = PackageStatus.DELIVERED
+    view.truck = truck
+    return store.lookup(1).weight
+
+
+class SharedPackageStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.packages = [
+            Package(1, "195 W Oakland Ave", "Salt Lake City", "UT", "84115", time(10, 30), 21, "", 1),
+            Package("1Z00000002", "2530 S 500 E", "Salt Lake City", "UT", "84106", time(16, 59), 44),
+            Package(b"raw-3", "233 Canyon Rd", "Salt Lake City", "UT", "84103", time(9, 0), 2.5,
+                    "Can only be on truck 2", 2),
+        ]
+        self.packages[0].address_id = 5
+        self.packages[0].departure_time = datetime(2024, 1, 2, 8, 0)
+        self.packages[0].delivery_time = datetime(2024, 1, 2, 8, 42, 30)
+        self.packages[0].status = PackageStatus.DELIVERED
+        self.store = SharedPackageStore.create(self.packages)
+
+    def tearDown(self):
+        self.store.unlink()
+
+    def assert_same_package(self, view, package):
+        for field in ("package_id", "address", "city", "state", "zip_code", "deadline", "weight", "notes",
+                      "truck", "status", "address_id", "departure_time", "delivery_time"):
+            self.assertEqual(getattr(view, field), getattr(package, field), field)
+
+    def test_fields_round_trip_for_every_key_type(self):
+        self.assertEqual(len(self.store), 3)
+        for package in self.packages:
+            self.assertIn(package.package_id, self.store)
+            self.assert_same_package(self.store.lookup(package.package_id), package)
+            self.assert_same_package(self.store.lookup(package.package_id).to_package(), package)
+        self.assertIsNone(self.store.lookup(2))
+        self.assertIsNone(self.store.lookup("1z00000002"))
+        self.assertNotIn(3.5, self.store)
+        self.assertEqual([key for key, _ in self.store.ordered_items()], [1, "1Z00000002", b"raw-3"])
+
+    def test_duplicate_ids_are_rejected(self):
+        with self.assertRaises(ValueError):
+            SharedPackageStore.create(self.packages + [self.packages[1]])
+
+    #an attached store dropped without close() must not leave the block unclosable
+    def test_unclosed_attached_store_is_collected_cleanly(self):
+        unraisable = []
+        previous_hook, sys.unraisablehook = sys.unraisablehook, unraisable.append
+        try:
+            attached = SharedPackageStore.attach(self.store.name)
+            self.assertEqual(attached.lookup("1Z00000002").weight, 44)
+            del attached
+        finally:
+            sys.unraisablehook = previous_hook
+        self.assertEqual(unraisable, [])
+
+    def test_workers_see_and_make_changes(self):
+        with Pool(2) as pool:
+            weights = pool.starmap(deliver, [(self.store, "1Z00000002", 3), (self.store, b"raw-3", 1)])
+        self.assertEqual(weights, [21, 21])
+        for package_id, truck in (("1Z00000002", 3), (b"raw-3", 1)):
+            view = self.store.lookup(package_id)
+            self.assertEqual((view.status, view.truck), (PackageStatus.DELIVERED, truck))
+
+
+if __name__ == "__main__":
+    unittest.main()
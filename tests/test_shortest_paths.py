@@ -0,0 +1,92 @@
+#tests for the shortest-path closure: via-stop expansion and the on-disk closure cache
+#run with: python -m unittest discover tests (or python -m pytest tests)
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from app_wgups import shortest_paths
+from app_wgups.shortest_paths import load_shortest_path_matrix
+
+#driving 1 -> 3 -> 2 (2.0 miles) beats the listed direct 1 -> 2 distance (9.0 miles)
+MATRIX_CSV = (
+    "MATRIX,hub,100 North Main Street,200 South State Street,300 East Center Street\n"
+    "hub,0.0,,,\n"
+    "100 North Main Street,5.0,0.0,,\n"
+    "200 South State Street,4.0,9.0,0.0,\n"
+    "300 East Center Street,6.0,1.0,1.0,0.0\n"
+)
+
+
+class ShortestPathMatrixTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp(prefix="wgups_closure_test_")
+        self.csv_path = os.path.join(self.directory, "distances.csv")
+        with open(self.csv_path, "w") as csv_file:
+            csv_file.write(MATRIX_CSV)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    #package data spells addresses differently from the matrix; ids are accepted too
+    def test_expand_route_resolves_any_spelling_or_id(self):
+        closed = load_shortest_path_matrix(self.csv_path)
+        expected = ["100 North Main Street", "300 East Center Street", "200 South State Street"]
+        self.assertEqual(closed.expand_route("100 North Main Street", "200 South State Street"), expected)
+        self.assertEqual(closed.expand_route("100 N Main St ", "200 south state st."), expected)
+        self.assertEqual(closed.expand_route(1, 2), expected)
+        self.assertEqual(closed.expand_route("100 N Main St", "1 Unknown Way"), [])
+        self.assertEqual(closed.expand_route(1, 99), [])
+
+    def test_cached_closure_is_reused_and_matches(self):
+        cache_dir = os.path.join(self.directory, "cache")
+        computed = load_shortest_path_matrix(self.csv_path, cache_dir)
+        self.assertFalse([name for name in os.listdir(cache_dir) if name.endswith(".tmp")])
+
+        cached = load_shortest_path_matrix(self.csv_path, cache_dir)
+        self.assertEqual(list(cached.predecessors), list(computed.predecessors))
+        self.assertEqual(cached.distance_by_id(1, 2), 2.0)
+        self.assertEqual(cached.expand_route(1, 2), computed.expand_route(1, 2))
+
+    #a predecessor file cut short (e.g. by a crash) is recomputed rather than trusted
+    def test_truncated_predecessor_cache_is_rebuilt(self):
+        cache_dir = os.path.join(self.directory, "cache")
+        computed = load_shortest_path_matrix(self.csv_path, cache_dir)
+        (predecessor_name,) = [name for name in os.listdir(cache_dir) if name.endswith(".pred")]
+        with open(os.path.join(cache_dir, predecessor_name), "r+b") as predecessor_file:
+            predecessor_file.truncate(8)
+
+        reloaded = load_shortest_path_matrix(self.csv_path, cache_dir)
+        self.assertEqual(list(reloaded.predecessors), list(computed.predecessors))
+        self.assertEqual(reloaded.expand_route(1, 2), computed.expand_route(1, 2))
+
+
+    #a damaged matrix file is recomputed as well, whatever part of it was lost
+    def test_corrupt_matrix_cache_is_rebuilt(self):
+        cache_dir = os.path.join(self.directory, "cache")
+        computed = load_shortest_path_matrix(self.csv_path, cache_dir)
+        (matrix_name,) = [name for name in os.listdir(cache_dir) if name.endswith(".wgdm")]
+        matrix_path = os.path.join(cache_dir, matrix_name)
+        for damage in (b"", b"WGDM\x01", b"not a distance matrix" * 8):
+            with open(matrix_path, "wb") as matrix_file:
+                matrix_file.write(damage)
+            reloaded = load_shortest_path_matrix(self.csv_path, cache_dir)
+            self.assertEqual(list(reloaded.distances), list(computed.distances))
+            self.assertEqual(reloaded.expand_route(1, 2), computed.expand_route(1, 2))
+
+    #files from another cache version are never read
+    def test_cache_files_are_versioned(self):
+        cache_dir = os.path.join(self.directory, "cache")
+        load_shortest_path_matrix(self.csv_path, cache_dir)
+        names = os.listdir(cache_dir)
+        self.assertEqual(len(names), 2)
+        self.assertTrue(all(f".v{shortest_paths.CACHE_VERSION}.closure." in name for name in names))
+        with mock.patch.object(shortest_paths, "CACHE_VERSION", shortest_paths.CACHE_VERSION + 1):
+            load_shortest_path_matrix(self.csv_path, cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()